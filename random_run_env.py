@@ -1,5 +1,6 @@
 import numpy as np
 
+from res_mgmt.envs.frame_writer import FrameWriter
 from res_mgmt.envs.res_mgmt_env import ResMgmtEnv
 
 
@@ -14,6 +15,9 @@ env = ResMgmtEnv(
     resource_size=resource_size,
     num_job_slot=10,
     max_num_job=10**3,
+    new_job_rate=0.7,
+    # PNGs are written in the background, frames are dropped if it falls behind
+    frame_writer=FrameWriter(),
 )
 
 max_iteration = 10 ** 5
@@ -0,0 +1,389 @@
+"""Steps-per-second benchmarks of the environment and its kernels.
+
+Run all benchmarks over the size grid and save the results:
+
+```shell
+python -m res_mgmt.bench --output bench.json
+```
+
+Compare against an earlier run, exits with 1 on regressions:
+
+```shell
+python -m res_mgmt.bench --compare bench.json
+```
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+import numpy as np
+
+from res_mgmt.envs.generator import generate_jobs
+from res_mgmt.envs.res_mgmt_env import ResMgmtEnv
+
+Config = Dict[str, int]
+
+# sizes of (num_resource_type, time_size, resource_size, num_job_slot)
+SIZES: Dict[str, Config] = {
+    "small": {
+        "num_resource_type": 2,
+        "time_size": 5,
+        "resource_size": 3,
+        "num_job_slot": 3,
+    },
+    "medium": {
+        "num_resource_type": 2,
+        "time_size": 20,
+        "resource_size": 20,
+        "num_job_slot": 10,
+    },
+    "large": {
+        "num_resource_type": 4,
+        "time_size": 100,
+        "resource_size": 64,
+        "num_job_slot": 20,
+    },
+}
+
+# a benchmark sets up its state, then returns a function running one
+# operation and returning the nanoseconds spent in the timed part
+Benchmark = Callable[[Config], Callable[[], int]]
+
+
+def make_env(config: Config, **kwargs) -> ResMgmtEnv:
+    env = ResMgmtEnv(
+        max_num_job=10**3,
+        new_job_rate=0.7,
+        **config,
+        **kwargs,
+    )
+    env.reset()
+    return env
+
+
+def _until_fit(env: ResMgmtEnv, fit: bool) -> int:
+    """Step the env (untimed) until some slot does (not) fit, return its action."""
+    while True:
+        positions = env.res.find_all_pos()
+        candidates = np.flatnonzero((positions != -1) == fit)
+        if candidates.size:
+            return int(candidates[0]) + 1
+        _, _, done, _ = env.step(0)
+        if done:
+            env.reset()
+
+
+def bench_step_null(config: Config) -> Callable[[], int]:
+    env = make_env(config)
+
+    def run() -> int:
+        start = time.perf_counter_ns()
+        _, _, done, _ = env.step(0)
+        elapsed = time.perf_counter_ns() - start
+        if done:
+            env.reset()
+        return elapsed
+    return run
+
+
+def bench_step_valid(config: Config) -> Callable[[], int]:
+    env = make_env(config)
+
+    def run() -> int:
+        action = _until_fit(env, True)
+        start = time.perf_counter_ns()
+        _, _, done, _ = env.step(action)
+        elapsed = time.perf_counter_ns() - start
+        if done:
+            env.reset()
+        return elapsed
+    return run
+
+
+def bench_step_invalid(config: Config) -> Callable[[], int]:
+    env = make_env(config)
+
+    def run() -> int:
+        action = _until_fit(env, False)
+        start = time.perf_counter_ns()
+        _, _, done, _ = env.step(action)
+        elapsed = time.perf_counter_ns() - start
+        if done:
+            env.reset()
+        return elapsed
+    return run
+
+
+def bench_step_ordered(config: Config) -> Callable[[], int]:
+    env = make_env(config, action_mode="ordered")
+    # try every slot, a whole timestep per step
+    action = np.arange(1, config["num_job_slot"] + 1)
+
+    def run() -> int:
+        start = time.perf_counter_ns()
+        _, _, done, _ = env.step(action)
+        elapsed = time.perf_counter_ns() - start
+        if done:
+            env.reset()
+        return elapsed
+    return run
+
+
+def bench_reset(config: Config) -> Callable[[], int]:
+    env = make_env(config)
+
+    def run() -> int:
+        start = time.perf_counter_ns()
+        env.reset()
+        return time.perf_counter_ns() - start
+    return run
+
+
+def bench_find_pos(config: Config) -> Callable[[], int]:
+    env = make_env(config)
+    _until_fit(env, True)
+    job_id = env.res.job_slots.jobs[env.res.job_slots.jobs != -1][0]
+
+    def run() -> int:
+        start = time.perf_counter_ns()
+        env.res.find_pos(job_id)
+        return time.perf_counter_ns() - start
+    return run
+
+
+def bench_schedule(config: Config) -> Callable[[], int]:
+    env = make_env(config)
+
+    def run() -> int:
+        action = _until_fit(env, True)
+        job_id = env.res.job_slots.jobs[action - 1]
+        pos = env.res.find_pos(job_id)
+        start = time.perf_counter_ns()
+        env.res.schedule(job_id, pos)
+        return time.perf_counter_ns() - start
+    return run
+
+
+def bench_time_proceed(config: Config) -> Callable[[], int]:
+    env = make_env(config)
+
+    def run() -> int:
+        start = time.perf_counter_ns()
+        env.res.clusters.time_proceed()
+        return time.perf_counter_ns() - start
+    return run
+
+
+def bench_state(config: Config) -> Callable[[], int]:
+    env = make_env(config)
+
+    def run() -> int:
+        start = time.perf_counter_ns()
+        env.res.state()
+        return time.perf_counter_ns() - start
+    return run
+
+
+# jobs per `generate_jobs` call, the chunk size of `get_generator()`
+_GENERATE_CHUNK = 1000
+
+
+def bench_generate_jobs(config: Config) -> Callable[[], int]:
+    """One operation is one job, generated in chunks, so the result is in jobs/s."""
+    rng = np.random.default_rng(0)
+
+    def run() -> int:
+        start = time.perf_counter_ns()
+        generate_jobs(
+            config["num_resource_type"],
+            config["time_size"],
+            config["resource_size"],
+            n=_GENERATE_CHUNK,
+            rng=rng,
+        )
+        return (time.perf_counter_ns() - start) // _GENERATE_CHUNK
+    return run
+
+
+def bench_render(config: Config) -> Callable[[], int]:
+    import pygame
+    from res_mgmt.envs.render import render
+    env = make_env(config)
+    pygame.display.init()
+    pygame.font.init()
+
+    def run() -> int:
+        start = time.perf_counter_ns()
+        render(env.res)
+        return time.perf_counter_ns() - start
+    return run
+
+
+def bench_policy_sjf(config: Config) -> Callable[[], int]:
+    from res_mgmt.other_agents.batch_policy import get_batch_action
+    from res_mgmt.other_agents.sjf import sjf_scores
+    env = make_env(config)
+
+    def run() -> int:
+        start = time.perf_counter_ns()
+        _, _, done, _ = env.step(get_batch_action(env, sjf_scores))
+        elapsed = time.perf_counter_ns() - start
+        if done:
+            env.reset()
+        return elapsed
+    return run
+
+
+def bench_policy_sjf_loop(config: Config) -> Callable[[], int]:
+    from res_mgmt.other_agents.get_action import get_action
+    from res_mgmt.other_agents.sjf import sjf_scoring
+    env = make_env(config)
+
+    def run() -> int:
+        start = time.perf_counter_ns()
+        _, _, done, _ = env.step(get_action(env, sjf_scoring))
+        elapsed = time.perf_counter_ns() - start
+        if done:
+            env.reset()
+        return elapsed
+    return run
+
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    "step_null": bench_step_null,
+    "step_valid": bench_step_valid,
+    "step_invalid": bench_step_invalid,
+    "step_ordered": bench_step_ordered,
+    "reset": bench_reset,
+    "find_pos": bench_find_pos,
+    "schedule": bench_schedule,
+    "time_proceed": bench_time_proceed,
+    "state": bench_state,
+    "generate_jobs": bench_generate_jobs,
+    "render": bench_render,
+    "policy_sjf": bench_policy_sjf,
+    "policy_sjf_loop": bench_policy_sjf_loop,
+}
+
+# unit of the operations of the benchmarks not timing one call, "ops" otherwise
+UNITS: Dict[str, str] = {
+    "generate_jobs": "jobs",
+}
+
+
+def measure(benchmark: Benchmark, config: Config, min_time: float) -> Dict[str, float]:
+    """Run the benchmark for at least min_time seconds of wall time.
+
+    Returns:
+        Dict[str, float]: Operations per second and the peak memory in bytes.
+    """
+    run = benchmark(config)
+    count, total_ns = 0, 0
+    deadline = time.perf_counter() + min_time
+    while count < 3 or time.perf_counter() < deadline:
+        total_ns += run()
+        count += 1
+
+    # measured separately, tracing slows everything down
+    tracemalloc.start()
+    run = benchmark(config)
+    for _ in range(min(count, 100)):
+        run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "ops_per_sec": count / (total_ns * 1e-9) if total_ns else float("inf"),
+        "peak_bytes": peak,
+    }
+
+
+def run_benchmarks(
+    sizes: List[str],
+    benchmarks: List[str],
+    min_time: float = 0.5,
+    log: Optional[Callable[[str], None]] = print,
+) -> Dict:
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for size in sizes:
+        results[size] = {}
+        for name in benchmarks:
+            result = measure(BENCHMARKS[name], SIZES[size], min_time)
+            results[size][name] = result
+            if log is not None:
+                log(f"{size:>8} {name:<14} "
+                    f"{result['ops_per_sec']:>14,.1f} {UNITS.get(name, 'ops') + '/s':<6} "
+                    f"{result['peak_bytes'] / 2**20:>9.2f} MiB")
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "sizes": {size: SIZES[size] for size in sizes},
+        "results": results,
+    }
+
+
+def compare(new: Dict, old: Dict, tolerance: float = 0.2) -> List[str]:
+    """Find the benchmarks slower than the old results.
+
+    Args:
+        new (Dict): The results of this run.
+        old (Dict): The results to compare against.
+        tolerance (float, optional): Allowed slowdown ratio. Defaults to 0.2.
+
+    Returns:
+        List[str]: A message per regression.
+    """
+    regressions = []
+    for size, benchmarks in new["results"].items():
+        for name, result in benchmarks.items():
+            baseline = old["results"].get(size, {}).get(name)
+            if baseline is None:
+                continue
+            ratio = result["ops_per_sec"] / baseline["ops_per_sec"]
+            if ratio < 1 - tolerance:
+                unit = UNITS.get(name, "ops")
+                regressions.append(
+                    f"{size} {name}: {result['ops_per_sec']:,.1f} {unit}/s, "
+                    f"{ratio:.2f}x of {baseline['ops_per_sec']:,.1f} {unit}/s")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m res_mgmt.bench", description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(SIZES),
+                        help=f"comma separated sizes of {list(SIZES)}")
+    parser.add_argument("--benchmarks", default=",".join(BENCHMARKS),
+                        help=f"comma separated benchmarks of {list(BENCHMARKS)}")
+    parser.add_argument("--min-time", type=float, default=0.5,
+                        help="seconds to run each benchmark")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON results of an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed slowdown ratio before reporting a regression")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        args.sizes.split(","), args.benchmarks.split(","), args.min_time)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print("REGRESSION", regression)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
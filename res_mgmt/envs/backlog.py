@@ -1,62 +1,79 @@
 from collections import deque
 import numpy as np
 import numpy.typing as npt
-from typing import Dict, Deque, Tuple
+from typing import Deque, Iterator, List, Optional, Tuple
 
 from res_mgmt.envs.job import Job
+from res_mgmt.envs.job_table import JobTable
 from res_mgmt.envs.config import _EMPTY_CELL, Config, _DEFAULT_CONFIG
-
-JobImage = npt.NDArray[np.bool_]
+from res_mgmt.envs.generator import get_generator
 
 
 class Backlog:
     """The backlog containing the ramaining jobs after the first num_job_slot jobs.
 
+    New jobs arrive either at the new job rate, taken from the generator, 
+    or at their arrival timesteps in the trace if there is one.
+
     Attributes:
         state: The number of job in backlog.
-        queue: The queue of `(id, job)`s.
-        meta: Map from the job id to its metadata in Job.
+        queue: The queue of job ids.
+        meta: The metadata of jobs.
+        trace: 
+            Iterator of (arrival timestep, requirements) sorted by arrival, 
+            see `Trace.jobs()`. Replaces the generator and the rate if set.
+        time: The current timestep, counted for the trace.
     """
 
     def __init__(
         self,
-        meta: Dict[int, Job],    # meta data of jobs {job_index -> job_meta}
+        meta: JobTable,          # meta data of jobs
         generator,  # generator for new jobs
         new_job_rate,  # job arrival rate
+        rng: Optional[np.random.Generator] = None,  # arrivals, the global random state if None
+        trace: Optional[Iterator[Tuple[int, npt.NDArray[np.int_]]]] = None,  # arrivals from a trace
     ) -> None:
-        self.queue: Deque[Tuple[int, JobImage]] = deque()
+        self.queue: Deque[int] = deque()
         self.state = 0
         self.meta = meta
         self.generator = generator
         self.new_job_rate = new_job_rate
+        self.rng = rng
+        self.trace = trace
+        self.time = 0
+        self.pending: Optional[Tuple[int, npt.NDArray[np.int_]]] = None
 
     @classmethod
     def fromConfig(cls, config: Config = _DEFAULT_CONFIG):
         """Create a JobSlots from config.
 
         Args:
-            config: The config. If not specified, the default config will be used.
+            config: 
+                The config. If not specified, the default config will be used.
+                Without a "generator", jobs are generated for its sizes.
         """
+        generator = config.get("generator")
+        if generator is None:
+            generator = get_generator(
+                config["num_resource_type"], config["time_size"],
+                config["resource_size"])
         return cls(
-            meta=config["meta"],
-            generator=config["generator"],  # generator for new jobs
+            meta=JobTable.fromConfig(config),
+            generator=generator,  # generator for new jobs
             new_job_rate=config["new_job_rate"],
         )
 
-    def add(self, job: Job, image: JobImage) -> None:
+    def add(self, job: Job) -> None:
         """Add a job to the right side of the queue of backlog.
 
         Args:
             job: 
-                The job to be added.
-            image: 
-                The job image, a numpy bool array with shape 
-                (num_resource_type, time_size, resource_size).
+                The job to be added, its metadata should be in meta.
         """
-        self.queue.append((job.id, image))
+        self.queue.append(job.id)
         self.state = min(60, len(self.queue))
 
-    def get(self) -> Tuple[int, JobImage]:
+    def get(self) -> int:
         """Get a job from the left side of the queue of backlog.
 
         The caller should check empty before getting the job, otherwise will raise exception.
@@ -68,9 +85,7 @@ class Backlog:
         ```
 
         Returns:
-            The integer id, and the first job from the left 
-            side of the queue. The job is a numpy bool array with shape 
-            (num_resource_type, time_size, resource_size).
+            The integer id of the first job from the left side of the queue.
 
         Raises:
             IndexError: An error occurred poping from an empty backlog.
@@ -80,20 +95,53 @@ class Backlog:
         self.state = min(60, len(self.queue))
         return result
 
+    def clear(self) -> None:
+        """Remove all jobs from the backlog.
+        """
+        self.queue.clear()
+        self.state = 0
+        self.time = 0
+        self.pending = None
+
     def durations(self) -> npt.NDArray[np.int_]:
         """The sum of the durations of all jobs in backlog.
 
         Returns:
             List of durations of all jobs in backlog.
         """
-        return np.array([self.meta[id].duration for id, _ in self.queue])
+        ids = np.fromiter(self.queue, dtype=int, count=len(self.queue))
+        return self.meta.duration[ids]
+
+    def time_proceed(self) -> List[Job]:
+        """New jobs might arrive according to the new job rate, or the trace.
 
-    def time_proceed(self) -> None:
-        """New job might arrive according to the new job rate.
+        Returns:
+            List[Job]: The new jobs, at most one unless replaying a trace.
         """
-        if np.random.rand() < self.new_job_rate:
-            image = next(self.generator)
-            id = np.random.randint(100)
-            job = Job.fromImage(id, image)
-            self.meta[id] = job
-            self.add(job, image)
+        if self.trace is not None:
+            return self._trace_arrivals()
+        sample = np.random.rand() if self.rng is None else self.rng.random()
+        if sample < self.new_job_rate:
+            return [self._arrive(next(self.generator))]
+        return []
+
+    def _trace_arrivals(self) -> List[Job]:
+        jobs = []
+        while True:
+            if self.pending is None:
+                self.pending = next(self.trace, None)
+                if self.pending is None:
+                    break
+            timestep, requirements = self.pending
+            if timestep > self.time:
+                break
+            jobs.append(self._arrive(requirements))
+            self.pending = None
+        self.time += 1
+        return jobs
+
+    def _arrive(self, requirements: npt.NDArray[np.int_]) -> Job:
+        job = Job.fromRequirements(None, requirements)
+        self.meta.add(job)
+        self.add(job)
+        return job
@@ -0,0 +1,461 @@
+from time import perf_counter_ns
+from typing import Any, Iterable, List, Optional, Union
+import numpy as np
+import numpy.typing as npt
+
+from res_mgmt.envs.config import _EMPTY_CELL
+from res_mgmt.envs.drawing import OCCUPIED, draw_frame, tile
+from res_mgmt.envs.generator import generate_requirements
+from res_mgmt.envs.placement import find_positions
+from res_mgmt.envs.profiler import Profiler, Stats
+from res_mgmt.envs.res_mgmt_env import make_spaces
+
+try:
+    from stable_baselines3.common.vec_env import VecEnv
+except ImportError:
+    class VecEnv:
+        """The subset of stable-baselines3's VecEnv used without stable-baselines3."""
+
+        def __init__(self, num_envs: int, observation_space, action_space) -> None:
+            self.num_envs = num_envs
+            self.observation_space = observation_space
+            self.action_space = action_space
+
+        def step(self, actions: npt.NDArray[np.int_]):
+            self.step_async(actions)
+            return self.step_wait()
+
+        def _get_indices(self, indices) -> Iterable[int]:
+            if indices is None:
+                return range(self.num_envs)
+            if isinstance(indices, int):
+                return [indices]
+            return indices
+
+VecEnvIndices = Union[None, int, Iterable[int]]
+
+# same as ResMgmtEnv: an episode is done once the step count exceeds it
+_MAX_STEPS = 50
+
+# methods returning a row per environment, `env_method` splits their result
+_BATCHED_METHODS = {"action_masks", "inv_duration_sum", "state"}
+# methods returning one result for all the environments, `env_method`
+# returns it for the first index only and an empty result for the others
+_SHARED_METHODS = {"perf_stats": dict}
+
+
+class BatchedResMgmtEnv(VecEnv):
+    """N resource management environments stepped together.
+
+    Behaves like N copies of `ResMgmtEnv`, but the state of all the
+    environments are stored in stacked arrays and every step advances
+    all of them in one vectorized pass. Finished episodes are reset
+    automatically, the last observation is in `info["terminal_observation"]`.
+    The valid actions of the new observation are in `action_masks()`, and
+    in `info["action_mask"]` too with `mask_info`.
+
+    The clusters are kept as empty cell counts, which is all the
+    observation and placement need. Each environment draws its jobs in
+    order from its own workload, so the backlog is two counters: the jobs
+    arrived and the jobs moved into the job slots. For the same reason
+    the frames of `render()` draw the busy cells of the clusters in one
+    colour instead of per job.
+
+    The environments share one random generator and one set of attributes:
+    `env_method("reset", indices=...)` resets only the given environments,
+    but `seed` and `set_attr` apply to all of them at once and raise
+    `NotImplementedError` for a subset.
+
+    Attributes:
+        empty_cells_cluster:
+            Empty cells per resource type per timestep,
+            shape (N, num_resource_type, time_size).
+        cluster_drain:
+            Sum of 1 / duration of the jobs whose last timestep is the
+            timestep, shape (N, time_size).
+        cluster_inv_duration_sum:
+            Sum of 1 / duration of the jobs in clusters, shape (N,).
+        slot_requirements:
+            Requirements of the jobs in the slots,
+            shape (N, num_job_slot, num_resource_type, time_size).
+        slot_time_max: Time the jobs in the slots will consume, 0 if empty.
+        slot_duration: Durations of the jobs in the slots, 0 if empty.
+        workload_requirements:
+            Requirements of the jobs of every environment,
+            shape (N, workload_size, num_resource_type, time_size).
+        workload_duration: Durations of the jobs, shape (N, workload_size).
+        arrived: Number of jobs arrived per environment.
+        refilled: Number of jobs moved from backlog to job slots.
+        stepcount: Number of steps of the current episode.
+        positions:
+            Cached earliest start of the job in each slot, -1 if it does
+            not fit or the slot is empty, shape (N, num_job_slot).
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        num_resource_type: int,  # d resource types
+        resource_size: int,  # row
+        time_size: int,  # column
+        num_job_slot: int,  # first M jobs
+        max_num_job: int,
+        new_job_rate: float,
+        seed: Optional[int] = None,
+        profile: bool = False,  # time the phases of the steps, see perf_stats
+        mask_info: bool = False,  # put action_masks() in info["action_mask"]
+    ) -> None:
+        action_space, observation_space = make_spaces(
+            num_resource_type=num_resource_type,
+            resource_size=resource_size,
+            time_size=time_size,
+            num_job_slot=num_job_slot,
+            max_num_job=max_num_job,
+        )
+        super().__init__(num_envs, observation_space, action_space)
+        self.num_resource_type = num_resource_type
+        self.resource_size = resource_size
+        self.time_size = time_size
+        self.num_job_slot = num_job_slot
+        self.max_num_job = max_num_job
+        self.new_job_rate = new_job_rate
+        # at most one arrival per time proceed, and one per reset
+        self.workload_size = _MAX_STEPS + 3
+        self.rng = np.random.default_rng(seed)
+
+        n, d, t = num_envs, num_resource_type, time_size
+        self.empty_cells_cluster = np.full((n, d, t), resource_size, dtype=int)
+        self.cluster_drain = np.zeros((n, t))
+        self.cluster_inv_duration_sum = np.zeros(n)
+        self.slot_requirements = np.zeros((n, num_job_slot, d, t), dtype=int)
+        self.slot_time_max = np.zeros((n, num_job_slot), dtype=int)
+        self.slot_duration = np.zeros((n, num_job_slot), dtype=int)
+        self.workload_requirements = np.zeros(
+            (n, self.workload_size, d, t), dtype=int)
+        self.workload_duration = np.ones((n, self.workload_size), dtype=int)
+        self.workload_inv_cumsum = np.zeros((n, self.workload_size + 1))
+        self.arrived = np.zeros(n, dtype=int)
+        self.refilled = np.zeros(n, dtype=int)
+        self.stepcount = np.zeros(n, dtype=int)
+        self.positions = None
+        self.actions = None
+        self.profiler = Profiler() if profile else None
+        self.mask_info = mask_info
+
+    def reset(self) -> npt.NDArray[np.int_]:
+        self._reset(np.arange(self.num_envs))
+        return self.state()
+
+    def step_async(self, actions: npt.NDArray[np.int_]) -> None:
+        self.actions = np.asarray(actions, dtype=int).reshape(self.num_envs)
+
+    def step_wait(self):
+        assert self.actions is not None, "Call step_async before step_wait."
+        # if step(0) then choose none and step forward
+        # else step(N) then choose the job on N-1 (Nth) slot
+        slots = self.actions - 1
+        self.actions = None
+        profiler = self.profiler
+        if profiler is not None:
+            start = t = perf_counter_ns()
+
+        chosen = np.flatnonzero(slots != -1)
+        placed = self._schedule(chosen, slots[chosen])
+        invalid = np.setdiff1d(chosen, placed)
+        if profiler is not None:
+            t = profiler.lap("schedule", t)
+        self._time_proceed(np.flatnonzero(slots == -1))
+        if profiler is not None:
+            t = profiler.lap("time_proceed", t)
+
+        rewards = -self.inv_duration_sum()
+        rewards[placed] = 0
+        rewards[invalid] -= 10
+        if profiler is not None:
+            t = profiler.lap("reward", t)
+
+        dones = self.stepcount > _MAX_STEPS
+        self.stepcount += 1
+        obs = self.state()
+        if profiler is not None:
+            t = profiler.lap("state", t)
+        infos = [{} for _ in range(self.num_envs)]
+        finished = np.flatnonzero(dones)
+        if finished.size:
+            for index in finished:
+                infos[index]["terminal_observation"] = obs[index].copy()
+            self._reset(finished)
+            obs = self.state()
+            if profiler is not None:
+                t = profiler.lap("reset", t)
+        if self.mask_info:
+            masks = self.action_masks()
+            for index, info in enumerate(infos):
+                info["action_mask"] = masks[index]
+            if profiler is not None:
+                profiler.lap("action_mask", t)
+        if profiler is not None:
+            profiler.lap("step", start)
+        return obs, rewards, dones, infos
+
+    def perf_stats(self) -> Stats:
+        """The timings of the phases of all steps so far, empty if not profiling.
+
+        The phases are the ones of `ResMgmtEnv.perf_stats()`, but a call 
+        covers all the environments at once, so these are already the 
+        aggregate of the batch. `env_method("perf_stats")` returns them 
+        once, for the first index, so that `aggregate()` does not count 
+        them N times.
+
+        Returns:
+            Stats: Per phase, the "calls", the "total_ns" and the "mean_ns".
+        """
+        if self.profiler is None:
+            return {}
+        return self.profiler.stats()
+
+    def action_masks(self) -> npt.NDArray[np.bool_]:
+        """The actions that can succeed in the current states.
+
+        The null action is always valid, a slot is valid if it holds a job
+        that fits in the clusters. All slots of all environments are
+        searched in one `find_positions` pass, cached until the next step.
+
+        Returns:
+            npt.NDArray[np.bool_]: Masks with shape (N, num_job_slot + 1).
+        """
+        masks = np.ones((self.num_envs, self.num_job_slot + 1), dtype=np.bool_)
+        masks[:, 1:] = self.find_all_pos() != -1
+        return masks
+
+    def state(self) -> npt.NDArray[np.int_]:
+        """The observations of all environments, the same layout as `Res.state()`.
+
+        Returns:
+            npt.NDArray[np.int_]: Observations with shape (N, obs_size).
+        """
+        backlog = np.minimum(60, self.arrived - self.refilled)
+        return np.concatenate((
+            self.empty_cells_cluster.reshape(self.num_envs, -1),
+            self.slot_requirements.reshape(self.num_envs, -1),
+            backlog[:, None],
+        ), axis=1)
+
+    def frames(self, unit: int = 10) -> npt.NDArray[np.uint8]:
+        """The frames of all environments, drawn in one pass.
+
+        Args:
+            unit (int, optional): Size of a cell in pixels. Defaults to 10.
+
+        Returns:
+            npt.NDArray[np.uint8]: Frames with shape (N, height, width, 3).
+        """
+        busy = self.resource_size - self.empty_cells_cluster
+        clusters = np.where(
+            np.arange(self.resource_size) < busy[..., None], OCCUPIED, _EMPTY_CELL)
+        return draw_frame(
+            clusters, self.slot_requirements, self.arrived - self.refilled, unit)
+
+    def get_images(self) -> List[npt.NDArray[np.uint8]]:
+        return list(self.frames())
+
+    def render(self, mode: str = "rgb_array", columns: Optional[int] = None):
+        """The frames of all environments tiled into one image.
+
+        Args:
+            mode (str, optional): Only "rgb_array" is supported. Defaults to "rgb_array".
+            columns (int, optional): Frames per row. Defaults to a square grid.
+
+        Returns:
+            npt.NDArray[np.uint8]: The image with shape (height, width, 3).
+
+        Raises:
+            ValueError: An error occurred if the mode is not supported.
+        """
+        if mode != "rgb_array":
+            raise ValueError(f"Unknown render mode {mode}.")
+        return tile(self.frames(), columns)
+
+    def inv_duration_sum(self) -> npt.NDArray[np.float64]:
+        """Sum of 1 / duration of all jobs in the systems per environment.
+        """
+        occupied = self.slot_duration > 0
+        slots = np.divide(
+            1.0, self.slot_duration, where=occupied,
+            out=np.zeros(self.slot_duration.shape),
+        ).sum(axis=1)
+        envs = np.arange(self.num_envs)
+        backlog = (self.workload_inv_cumsum[envs, self.arrived] -
+                   self.workload_inv_cumsum[envs, self.refilled])
+        return self.cluster_inv_duration_sum + slots + backlog
+
+    def find_all_pos(self) -> npt.NDArray[np.int_]:
+        """The earliest starts of the jobs in the slots, cached until the next step.
+
+        Returns:
+            npt.NDArray[np.int_]: 
+                Positions with shape (N, num_job_slot), -1 if the job does 
+                not fit or the slot is empty.
+        """
+        if self.positions is None:
+            self.positions = find_positions(
+                self.empty_cells_cluster, self.slot_requirements, self.slot_time_max)
+            self.positions[self.slot_time_max == 0] = -1
+        return self.positions
+
+    def _schedule(
+        self,
+        envs: npt.NDArray[np.int_],
+        slots: npt.NDArray[np.int_],
+    ) -> npt.NDArray[np.int_]:
+        """Schedule the job in the given slot of each given environment.
+
+        Returns:
+            npt.NDArray[np.int_]: The environments where the job is scheduled.
+        """
+        time_max = self.slot_time_max[envs, slots]
+        requirements = self.slot_requirements[envs, slots]
+        positions = self.find_all_pos()[envs, slots]
+        self.positions = None
+        fit = positions != -1
+        envs, slots = envs[fit], slots[fit]
+        time_max, requirements, positions = (
+            time_max[fit], requirements[fit], positions[fit])
+
+        # move each job to its start position on the time axis
+        job_time = np.arange(self.time_size) - positions[:, None]
+        shifted = np.take_along_axis(
+            requirements, np.maximum(job_time, 0)[:, None, :], axis=2)
+        shifted[np.broadcast_to(job_time[:, None, :] < 0, shifted.shape)] = 0
+        self.empty_cells_cluster[envs] -= shifted
+
+        inv_duration = 1 / self.slot_duration[envs, slots]
+        self.cluster_drain[envs, positions + time_max - 1] += inv_duration
+        self.cluster_inv_duration_sum[envs] += inv_duration
+
+        self.slot_requirements[envs, slots] = 0
+        self.slot_time_max[envs, slots] = 0
+        self.slot_duration[envs, slots] = 0
+        return envs
+
+    def _time_proceed(self, envs: npt.NDArray[np.int_]) -> None:
+        """Proceed the given environments to the next timestep.
+        """
+        if envs.size == 0:
+            return
+        self.positions = None
+        # clusters
+        self.cluster_inv_duration_sum[envs] -= self.cluster_drain[envs, 0]
+        self.empty_cells_cluster[envs, :, :-1] = self.empty_cells_cluster[envs, :, 1:]
+        self.empty_cells_cluster[envs, :, -1] = self.resource_size
+        self.cluster_drain[envs, :-1] = self.cluster_drain[envs, 1:]
+        self.cluster_drain[envs, -1] = 0
+
+        # backlog
+        arrive = self.rng.random(envs.size) < self.new_job_rate
+        arrive &= self.arrived[envs] < self.workload_size
+        self.arrived[envs[arrive]] += 1
+
+        # job slots
+        empty = self.slot_time_max[envs] == 0
+        rank = empty.cumsum(axis=1) - 1
+        backlog = self.arrived[envs] - self.refilled[envs]
+        refill = empty & (rank < backlog[:, None])
+        rows, slots = np.nonzero(refill)
+        refill_envs = envs[rows]
+        jobs = self.refilled[refill_envs] + rank[rows, slots]
+        self.slot_requirements[refill_envs, slots] = \
+            self.workload_requirements[refill_envs, jobs]
+        self.slot_duration[refill_envs, slots] = \
+            self.workload_duration[refill_envs, jobs]
+        self.slot_time_max[refill_envs, slots] = \
+            self.workload_duration[refill_envs, jobs]
+        self.refilled[envs] += refill.sum(axis=1)
+
+    def _reset(self, envs: npt.NDArray[np.int_]) -> None:
+        """Start new episodes in the given environments.
+        """
+        self.empty_cells_cluster[envs] = self.resource_size
+        self.cluster_drain[envs] = 0
+        self.cluster_inv_duration_sum[envs] = 0
+        self.slot_requirements[envs] = 0
+        self.slot_time_max[envs] = 0
+        self.slot_duration[envs] = 0
+        self.arrived[envs] = 0
+        self.refilled[envs] = 0
+        self.stepcount[envs] = 0
+        self.positions = None
+
+        requirements, duration = self._workload(envs.size * self.workload_size)
+        self.workload_requirements[envs] = requirements.reshape(
+            (envs.size, self.workload_size) + requirements.shape[1:])
+        self.workload_duration[envs] = duration.reshape(
+            envs.size, self.workload_size)
+        self.workload_inv_cumsum[envs, 1:] = np.cumsum(
+            1 / self.workload_duration[envs], axis=1)
+        self._time_proceed(envs)
+
+    def _workload(self, n: int):
+        """Generate n jobs.
+
+        Returns:
+            A tuple of the requirements with shape
+            (n, num_resource_type, time_size) and the durations with shape (n,).
+        """
+        requirements = generate_requirements(
+            self.num_resource_type, self.time_size, self.resource_size, n,
+            rng=self.rng)
+        busy = requirements.any(axis=1)
+        duration = self.time_size - busy[:, ::-1].argmax(axis=1)
+        return requirements, duration
+
+    def close(self) -> None:
+        pass
+
+    def seed(self, seed: Optional[int] = None) -> List[Optional[int]]:
+        self.rng = np.random.default_rng(seed)
+        return [seed] * self.num_envs
+
+    def get_attr(self, attr_name: str, indices: VecEnvIndices = None) -> List[Any]:
+        value = getattr(self, attr_name)
+        return [value for _ in self._get_indices(indices)]
+
+    def set_attr(self, attr_name: str, value: Any, indices: VecEnvIndices = None) -> None:
+        if not self._all_indices(indices):
+            raise NotImplementedError(
+                f"The attributes are shared by all the environments, "
+                f"cannot set {attr_name} of some of them.")
+        setattr(self, attr_name, value)
+
+    def env_method(
+        self,
+        method_name: str,
+        *method_args,
+        indices: VecEnvIndices = None,
+        **method_kwargs,
+    ) -> List[Any]:
+        method = getattr(self, method_name)
+        if method_name in _BATCHED_METHODS:
+            result = method(*method_args, **method_kwargs)
+            return [result[index] for index in self._get_indices(indices)]
+        if method_name in _SHARED_METHODS:
+            count = len(list(self._get_indices(indices)))
+            if not count:
+                return []
+            empty = _SHARED_METHODS[method_name]
+            return [method(*method_args, **method_kwargs)] + [empty() for _ in range(count - 1)]
+        if method_name == "reset":
+            envs = np.array(list(self._get_indices(indices)), dtype=int)
+            self._reset(envs)
+            return list(self.state()[envs])
+        if method_name == "seed" and self._all_indices(indices):
+            return method(*method_args, **method_kwargs)
+        raise NotImplementedError(
+            f"{method_name} cannot be applied to the environments one by one.")
+
+    def _all_indices(self, indices: VecEnvIndices) -> bool:
+        """Whether the indices select every environment."""
+        return set(self._get_indices(indices)) == set(range(self.num_envs))
+
+    def env_is_wrapped(self, wrapper_class, indices: VecEnvIndices = None) -> List[bool]:
+        return [False for _ in self._get_indices(indices)]
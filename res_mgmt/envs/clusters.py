@@ -1,17 +1,28 @@
 import numpy as np
 import numpy.typing as npt
-from typing import Dict
+from typing import List, Tuple
 
 from res_mgmt.envs.config import _EMPTY_CELL, Config, _DEFAULT_CONFIG
-from res_mgmt.envs.job import Job
+from res_mgmt.envs.job_table import JobTable
 
 
 class Clusters:
     """The clusters that contains all the scheduled jobs.
 
+    The time axis is stored as a ring buffer: advancing time clears the row
+    of the current timestep and moves `head` forward instead of shifting the
+    whole image.
+
     Attributes:
-        state: The cluster "image". Numpy array with shape (num_resource_type, time_size, resource_size)
-        meta: Map from the job id to its metadata in Job.
+        buffer: 
+            The physical cluster "image". Numpy array with shape 
+            (num_resource_type, time_size, resource_size), where the logical 
+            timestep t lives in row `(head + t) % time_size`.
+        head: The row of `buffer` holding the current timestep.
+        drain: 
+            Ids of the jobs whose last timestep is the corresponding 
+            row of `buffer`.
+        meta: The metadata of jobs.
     """
 
     def __init__(
@@ -19,10 +30,12 @@ class Clusters:
         num_resource_type: int,  # d resource types
         time_size: int,          # column
         resource_size: int,      # row
-        meta: Dict[int, Job],    # meta data of jobs {job_index -> job_meta}
+        meta: JobTable,          # meta data of jobs
     ) -> None:
         shape = (num_resource_type, time_size, resource_size)
-        self.state = np.full(shape, _EMPTY_CELL, dtype=int)
+        self.buffer = np.full(shape, _EMPTY_CELL, dtype=int)
+        self.head = 0
+        self.drain: List[List[int]] = [[] for _ in range(time_size)]
         self.meta = meta
 
     @classmethod
@@ -36,20 +49,73 @@ class Clusters:
             num_resource_type=config["num_resource_type"],
             time_size=config["time_size"],
             resource_size=config["resource_size"],
-            meta={},
+            meta=JobTable.fromConfig(config),
         )
 
-    def time_proceed(self) -> None:
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        """The shape (num_resource_type, time_size, resource_size) of the cluster image."""
+        return self.buffer.shape
+
+    @property
+    def state(self) -> npt.NDArray[np.int_]:
+        """The cluster "image" in logical order, the first row is the current timestep.
+
+        A rotated copy of the ring buffer, reading it leaves `buffer`, 
+        `head` and `drain` untouched. Write through `buffer` and `rows()`.
+        """
+        return np.roll(self.buffer, -self.head, axis=1)
+
+    @state.setter
+    def state(self, state: npt.NDArray[np.int_]) -> None:
+        self.buffer = state
+        self.head = 0
+        self.drain = [[] for _ in range(state.shape[1])]
+
+    def clear(self) -> None:
+        """Remove all jobs from the clusters, in place.
+        """
+        self.buffer[...] = _EMPTY_CELL
+        self.head = 0
+        for drained in self.drain:
+            drained.clear()
+
+    def row(self, time: int) -> int:
+        """The row of `buffer` holding the given logical timestep.
+
+        Args:
+            time: The logical timestep, 0 being the current one.
+        """
+        return (self.head + time) % self.buffer.shape[1]
+
+    def rows(self, start: int, stop: int) -> npt.NDArray[np.int_]:
+        """The rows of `buffer` holding the logical timesteps [start, stop).
+
+        Args:
+            start: The first logical timestep.
+            stop: The logical timestep after the last one.
+        """
+        return (self.head + np.arange(start, stop)) % self.buffer.shape[1]
+
+    def time_proceed(self) -> float:
         """Shift the cluster image up by one row.
+
+        Only the row of the current timestep is cleared, and then becomes 
+        the last row of the logical image.
+
+        The jobs that left the clusters are released from meta.
+
+        Returns:
+            float: Sum of 1 / duration of the jobs that left the clusters.
         """
-        shape = list(self.state.shape)
-        shape[1] = 1
-        new_empty_row = np.full(shape, _EMPTY_CELL, dtype=int)
-        np.concatenate(
-            (self.state[:, 1:, :], new_empty_row),
-            axis=1,
-            out=self.state,
-        )
+        drained = self.drain[self.head]
+        inv_durations = (1 / self.meta.duration[drained]).sum()
+        for id in drained:
+            self.meta.release(id)
+        self.drain[self.head] = []
+        self.buffer[:, self.head, :] = _EMPTY_CELL
+        self.head = (self.head + 1) % self.buffer.shape[1]
+        return inv_durations
 
     def durations(self) -> npt.NDArray[np.int_]:
         """The sum of the durations of all jobs in clusters.
@@ -59,13 +125,8 @@ class Clusters:
         """
         # not_empty_cell_indices = np.where(self.state != _EMPTY_CELL)
         # return np.max(not_empty_cell_indices, axis=1)[1] + 1
-        jobs_in_cluster = np.unique(self.state)
+        jobs_in_cluster = np.unique(self.buffer)
         jobs_in_cluster = np.delete(
             jobs_in_cluster, np.where(jobs_in_cluster == _EMPTY_CELL))
 
-        if jobs_in_cluster.size == 0:
-            return np.array([])
-
-        def get_duration(id: int):
-            return self.meta[id].duration
-        return np.vectorize(get_duration)(jobs_in_cluster)
+        return self.meta.duration[jobs_in_cluster]
@@ -1,9 +1,8 @@
 from typing import Dict
 
-from res_mgmt.envs.generator import get_generator
-
 _EMPTY_CELL: int = -1
 
+# "generator" is optional, `Backlog.fromConfig()` creates one if missing
 Config = Dict[str, int]
 
 _DEFAULT_CONFIG: Config = {
@@ -13,6 +12,4 @@ _DEFAULT_CONFIG: Config = {
     "resource_size": 3,      # row
     "max_num_job": 10**3,
     "new_job_rate": 0.7,
-    "meta": {},
-    "generator": get_generator(2, 20, 20),
 }
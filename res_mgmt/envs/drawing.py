@@ -0,0 +1,295 @@
+"""Frames of the environment drawn with NumPy only, no pygame or display needed."""
+from functools import lru_cache
+import struct
+from typing import Optional, Sequence, Tuple, Union
+import zlib
+import numpy as np
+import numpy.typing as npt
+
+from res_mgmt.envs.config import _EMPTY_CELL
+
+colours = [
+    "green",
+    "red",
+    "brown",
+    "orange",
+    "yellow",
+    "purple",
+    "pink",
+    "blue",
+    "white",
+    "gray",
+]
+
+# RGB of the named colours, the same as pygame's THECOLORS
+_NAMED = {
+    "green": (0, 255, 0),
+    "red": (255, 0, 0),
+    "brown": (165, 42, 42),
+    "orange": (255, 165, 0),
+    "yellow": (255, 255, 0),
+    "purple": (160, 32, 240),
+    "pink": (255, 192, 203),
+    "blue": (0, 0, 255),
+    "white": (255, 255, 255),
+    "gray": (190, 190, 190),
+    "black": (0, 0, 0),
+    "skyblue": (135, 206, 235),
+}
+_WHITE = np.array(_NAMED["white"], dtype=np.uint8)
+_BLACK = np.array(_NAMED["black"], dtype=np.uint8)
+_SKYBLUE = np.array(_NAMED["skyblue"], dtype=np.uint8)
+
+
+def _palette(n: int) -> npt.NDArray[np.uint8]:
+    """n distinct colours, hues spread by the golden angle."""
+    hue = (np.arange(n) * 0.618033988749895) % 1.0
+    value = np.where(np.arange(n) % 2, 0.75, 0.95)
+    # HSV to RGB with saturation 0.7
+    k = (np.array([5, 3, 1]) + hue[:, None] * 6) % 6
+    rgb = value[:, None] * (1 - 0.7 * np.clip(np.minimum(k, 4 - k), 0, 1))
+    return np.round(rgb * 255).astype(np.uint8)
+
+
+# colour of the job ids: the named colours first, then generated ones
+_COLOURS = np.concatenate((
+    np.array([_NAMED[name] for name in colours], dtype=np.uint8),
+    _palette(64),
+))
+
+# the occupied cells of clusters known only by their counts
+OCCUPIED = colours.index("gray")
+
+# 3 x 5 bitmaps of the digits
+_DIGITS = np.array([
+    ["111", "101", "101", "101", "111"],
+    ["010", "110", "010", "010", "111"],
+    ["111", "001", "111", "100", "111"],
+    ["111", "001", "111", "001", "111"],
+    ["101", "101", "111", "001", "001"],
+    ["111", "100", "111", "001", "111"],
+    ["111", "100", "111", "101", "111"],
+    ["111", "001", "001", "001", "001"],
+    ["111", "101", "111", "101", "111"],
+    ["111", "101", "111", "001", "111"],
+]).view("<U1").reshape(10, 5, 3) == "1"
+
+
+def job_colours(jobs: npt.NDArray[np.int_]) -> npt.NDArray[np.uint8]:
+    """The RGB colour of each job id, white for the empty cells.
+
+    Args:
+        jobs (npt.NDArray[np.int_]): Job ids of any shape.
+
+    Returns:
+        npt.NDArray[np.uint8]: Colours with shape (*jobs.shape, 3).
+    """
+    named = len(colours)
+    index = np.where(jobs < named, jobs, named + (jobs - named) % (len(_COLOURS) - named))
+    result = _COLOURS[np.maximum(index, 0)]
+    result[jobs == _EMPTY_CELL] = _WHITE
+    return result
+
+
+@lru_cache(maxsize=16)
+def _layout(
+    num_job_slot: int,
+    num_resource_type: int,
+    time_size: int,
+    resource_size: int,
+    unit: int,
+) -> npt.NDArray[np.intp]:
+    """Index of the colour of every pixel of a frame.
+
+    0 is white, 1 is black, 2 + i is the i-th cell of the blocks flattened
+    as (slot + 1, type, time, resource), the clusters being slot 0.
+    """
+    width_unit = (
+        resource_size * (num_job_slot + 1) +
+        num_job_slot + 4 + 3   # 3 for the text
+    )
+    height_unit = time_size * num_resource_type + num_resource_type + 1
+    layout = np.zeros((unit * height_unit, unit * width_unit), dtype=np.intp)
+
+    # one block: cells scaled up, cell borders, thicker block border
+    cells = np.arange(time_size * resource_size).reshape(time_size, resource_size)
+    block = 2 + cells.repeat(unit, axis=0).repeat(unit, axis=1)
+    edge = np.arange(unit)
+    border = (edge == 0) | (edge == unit - 1)
+    block[np.tile(border, time_size)] = 1
+    block[:, np.tile(border, resource_size)] = 1
+    block[:2] = block[-2:] = 1
+    block[:, :2] = block[:, -2:] = 1
+
+    height, width = block.shape
+    for slot in range(num_job_slot + 1):
+        x = ((slot + 1) + resource_size * slot) * unit
+        for type in range(num_resource_type):
+            y = ((type + 1) + time_size * type) * unit
+            offset = (slot * num_resource_type + type) * cells.size
+            layout[y:y + height, x:x + width] = np.where(
+                block > 1, block + offset, block)
+    return layout
+
+
+def draw(
+    clusters: npt.NDArray[np.int_],
+    requirements: npt.NDArray[np.int_],
+    unit: int = 10,
+) -> npt.NDArray[np.uint8]:
+    """Draw the clusters and job slots as an RGB image, without the backlog count.
+
+    Each cell is a unit x unit square with a black border, each
+    (slot, resource type) block has a thicker border. The clusters are
+    the first column of blocks, coloured by job id. The pixel layout is
+    cached per size, a frame is a single lookup into the cell colours.
+    Leading batch dimensions draw one frame per environment at once.
+
+    Args:
+        clusters (npt.NDArray[np.int_]):
+            The cluster image in logical order, shape
+            (..., num_resource_type, time_size, resource_size).
+        requirements (npt.NDArray[np.int_]):
+            The requirements of the job slots, shape
+            (..., num_job_slot, num_resource_type, time_size).
+        unit (int, optional): Size of a cell in pixels. Defaults to 10.
+
+    Returns:
+        npt.NDArray[np.uint8]: The image with shape (..., height, width, 3).
+    """
+    num_job_slot, num_resource_type, time_size = requirements.shape[-3:]
+    resource_size = clusters.shape[-1]
+    batch = requirements.shape[:-3]
+
+    # white, black, then the cell colours of every block
+    palette = np.empty(
+        batch + (2 + (num_job_slot + 1) * num_resource_type * time_size * resource_size, 3),
+        dtype=np.uint8)
+    palette[..., 0, :] = _WHITE
+    palette[..., 1, :] = _BLACK
+    clusters_size = num_resource_type * time_size * resource_size
+    palette[..., 2:2 + clusters_size, :] = job_colours(clusters).reshape(batch + (-1, 3))
+    filled = np.arange(resource_size) < requirements[..., None]
+    palette[..., 2 + clusters_size:, :] = np.where(
+        filled.reshape(batch + (-1, 1)), _SKYBLUE, _WHITE)
+
+    layout = _layout(
+        num_job_slot, num_resource_type, time_size, resource_size, unit)
+    return np.take(palette, layout, axis=-2)
+
+
+def text_position(
+    image: npt.NDArray[np.uint8],
+    num_job_slot: int,
+    resource_size: int,
+    unit: int,
+) -> Tuple[int, int]:
+    """The (x, y) pixel of the backlog count, right of the blocks."""
+    height_unit = image.shape[-3] // unit
+    return (
+        (resource_size * (num_job_slot + 1) + num_job_slot + 2) * unit,
+        height_unit // 2 * unit,
+    )
+
+
+def draw_number(
+    image: npt.NDArray[np.uint8],
+    number: int,
+    x: int,
+    y: int,
+    scale: int = 5,
+) -> None:
+    """Write a non-negative integer in black into the image, clipped to its size.
+
+    Args:
+        image (npt.NDArray[np.uint8]): The image with shape (height, width, 3).
+        number (int): The number.
+        x (int): The left pixel.
+        y (int): The top pixel.
+        scale (int, optional): Pixels per bitmap pixel of the 3 x 5 digits. Defaults to 5.
+    """
+    digits = _DIGITS[[int(digit) for digit in str(number)]]
+    # digits side by side with one column of space
+    glyphs = np.pad(digits, ((0, 0), (0, 0), (0, 1)))
+    text = glyphs.transpose(1, 0, 2).reshape(5, -1)[:, :-1]
+    text = text.repeat(scale, axis=0).repeat(scale, axis=1)
+    height = max(0, min(text.shape[0], image.shape[0] - y))
+    width = max(0, min(text.shape[1], image.shape[1] - x))
+    region = image[y:y + height, x:x + width]
+    region[text[:height, :width]] = _BLACK
+
+
+def draw_frame(
+    clusters: npt.NDArray[np.int_],
+    requirements: npt.NDArray[np.int_],
+    backlog: Union[int, npt.NDArray[np.int_]],
+    unit: int = 10,
+) -> npt.NDArray[np.uint8]:
+    """`draw()` with the backlog count, the frame of `render(mode="rgb_array")`.
+
+    Args:
+        backlog (Union[int, npt.NDArray[np.int_]]):
+            The number of jobs in the backlog, one per frame of the batch.
+
+    See `draw()` for the other arguments.
+    """
+    image = draw(clusters, requirements, unit)
+    x, y = text_position(image, requirements.shape[-3], clusters.shape[-1], unit)
+    backlog = np.asarray(backlog)
+    for index in np.ndindex(backlog.shape):
+        draw_number(image[index], int(backlog[index]), x, y, max(1, unit // 2))
+    return image
+
+
+def tile(
+    frames: Sequence[npt.NDArray[np.uint8]],
+    columns: Optional[int] = None,
+) -> npt.NDArray[np.uint8]:
+    """Tile frames of the same shape into one image, row by row.
+
+    Args:
+        frames (Sequence[npt.NDArray[np.uint8]]): Frames with shape (height, width, 3).
+        columns (int, optional): Frames per row. Defaults to a square grid.
+
+    Returns:
+        npt.NDArray[np.uint8]: The image, the missing frames of the last row are black.
+    """
+    frames = np.asarray(frames)
+    n, height, width, channels = frames.shape
+    if columns is None:
+        columns = int(np.ceil(np.sqrt(n)))
+    rows = -(-n // columns)
+    grid = np.zeros((rows * columns, height, width, channels), dtype=frames.dtype)
+    grid[:n] = frames
+    return (grid.reshape(rows, columns, height, width, channels)
+            .transpose(0, 2, 1, 3, 4)
+            .reshape(rows * height, columns * width, channels))
+
+
+def encode_png(image: npt.NDArray[np.uint8], level: int = 6) -> bytes:
+    """Encode an RGB image as PNG.
+
+    Only needs zlib, which releases the GIL while compressing, so
+    frames can be encoded in background threads.
+
+    Args:
+        image (npt.NDArray[np.uint8]): The image with shape (height, width, 3).
+        level (int, optional): zlib compression level. Defaults to 6.
+
+    Returns:
+        bytes: The PNG file.
+    """
+    height, width, _ = image.shape
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return (struct.pack(">I", len(data)) + kind + data +
+                struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    # filter type 0 (none) before every row
+    rows = np.zeros((height, 1 + 3 * width), dtype=np.uint8)
+    rows[:, 1:] = image.reshape(height, -1)
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" +
+            chunk(b"IHDR", header) +
+            chunk(b"IDAT", zlib.compress(rows.tobytes(), level)) +
+            chunk(b"IEND", b""))
@@ -0,0 +1,121 @@
+import queue
+import threading
+from typing import List, Optional, Tuple
+import numpy as np
+import numpy.typing as npt
+import pygame
+
+from res_mgmt.envs.drawing import draw, encode_png
+from res_mgmt.envs.render import write_text
+from res_mgmt.envs.res import Res
+
+# clusters, job slot requirements, backlog count and the file name
+Snapshot = Tuple[npt.NDArray[np.int_], npt.NDArray[np.int_], int, str]
+
+
+class FrameWriter:
+    """Render and save frames as PNG files in background threads.
+
+    `submit()` only copies the arrays a frame is drawn from and puts them
+    in a bounded queue, the workers draw, encode and write the frames.
+    When the queue is full the frame is dropped, or with `drop=False`
+    `submit()` waits for a free place (backpressure).
+
+    The frames look like the ones of `render()`. The PNG compression
+    releases the GIL, so the workers run alongside the stepping thread.
+
+    Attributes:
+        written: Number of frames written.
+        dropped: Number of frames dropped because the queue was full.
+        errors: Exceptions raised by the workers.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,      # background threads
+        max_queue: int = 16,   # frames waiting to be written
+        drop: bool = True,     # drop frames if the queue is full, else wait
+        unit: int = 10,        # size of a cell in pixels
+    ) -> None:
+        pygame.font.init()
+        self.queue: "queue.Queue[Optional[Snapshot]]" = queue.Queue(max_queue)
+        self.drop = drop
+        self.unit = unit
+        self.written = 0
+        self.dropped = 0
+        self.errors: List[Exception] = []
+        self._lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._work, daemon=True)
+            for _ in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, res: Res, filename: str) -> bool:
+        """Write the frame of the current state of res to filename, later.
+
+        Args:
+            res (Res): The resources to draw, copied before returning.
+            filename (str): The PNG file.
+
+        Returns:
+            bool: False if the frame is dropped.
+        """
+        snapshot = (
+            res.clusters.state.copy(),
+            res.job_slots.requirements.copy(),
+            int(res.backlog.state),
+            filename,
+        )
+        if not self.drop:
+            self.queue.put(snapshot)
+            return True
+        try:
+            self.queue.put_nowait(snapshot)
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+
+    def flush(self) -> None:
+        """Wait until all submitted frames are written."""
+        self.queue.join()
+
+    def close(self) -> None:
+        """Write the remaining frames and stop the workers."""
+        for _ in self._threads:
+            self.queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _work(self) -> None:
+        while True:
+            snapshot = self.queue.get()
+            try:
+                if snapshot is None:
+                    return
+                self._write(*snapshot)
+                with self._lock:
+                    self.written += 1
+            except Exception as e:
+                with self._lock:
+                    self.errors.append(e)
+            finally:
+                self.queue.task_done()
+
+    def _write(
+        self,
+        clusters: npt.NDArray[np.int_],
+        requirements: npt.NDArray[np.int_],
+        backlog: int,
+        filename: str,
+    ) -> None:
+        image = draw(clusters, requirements, self.unit)
+        with self._lock:
+            write_text(image, backlog, requirements.shape[0],
+                       clusters.shape[2], self.unit)
+        data = encode_png(image)
+        with open(filename, "wb") as f:
+            f.write(data)
@@ -1,5 +1,4 @@
-from typing import Union
-from importlib_metadata import distribution
+from typing import Optional, Union
 import numpy as np
 import numpy.typing as npt
 from numpy.random import normal, randint, random_sample
@@ -8,18 +7,51 @@ def get_generator(
     num_resource_type: int,
     time_size: int,
     resource_size: int,
+    chunk_size: int = 1000,
+    rng: Optional[np.random.Generator] = None,
 ):
-    jobset = generate_jobs(num_resource_type, time_size, resource_size)
-    yield from jobset
+    """Infinite generator of job requirements, generated chunk_size jobs at a time.
 
-def generate_jobs(
+    Yields requirements with shape (num_resource_type, time_size), 
+    see `generate_requirements()`.
+
+    Args:
+        num_resource_type (int): Number of types of resources.
+        time_size (int): Size of the time axis in the image.
+        resource_size (int): Size of the resource axis in the image.
+        chunk_size (int, optional): Number of jobs generated at once. Defaults to 1000.
+        rng (np.random.Generator, optional): Random generator. Defaults to one 
+            seeded from the global numpy random state.
+    """
+    if rng is None:
+        rng = default_rng()
+    while True:
+        jobset = generate_requirements(
+            num_resource_type, time_size, resource_size, chunk_size, rng=rng)
+        yield from jobset
+
+
+def default_rng() -> np.random.Generator:
+    """A random generator seeded from the global numpy random state, 
+    so `np.random.seed()` still makes the jobs reproducible.
+    """
+    return np.random.default_rng(randint(2**32))
+
+
+def generate_requirements(
     num_resource_type: int,
     time_size: int,
     resource_size: int,
     n: int = 1000,
     distribution: str = "normal",
-) -> npt.NDArray[np.bool_]:
-    """Generate jobs data.
+    rng: Optional[np.random.Generator] = None,
+) -> npt.NDArray[np.int_]:
+    """Generate the requirements of jobs.
+
+    Every job demands a constant number of resource units of each type 
+    for its whole duration. The duration and the demand of the dominant 
+    resource are at least 1, even when the sizes are too small for their 
+    ranges, so no job is empty.
 
     Args:
         num_resource_type (int): Number of types of resources.
@@ -27,107 +59,132 @@ def generate_jobs(
         resource_size (int): Size of the resource axis in the image.
         n (int, optional): Number of jobs to be generated. Defaults to 1000.
         distribution (str, optional): One of [normal, union]. Defaults to "normal".
+        rng (np.random.Generator, optional): Random generator. Defaults to one 
+            seeded from the global numpy random state.
 
     Returns:
-        npt.NDArray[np.bool_]: Generated data.
+        npt.NDArray[np.int_]: 
+            Generated requirements with shape (n, num_resource_type, time_size).
     """
+    if rng is None:
+        rng = default_rng()
 
     short_jobs = 0.8
-    long_jobs = 1 - short_jobs
 
     t = time_size / 20
     r = resource_size
 
     # short_duration = union_random(round(1 * t), round(3 * t), round(short_jobs * n))
     # long_duration = union_random(round(10 * t), round(15 * t), round(long_jobs * n))
-    short_duration = union_random(round(1 * t), round(3 * t), round(short_jobs * n))
-    long_duration = union_random(round(13 * t), round(20 * t), round(long_jobs * n))
+    short_duration = union_random(round(1 * t), round(3 * t), round(short_jobs * n), rng)
+    long_duration = union_random(round(13 * t), round(20 * t), n - round(short_jobs * n), rng)
 
-    duration = np.concatenate([short_duration, long_duration])
-    np.random.shuffle(duration)
+    duration = np.maximum(1, np.concatenate([short_duration, long_duration]))
+    rng.shuffle(duration)
 
-    dominant_res_index = randint(num_resource_type, size=n)
+    dominant_res_index = rng.integers(num_resource_type, size=n)
     # demand_dominant = union_random(round(0.25 * r), round(0.5 * r), n)
     # demand_other = union_random(round(0.05 * r), round(0.1 * r), n)
-    demand_dominant = union_random(round(0.5 * r), round(1 * r), n)
-    demand_other = union_random(round(0.05 * r), round(0.2 * r), n)
-
-    def expend(arr):
-        y, x = arr.shape
-        pady = time_size - y
-        padx = resource_size - x
-        return np.pad(arr, ((0, pady), (0, padx)), "constant")
-
-    shape = [
-        n,
-        num_resource_type,
-        time_size,
-        resource_size,
-    ]
-    jobs = np.full(shape, False, dtype=np.bool_)
-
-    for i in range(n):
-        for type in range(num_resource_type):
-            if type == dominant_res_index[i]:
-                demand = demand_dominant[i]
-            else:
-                demand = demand_other[i]
-            job = np.ones((duration[i], demand))
-            job = expend(job)
-            jobs[i, type] = job
-    return jobs
-
-    random = distri[distribution]
-    shape = [
-        n,
-        num_resource_type,
-        time_size,
-        resource_size,
-    ]
-    durations = random(1, time_size, tuple(shape[:2]))
-    resources = random(1, resource_size, tuple(shape[:3]))
-    jobs = np.full(shape, False, dtype=np.bool_)
-    for i in range(n):
-        for type in range(num_resource_type):
-            for time in range(durations[i, type]):
-                jobs[i, type, time, :resources[i, type, time]] = True
-    return jobs
+    demand_dominant = np.maximum(1, union_random(round(0.5 * r), round(1 * r), n, rng))
+    demand_other = union_random(round(0.05 * r), round(0.2 * r), n, rng)
+
+    # demand with shape (n, num_resource_type)
+    dominant = np.arange(num_resource_type) == dominant_res_index[:, None]
+    demand = np.where(dominant, demand_dominant[:, None], demand_other[:, None])
+
+    time = np.arange(time_size)
+    return np.where(
+        time < duration[:, None, None], demand[:, :, None], 0)
+
+
+def generate_jobs(
+    num_resource_type: int,
+    time_size: int,
+    resource_size: int,
+    n: int = 1000,
+    distribution: str = "normal",
+    rng: Optional[np.random.Generator] = None,
+) -> npt.NDArray[np.bool_]:
+    """Generate jobs data.
+
+    Args:
+        num_resource_type (int): Number of types of resources.
+        time_size (int): Size of the time axis in the image.
+        resource_size (int): Size of the resource axis in the image.
+        n (int, optional): Number of jobs to be generated. Defaults to 1000.
+        distribution (str, optional): One of [normal, union]. Defaults to "normal".
+        rng (np.random.Generator, optional): Random generator. Defaults to one 
+            seeded from the global numpy random state.
+
+    Returns:
+        npt.NDArray[np.bool_]: Generated data.
+    """
+    requirements = generate_requirements(
+        num_resource_type, time_size, resource_size, n, distribution, rng)
+    return to_images(requirements, resource_size)
+
+
+def to_images(
+    requirements: npt.NDArray[np.int_],
+    resource_size: int,
+) -> npt.NDArray[np.bool_]:
+    """Rebuild the job images from the requirements.
+
+    Each timestep of the image fills the first `requirements[type, time]` cells.
+
+    Args:
+        requirements (npt.NDArray[np.int_]): 
+            Requirements with shape (..., num_resource_type, time_size).
+        resource_size (int): Size of the resource axis in the image.
+
+    Returns:
+        npt.NDArray[np.bool_]: 
+            Images with shape (..., num_resource_type, time_size, resource_size).
+    """
+    return np.arange(resource_size) < requirements[..., None]
 
 
 def union_random(
     min: int,
     max: int,
     size=None,
+    rng: Optional[np.random.Generator] = None,
 ) -> Union[int, npt.NDArray[np.int_]]:
     """Random int from uni[min, max)
 
     Args:
         min (int): Inclusive min.
         max (int): Exclusive max.
+        rng (np.random.Generator, optional): Random generator. 
+            Defaults to the global numpy random state.
 
     Returns:
         int: random int or int array.
     """
-    return np.int_((max - min) * random_sample(size) + min)
+    sample = random_sample(size) if rng is None else rng.random(size)
+    return np.int_((max - min) * sample + min)
 
 
 def normal_random(
     min: int,
     max: int,
     size=None,
+    rng: Optional[np.random.Generator] = None,
 ) -> Union[int, npt.NDArray[np.int_]]:
     """Random int from normal[min, max)
 
     Args:
         min (int): Inclusive min.
         max (int): Exclusive max.
+        rng (np.random.Generator, optional): Random generator. 
+            Defaults to the global numpy random state.
 
     Returns:
         int: random int or int array.
     """
     mu = min + 0.5 * (max - min)
     sigma = (max - min) / 6
-    result = normal(mu, sigma, size)
+    result = normal(mu, sigma, size) if rng is None else rng.normal(mu, sigma, size)
     return np.clip(np.int_(result), min, max-1)
 
 
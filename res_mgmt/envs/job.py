@@ -33,6 +33,24 @@ class Job:
             time_max=duration,
         )
 
+    @classmethod
+    def fromRequirements(cls, id: int, requirements: npt.NDArray[np.int_]):
+        """A job from its requirements with shape (num_resource_type, time_size).
+
+        Raises:
+            ValueError: An error occurred if the job requires nothing.
+        """
+        busy = requirements.any(axis=0)
+        if not busy.any():
+            raise ValueError("The requirements of a job cannot be all zero.")
+        duration = len(busy) - int(busy[::-1].argmax())
+        return cls(
+            id=id,
+            duration=duration,
+            requirements=requirements,
+            time_max=duration,
+        )
+
     @staticmethod
     def duration(image: npt.NDArray[np.bool_]) -> int:
         return np.max(np.where(image == True), axis=1)[1] + 1
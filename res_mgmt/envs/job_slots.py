@@ -1,24 +1,31 @@
+import heapq
 import numpy as np
 import numpy.typing as npt
-from typing import Dict
+from typing import Dict, List, Optional
 
 from res_mgmt.envs.backlog import Backlog
 from res_mgmt.envs.config import _EMPTY_CELL, Config, _DEFAULT_CONFIG
-from res_mgmt.envs.job import Job
+from res_mgmt.envs.generator import to_images
+from res_mgmt.envs.job_table import JobTable
 
 
 class JobSlots:
     """The job slots that contains all the jobs to be scheduled.
 
     Attributes:
-        state: 
-            The job slots "image". Numpy array with shape 
-            (num_job_slot, num_resource_type, time_size, resource_size)
         jobs: 
             Array of length num_job_slot indicating the job id 
-            of the corresponding job in the slots.
+            of the corresponding job in the slots. Assign a new array 
+            rather than writing into it, so the slot index stays in sync.
+        slots: 
+            Map from the job id to the index of its slot.
+        empty: 
+            Heap of the indices of the empty slots.
+        requirements: 
+            The requirements of the jobs in the slots. Numpy array with shape 
+            (num_job_slot, num_resource_type, time_size), zeros for empty slots.
         meta: 
-            Map from the job id to its metadata in Job.
+            The metadata of jobs.
     """
 
     def __init__(
@@ -27,16 +34,15 @@ class JobSlots:
         num_resource_type: int,  # d resource types
         time_size: int,          # column
         resource_size: int,      # row
-        meta: Dict[int, Job],    # meta data of jobs {job_index -> job_meta}
+        meta: JobTable,          # meta data of jobs
+        requirements: Optional[npt.NDArray[np.int_]] = None,  # buffer to write requirements into
     ) -> None:
-        shape = (
-            num_job_slot,
-            num_resource_type,
-            time_size,
-            resource_size,
-        )
-        self.state = np.full(shape, False, dtype=np.bool_)
         self.jobs = np.full(num_job_slot, _EMPTY_CELL, dtype=int)
+        if requirements is None:
+            requirements = np.zeros(
+                (num_job_slot, num_resource_type, time_size), dtype=np.int_)
+        self.requirements = requirements
+        self.resource_size = resource_size
         self.meta = meta
 
     @classmethod
@@ -51,20 +57,65 @@ class JobSlots:
             num_job_slot=config["num_job_slot"],
             time_size=config["time_size"],
             resource_size=config["resource_size"],
-            meta={},
+            meta=JobTable.fromConfig(config),
         )
 
+    @property
+    def jobs(self) -> npt.NDArray[np.int_]:
+        return self._jobs
+
+    @jobs.setter
+    def jobs(self, jobs: npt.NDArray[np.int_]) -> None:
+        self._jobs = np.array(jobs, dtype=int)
+        self.slots: Dict[int, int] = {
+            int(id): index for index, id in enumerate(self._jobs)
+            if id != _EMPTY_CELL}
+        self.empty: List[int] = [
+            int(index) for index in np.flatnonzero(self._jobs == _EMPTY_CELL)]
+        heapq.heapify(self.empty)
+
+    @property
+    def state(self) -> npt.NDArray[np.bool_]:
+        """The job slots "image", rebuilt from the requirements on demand.
+
+        Numpy array with shape 
+        (num_job_slot, num_resource_type, time_size, resource_size).
+        """
+        return to_images(self.requirements, self.resource_size)
+
     def refill(self, backlog: Backlog) -> None:
         """Refill the empty slots with top jobs from backlog.
+
+        The slots are refilled in the order of their indices.
         """
-        for index, job in enumerate(self.jobs):
-            if not backlog.queue:
-                break
-            if job != _EMPTY_CELL:
-                continue
-            id, image = backlog.get()
-            self.jobs[index] = id
-            self.state[index] = image
+        while self.empty and backlog.queue:
+            index = heapq.heappop(self.empty)
+            id = backlog.get()
+            self._jobs[index] = id
+            self.requirements[index] = self.meta.requirements[id]
+            self.slots[id] = index
+
+    def remove(self, id: int) -> Optional[int]:
+        """Remove the job from its slot.
+
+        Args:
+            id: The id of the job.
+
+        Returns:
+            Optional[int]: The index of the slot, None if the job is not in the slots.
+        """
+        index = self.slots.pop(id, None)
+        if index is not None:
+            self._jobs[index] = _EMPTY_CELL
+            self.requirements[index] = 0
+            heapq.heappush(self.empty, index)
+        return index
+
+    def clear(self) -> None:
+        """Remove all jobs from the slots.
+        """
+        self.jobs = np.full(len(self._jobs), _EMPTY_CELL, dtype=int)
+        self.requirements[...] = 0
 
     def durations(self) -> npt.NDArray[np.int_]:
         """The sum of the durations of all jobs in job slots.
@@ -72,12 +123,5 @@ class JobSlots:
         Returns:
             List of the durations of all jobs in job slots.
         """
-        jobs_in_cluster = np.delete(
-            self.jobs, np.where(self.jobs == _EMPTY_CELL))
-
-        if jobs_in_cluster.size == 0:
-            return np.array([])
-
-        def get_duration(id: int):
-            return self.meta[id].duration
-        return np.vectorize(get_duration)(jobs_in_cluster)
+        jobs_in_slots = self.jobs[self.jobs != _EMPTY_CELL]
+        return self.meta.duration[jobs_in_slots]
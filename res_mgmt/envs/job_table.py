@@ -0,0 +1,130 @@
+from typing import List
+import numpy as np
+import numpy.typing as npt
+
+from res_mgmt.envs.config import Config, _DEFAULT_CONFIG
+from res_mgmt.envs.job import Job
+
+
+class JobTable:
+    """The metadata of all jobs in the system, stored as struct of arrays.
+
+    Job ids index directly into the arrays, so the metadata of many jobs
+    can be gathered with fancy indexing, e.g. `table.duration[ids]`. Ids
+    are allocated increasingly and recycled once the job is released.
+
+    Supports the `dict[int, Job]` access used before, `table[id]` returns
+    a Job whose requirements is a view into the table.
+
+    Attributes:
+        duration: Durations of the jobs, shape (capacity,).
+        time_max: Time the jobs will consume, shape (capacity,).
+        requirements:
+            Requirements of the jobs, shape
+            (capacity, num_resource_type, time_size).
+        live: If the id is allocated, shape (capacity,).
+        arrival: Timestep the job arrived at, see `Res.time`, shape (capacity,).
+    """
+
+    def __init__(
+        self,
+        num_resource_type: int,  # d resource types
+        time_size: int,          # column
+        capacity: int = 64,
+    ) -> None:
+        self.duration = np.zeros(capacity, dtype=np.int32)
+        self.time_max = np.zeros(capacity, dtype=np.int32)
+        self.requirements = np.zeros(
+            (capacity, num_resource_type, time_size), dtype=np.int32)
+        self.live = np.zeros(capacity, dtype=np.bool_)
+        self.arrival = np.zeros(capacity, dtype=np.int64)
+        self.next_id = 0
+        self.free: List[int] = []
+
+    @classmethod
+    def fromConfig(cls, config: Config = _DEFAULT_CONFIG):
+        """Create a JobTable from config.
+
+        Args:
+            config: The config. If not specified, the default config will be used.
+        """
+        return cls(
+            num_resource_type=config["num_resource_type"],
+            time_size=config["time_size"],
+        )
+
+    def add(self, job: Job) -> int:
+        """Allocate an id for the job and store its metadata.
+
+        Args:
+            job: The job, its id will be set to the allocated id.
+
+        Returns:
+            int: The allocated id.
+        """
+        while True:
+            if self.free:
+                id = self.free.pop()
+            else:
+                id = self.next_id
+                self.next_id += 1
+            # skip the ids stored explicitly with `table[id] = job`
+            if id >= len(self.live) or not self.live[id]:
+                break
+        job.id = id
+        self[id] = job
+        return id
+
+    def release(self, id: int) -> None:
+        """Free the id so it can be allocated again.
+
+        Args:
+            id: The id of the job that left the system.
+        """
+        self.live[id] = False
+        self.free.append(id)
+
+    def clear(self) -> None:
+        """Release all jobs and restart the ids from 0.
+        """
+        self.live[:] = False
+        self.next_id = 0
+        self.free.clear()
+
+    def __setitem__(self, id: int, job: Job) -> None:
+        if id >= len(self.live):
+            self._grow(max(id + 1, 2 * len(self.live)))
+        self.duration[id] = 0 if job.duration is None else job.duration
+        self.time_max[id] = 0 if job.time_max is None else job.time_max
+        if job.requirements is None:
+            self.requirements[id] = 0
+        else:
+            self.requirements[id] = job.requirements
+        self.live[id] = True
+
+    def __getitem__(self, id: int) -> Job:
+        if id not in self:
+            raise KeyError(id)
+        return Job(
+            id=id,
+            duration=int(self.duration[id]),
+            requirements=self.requirements[id],
+            time_max=int(self.time_max[id]),
+        )
+
+    def __contains__(self, id: int) -> bool:
+        return 0 <= id < len(self.live) and bool(self.live[id])
+
+    def __len__(self) -> int:
+        return int(self.live.sum())
+
+    def _grow(self, capacity: int) -> None:
+        def grow(arr: npt.NDArray) -> npt.NDArray:
+            result = np.zeros((capacity,) + arr.shape[1:], dtype=arr.dtype)
+            result[:len(arr)] = arr
+            return result
+        self.duration = grow(self.duration)
+        self.time_max = grow(self.time_max)
+        self.requirements = grow(self.requirements)
+        self.live = grow(self.live)
+        self.arrival = grow(self.arrival)
@@ -0,0 +1,147 @@
+from functools import lru_cache
+import numpy as np
+import numpy.typing as npt
+
+
+def find_positions(
+    empty_cells_cluster: npt.NDArray[np.int_],
+    requirements: npt.NDArray[np.int_],
+    time_max: npt.NDArray[np.int_],
+) -> npt.NDArray[np.int_]:
+    """Find the earliest start position of every job in one pass.
+
+    A job fits at start `s` if for every job time `j < time_max` and every 
+    resource type, the cluster has at least `requirements[type, j]` empty 
+    cells at timestep `s + j`, and the job ends inside the cluster.
+
+    Any leading dimensions are treated as a batch, e.g. the empty cells 
+    of N clusters with shape (N, num_resource_type, time_size) and the 
+    requirements of their slots with shape 
+    (N, num_job_slot, num_resource_type, time_size).
+
+    Most jobs fit at the earliest start where their first timestep fits, 
+    that start is checked for all jobs at once. Only the others are 
+    searched at every start, over a window as long as the longest of 
+    them, see `_search()`. The empty slots, `time_max == 0`, are skipped.
+
+    Args:
+        empty_cells_cluster (npt.NDArray[np.int_]): 
+            Empty cells per resource type per timestep, 
+            shape (..., num_resource_type, time_size).
+        requirements (npt.NDArray[np.int_]): 
+            Requirements of the jobs, 
+            shape (..., num_job, num_resource_type, time_size).
+        time_max (npt.NDArray[np.int_]): 
+            Time the jobs will consume, shape (..., num_job).
+
+    Returns:
+        npt.NDArray[np.int_]: 
+            Start positions with shape (..., num_job), [0 - time_size] if 
+            found available position, otherwise -1.
+    """
+    time_size = empty_cells_cluster.shape[-1]
+    time_max = np.asarray(time_max)
+    positions = np.zeros(time_max.shape, dtype=np.int_)
+    # the empty slots fit anywhere, only the jobs are searched
+    jobs = time_max > 0
+    if not jobs.any():
+        return positions
+    empty_cells = np.broadcast_to(
+        empty_cells_cluster[..., None, :, :], requirements.shape)[jobs]
+    requirements = requirements[jobs]
+    time_max = time_max[jobs]
+    length = int(time_max.max())
+    job_time = np.arange(length)
+
+    # the earliest start where the first job timestep fits
+    first = (empty_cells >= requirements[:, :, :1]).all(axis=1)  # (job, start)
+    first &= np.arange(time_size) <= time_size - time_max[:, None]
+    start = first.argmax(axis=1)
+    window = np.minimum(start[:, None] + job_time, time_size - 1)
+    cells = np.take_along_axis(empty_cells, window[:, None, :], axis=2)
+    fit = ((cells >= requirements[:, :, :length]) |
+           (job_time >= time_max[:, None, None])).all(axis=(1, 2))
+    found = np.where(first.any(axis=1), np.where(fit, start, -1), -1)
+
+    rest = first.any(axis=1) & ~fit
+    if rest.any():
+        found[rest] = _search(empty_cells[rest], requirements[rest], time_max[rest])
+    positions[jobs] = found
+    return positions
+
+
+def find_position(
+    empty_cells_cluster: npt.NDArray[np.int_],
+    requirements: npt.NDArray[np.int_],
+    time_max: int,
+) -> int:
+    """`find_positions()` of a single job, without the batch overhead.
+
+    Args:
+        empty_cells_cluster (npt.NDArray[np.int_]): 
+            Empty cells per resource type per timestep, 
+            shape (num_resource_type, time_size).
+        requirements (npt.NDArray[np.int_]): 
+            Requirements of the job, shape (num_resource_type, time_size).
+        time_max (int): Time the job will consume.
+
+    Returns:
+        int: [0 - time_size] if found available position, otherwise -1.
+    """
+    time_size = empty_cells_cluster.shape[-1]
+    if not 0 < time_max <= time_size:
+        return -1
+    starts = time_size - time_max + 1
+    requirements = requirements[:, :time_max]
+    # the earliest start where the first job timestep fits
+    first = (empty_cells_cluster[:, :starts] >= requirements[:, :1]).all(axis=0)
+    if not first.any():
+        return -1
+    start = int(first.argmax())
+    if (empty_cells_cluster[:, start:start + time_max] >= requirements).all():
+        return start
+    return int(_search(empty_cells_cluster[None], requirements[None], np.array([time_max]))[0])
+
+
+def _search(
+    empty_cells: npt.NDArray[np.int_],
+    requirements: npt.NDArray[np.int_],
+    time_max: npt.NDArray[np.int_],
+) -> npt.NDArray[np.int_]:
+    """The earliest start of each job, searched at every start.
+
+    Args:
+        empty_cells (npt.NDArray[np.int_]): 
+            Empty cells of the cluster of each job, 
+            shape (num_job, num_resource_type, time_size).
+        requirements (npt.NDArray[np.int_]): 
+            Requirements with shape (num_job, num_resource_type, >= max(time_max)).
+        time_max (npt.NDArray[np.int_]): Positive time the jobs will consume.
+
+    Returns:
+        npt.NDArray[np.int_]: Start positions with shape (num_job,), -1 if none.
+    """
+    time_size = empty_cells.shape[-1]
+    # no job looks further than the longest one
+    length = int(time_max.max())
+    # short[job, t, j]: at timestep t some type lacks cells for job time j
+    short = (empty_cells[..., None] < requirements[:, :, None, :length]).any(axis=1)
+    # ignore whatever lies after the end of the job
+    short &= np.arange(length) < time_max[:, None, None]
+    # the job fits at start s if no (s + j, j) is short
+    short = short.reshape(len(time_max), -1)[:, _diagonals(time_size, length)]
+    fits = ~short.any(axis=-1)  # (job, start)
+    fits &= np.arange(time_size) <= time_size - time_max[:, None]
+    return np.where(fits.any(axis=-1), fits.argmax(axis=-1), -1)
+
+
+@lru_cache(maxsize=256)
+def _diagonals(time_size: int, length: int) -> npt.NDArray[np.intp]:
+    """Flat indices of (s + j, j) in a (time_size, length) array, shape (time_size, length).
+
+    Past the end of the cluster, s + j >= time_size, the index is clipped 
+    to the last timestep. Those are only read for the starts where the 
+    job does not end inside the cluster, which are masked anyway.
+    """
+    time = np.minimum(np.arange(time_size)[:, None] + np.arange(length), time_size - 1)
+    return time * length + np.arange(length)
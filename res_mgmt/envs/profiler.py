@@ -0,0 +1,109 @@
+from collections import defaultdict
+from time import perf_counter_ns
+from typing import DefaultDict, Dict, Iterable
+
+Stats = Dict[str, Dict[str, float]]
+
+
+class Profiler:
+    """Accumulated wall time and call counts per phase of a step.
+
+    The instrumented code keeps a timestamp and calls `lap()` at the end
+    of each phase. It checks for a profiler before taking any time, so
+    an environment without a profiler pays a single `is None` test per
+    phase.
+
+    ```python
+    if profiler is not None:
+        t = perf_counter_ns()
+    ...  # the phase
+    if profiler is not None:
+        t = profiler.lap("phase", t)
+    ```
+
+    Phases nest, e.g. "step" includes "schedule", and "time_proceed"
+    includes "time_proceed.arrivals".
+
+    Attributes:
+        total_ns: Nanoseconds spent per phase.
+        calls: Number of times per phase.
+        current: Nanoseconds spent per phase since `start_step()`.
+    """
+
+    def __init__(self) -> None:
+        self.total_ns: DefaultDict[str, int] = defaultdict(int)
+        self.calls: DefaultDict[str, int] = defaultdict(int)
+        self.current: DefaultDict[str, int] = defaultdict(int)
+
+    def lap(self, phase: str, start: int) -> int:
+        """Add the time since start to the phase.
+
+        Args:
+            phase (str): Name of the phase.
+            start (int): `perf_counter_ns()` at the start of the phase.
+
+        Returns:
+            int: `perf_counter_ns()` now, the start of the next phase.
+        """
+        now = perf_counter_ns()
+        self.total_ns[phase] += now - start
+        self.calls[phase] += 1
+        self.current[phase] += now - start
+        return now
+
+    def start_step(self) -> None:
+        """Start counting the timings of a new step in `current`."""
+        self.current = defaultdict(int)
+
+    def stats(self) -> Stats:
+        """The timings per phase.
+
+        Returns:
+            Stats: Per phase, the "calls", the "total_ns" and the "mean_ns".
+        """
+        return {
+            phase: {
+                "calls": self.calls[phase],
+                "total_ns": total_ns,
+                "mean_ns": total_ns / self.calls[phase],
+            }
+            for phase, total_ns in self.total_ns.items()
+        }
+
+    def clear(self) -> None:
+        """Forget all timings."""
+        self.total_ns.clear()
+        self.calls.clear()
+        self.current = defaultdict(int)
+
+
+def aggregate(stats: Iterable[Stats]) -> Stats:
+    """Sum the timings of many environments, e.g. the envs of a vector env.
+
+    ```python
+    aggregate(vec_env.env_method("perf_stats"))
+    ```
+
+    A `BatchedResMgmtEnv` shares one profiler among its environments, 
+    its `perf_stats()` is already the aggregate.
+
+    Args:
+        stats (Iterable[Stats]): The stats of each environment, see `Profiler.stats()`.
+
+    Returns:
+        Stats: The stats of all environments together.
+    """
+    total_ns: DefaultDict[str, int] = defaultdict(int)
+    calls: DefaultDict[str, int] = defaultdict(int)
+    for env_stats in stats:
+        for phase, phase_stats in env_stats.items():
+            total_ns[phase] += phase_stats["total_ns"]
+            calls[phase] += phase_stats["calls"]
+    return {
+        phase: {
+            "calls": calls[phase],
+            "total_ns": total_ns[phase],
+            "mean_ns": total_ns[phase] / calls[phase] if calls[phase] else 0.0,
+        }
+        for phase in total_ns
+    }
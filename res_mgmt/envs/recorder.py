@@ -0,0 +1,241 @@
+import json
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+import gym
+import numpy as np
+import numpy.typing as npt
+
+from res_mgmt.envs.res_mgmt_env import ResMgmtEnv
+
+# the files of a log, one raw binary file per column
+_META = "meta.json"
+
+# name -> (dtype, shape of a row), the action column is added per env
+_EPISODE_COLUMNS = {
+    "seed": ("<i8", ()),
+    "start": ("<i8", ()),  # first step row of the episode
+}
+_STEP_COLUMNS = {
+    "reward": ("<f8", ()),
+    "done": ("|b1", ()),
+}
+_PLACEMENT_COLUMNS = {
+    "row": ("<i8", ()),  # step row of the placement
+    "slot": ("<i4", ()),
+    "position": ("<i4", ()),
+}
+
+
+class _Columns:
+    """Columns appended through a bounded buffer, flushed to raw files in chunks."""
+
+    def __init__(self, path: str, columns: Dict[str, Tuple[str, tuple]], buffer_size: int) -> None:
+        self.files = {name: open(os.path.join(path, name + ".bin"), "ab")
+                      for name in columns}
+        self.buffers = {name: np.empty((buffer_size,) + tuple(shape), dtype=dtype)
+                        for name, (dtype, shape) in columns.items()}
+        self.size = 0
+
+    def append(self, **values) -> None:
+        for name, buffer in self.buffers.items():
+            buffer[self.size] = values[name]
+        self.size += 1
+        if self.size == len(next(iter(self.buffers.values()))):
+            self.flush()
+
+    def flush(self) -> None:
+        for name, buffer in self.buffers.items():
+            self.files[name].write(buffer[:self.size].tobytes())
+            self.files[name].flush()
+        self.size = 0
+
+    def close(self) -> None:
+        self.flush()
+        for f in self.files.values():
+            f.close()
+
+
+class EpisodeRecorder(gym.Wrapper):
+    """Record the episodes of an environment for replaying them later.
+
+    Logs the config of the environment, the seed of every episode, and the
+    action, reward and placements of every step, into a directory with
+    one raw binary file per column. The rows are kept in a buffer of
+    `buffer_size` rows and appended to the files in chunks, so recording
+    is cheap and the memory bounded. Read the log with `EpisodeLog`.
+
+    Every reset is seeded, a seed is drawn from the global numpy random
+    state if not given, so that `EpisodeLog.replay()` can rebuild the
+    state of any step from the seed and the actions.
+    """
+
+    def __init__(
+        self,
+        env: ResMgmtEnv,        # the environment to record
+        path: str,              # directory of the log
+        buffer_size: int = 1024,  # rows kept before appending to the files
+    ) -> None:
+        super().__init__(env)
+        os.makedirs(path, exist_ok=True)
+        action_space = env.action_space
+        columns = {
+            "action": (action_space.dtype.str, action_space.shape),
+            **_STEP_COLUMNS,
+        }
+        meta = {
+            "config": env.config(),
+            "episodes": _describe(_EPISODE_COLUMNS),
+            "steps": _describe(columns),
+            "placements": _describe(_PLACEMENT_COLUMNS),
+        }
+        meta_path = os.path.join(path, _META)
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                if json.load(f) != meta:
+                    raise ValueError(f"Log {path} was recorded with another config.")
+        else:
+            with open(meta_path, "w") as f:
+                json.dump(meta, f, indent=2)
+
+        self.path = path
+        self.episodes = _Columns(path, _EPISODE_COLUMNS, buffer_size)
+        self.steps = _Columns(path, columns, buffer_size)
+        self.placements = _Columns(path, _PLACEMENT_COLUMNS, buffer_size)
+        # rows already in the files, logs are appended to
+        self.row = _count_rows(path, "reward", _STEP_COLUMNS["reward"])
+
+    def reset(self, seed: Optional[int] = None, **kwargs):
+        if seed is None:
+            seed = int(np.random.randint(2**31))
+        self.episodes.append(seed=seed, start=self.row)
+        return self.env.reset(seed, **kwargs)
+
+    def step(self, action):
+        state, reward, done, info = self.env.step(action)
+        self.steps.append(action=action, reward=reward, done=done)
+        for slot, position in info.get("placements", ()):
+            self.placements.append(row=self.row, slot=slot, position=position)
+        self.row += 1
+        return state, reward, done, info
+
+    def flush(self) -> None:
+        """Append the buffered rows to the files."""
+        self.episodes.flush()
+        self.steps.flush()
+        self.placements.flush()
+
+    def close(self) -> None:
+        self.episodes.close()
+        self.steps.close()
+        self.placements.close()
+        super().close()
+
+
+class EpisodeLog:
+    """A log written by `EpisodeRecorder`, the columns are memory-mapped.
+
+    Attributes:
+        config: The config of the recorded environment.
+        episodes: Columns "seed" and "start" (first step row) per episode.
+        steps: Columns "action", "reward" and "done" per step.
+        placements: Columns "row" (step row), "slot" and "position" per scheduled job.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(os.path.join(path, _META)) as f:
+            meta = json.load(f)
+        self.path = path
+        self.config = meta["config"]
+        self.episodes = _load(path, meta["episodes"])
+        self.steps = _load(path, meta["steps"])
+        self.placements = _load(path, meta["placements"])
+
+    def __len__(self) -> int:
+        """The number of episodes."""
+        return len(self.episodes["seed"])
+
+    def episode_rows(self, episode: int) -> range:
+        """The step rows of the episode."""
+        start = int(self.episodes["start"][episode])
+        if episode + 1 < len(self):
+            stop = int(self.episodes["start"][episode + 1])
+        else:
+            stop = len(self.steps["reward"])
+        return range(start, stop)
+
+    def episode_placements(self, episode: int) -> Dict[str, npt.NDArray]:
+        """The placements of the episode."""
+        rows = self.episode_rows(episode)
+        found = self.placements["row"]
+        begin, end = np.searchsorted(found, [rows.start, rows.stop])
+        return {name: column[begin:end] for name, column in self.placements.items()}
+
+    def states(self, episode: int, check: bool = True) -> Iterator[ResMgmtEnv]:
+        """Replay the episode, yields the environment after the reset and every step.
+
+        The same environment is yielded every time, copy what is kept.
+
+        Args:
+            episode (int): Index of the episode.
+            check (bool, optional): Compare the rewards with the log. Defaults to True.
+
+        Raises:
+            ValueError: An error occurred if the replay diverges from the log.
+        """
+        env = ResMgmtEnv.fromConfig(self.config)
+        env.reset(int(self.episodes["seed"][episode]))
+        yield env
+        for row in self.episode_rows(episode):
+            action = self.steps["action"][row]
+            if env.action_mode == "single":
+                action = int(action)
+            _, reward, _, _ = env.step(action)
+            if check and not np.isclose(reward, self.steps["reward"][row]):
+                msg = f"Replay diverged at row {row}: reward {reward} != {self.steps['reward'][row]}."
+                raise ValueError(msg)
+            yield env
+
+    def replay(self, episode: int, step: int, check: bool = True) -> ResMgmtEnv:
+        """Rebuild the environment of the episode after the given number of steps.
+
+        Args:
+            episode (int): Index of the episode.
+            step (int): Number of steps, 0 for the state after the reset.
+            check (bool, optional): Compare the rewards with the log. Defaults to True.
+
+        Returns:
+            ResMgmtEnv: The environment, `env.res` is the state of the step.
+
+        Raises:
+            IndexError: An error occurred if the episode has fewer steps.
+        """
+        if not 0 <= step <= len(self.episode_rows(episode)):
+            raise IndexError(f"Episode {episode} has no step {step}.")
+        for index, env in enumerate(self.states(episode, check)):
+            if index == step:
+                return env
+
+
+def _describe(columns: Dict[str, Tuple[str, tuple]]) -> Dict[str, List]:
+    return {name: [dtype, list(shape)] for name, (dtype, shape) in columns.items()}
+
+
+def _count_rows(path: str, name: str, column: Tuple[str, tuple]) -> int:
+    dtype, shape = column
+    file = os.path.join(path, name + ".bin")
+    if not os.path.exists(file):
+        return 0
+    return os.path.getsize(file) // (np.dtype(dtype).itemsize * int(np.prod(shape)))
+
+
+def _load(path: str, columns: Dict[str, List]) -> Dict[str, npt.NDArray]:
+    result = {}
+    for name, (dtype, shape) in columns.items():
+        rows = _count_rows(path, name, (dtype, tuple(shape)))
+        if rows == 0:
+            result[name] = np.empty((0,) + tuple(shape), dtype=dtype)
+        else:
+            result[name] = np.memmap(
+                os.path.join(path, name + ".bin"), dtype=dtype,
+                mode="r", shape=(rows,) + tuple(shape))
+    return result
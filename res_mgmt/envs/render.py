@@ -4,183 +4,115 @@ import numpy.typing as npt
 import pygame
 from pygame.color import THECOLORS as C
 
-from res_mgmt.envs.config import _EMPTY_CELL
+from res_mgmt.envs.drawing import draw, text_position
 from res_mgmt.envs.res import Res
 
-os.environ["SDL_VIDEODRIVER"] = "dummy"
-
-testres = Res.fromConfig()
-
-testres.clusters.state = np.array([
-    [
-        [0, 1, 1],
-        [1, 1, 2],
-        [1, 1, -1],
-        [-1, -1, -1],
-        [-1, -1, -1],
-    ],
-    [
-        [0, 1, -1],
-        [1, 2, 2],
-        [1, -1, -1],
-        [-1, -1, -1],
-        [-1, -1, -1],
-    ],
-])
-testres.job_slots.state = np.array([
-    [
-        [
-            [1, 1, 0],
-            [1, 1, 0],
-            [0, 0, 0],
-            [0, 0, 0],
-            [0, 0, 0],
-        ],
-        [
-            [1, 0, 0],
-            [1, 0, 0],
-            [0, 0, 0],
-            [0, 0, 0],
-            [0, 0, 0],
-        ],
-    ],
-    [
-        [
-            [1, 0, 0],
-            [0, 0, 0],
-            [0, 0, 0],
-            [0, 0, 0],
-            [0, 0, 0],
-        ],
-        [
-            [1, 1, 0],
-            [0, 0, 0],
-            [0, 0, 0],
-            [0, 0, 0],
-            [0, 0, 0],
-        ],
-    ],
-    [
-        [
-            [1, 1, 1],
-            [1, 1, 1],
-            [1, 1, 1],
-            [0, 0, 0],
-            [0, 0, 0],
-        ],
-        [
-            [1, 0, 0],
-            [1, 0, 0],
-            [1, 0, 0],
-            [0, 0, 0],
-            [0, 0, 0],
-        ],
-    ],
-], dtype=np.bool_)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+
+def frame(res: Res, unit: int = 10) -> npt.NDArray[np.uint8]:
+    """The clusters and job slots drawn as an RGB image, without the backlog text.
+
+    See `draw()`.
+
+    Args:
+        res (Res): The resources to draw.
+        unit (int, optional): Size of a cell in pixels. Defaults to 10.
+
+    Returns:
+        npt.NDArray[np.uint8]: The image with shape (height, width, 3).
+    """
+    return draw(res.clusters.state, res.job_slots.requirements, unit)
+
 
-testres.backlog.state = 1
+def _font():
+    return pygame.font.SysFont('Comic Sans MS', 30)
 
-colours = [
-    "green",
-    "red",
-    "brown",
-    "orange",
-    "yellow",
-    "purple",
-    "pink",
-    "blue",
-    "white",
-    "gray",
-]
+
+def write_text(
+    image: npt.NDArray[np.uint8],
+    backlog: int,
+    num_job_slot: int,
+    resource_size: int,
+    unit: int = 10,
+) -> None:
+    """Write the backlog count into the image of `draw()`, like `render()` does.
+
+    Needs `pygame.font.init()`, but no display. Fonts are not thread 
+    safe, call it from one thread at a time.
+    """
+    text = pygame.surfarray.array3d(
+        _font().render(str(backlog), False, C["black"], C["white"]))
+    text = text.transpose(1, 0, 2)
+    x, y = text_position(image, num_job_slot, resource_size, unit)
+    height = min(text.shape[0], image.shape[0] - y)
+    width = min(text.shape[1], image.shape[1] - x)
+    image[y:y + height, x:x + width] = text[:height, :width]
 
 
 def render(res: Res):
-    (num_job_slot,
-     num_resource_type,
-     time_size,
-     resource_size,
-     ) = res.job_slots.state.shape
+    requirements = res.job_slots.requirements
+    num_job_slot, _, _ = requirements.shape
+    resource_size = res.clusters.shape[2]
 
     unit = 10
 
-    width_unit = (
-        resource_size * (num_job_slot + 1) +
-        num_job_slot + 4 + 3   # 3 for the text
-    )
-    height_unit = time_size * num_resource_type + num_resource_type + 1
-
-    width, height = unit * width_unit, unit * height_unit
+    image = frame(res, unit)
+    height, width, _ = image.shape
 
     screen = pygame.display.set_mode((width, height))
-    surf = pygame.Surface((width, height))
-    surf.fill(C["white"])
-
-    def scale_tuple(t, scale):
-        return tuple([scale * x for x in t])
-
-    def block(x, y):
-        x = (x+1) + resource_size*x
-        y = (y+1) + time_size*y
-        return (x, y, resource_size, time_size)
-
-    blocks = [block(s, t)
-              for s in range(num_job_slot + 1)
-              for t in range(num_resource_type)
-              ]
-
-    def cell(block, x, y, fill):
-        (bx, by, _, _) = block
-        rect = (bx+x, by+y, 1, 1)
-        pygame.draw.rect(surf, fill, scale_tuple(rect, unit))
-        pygame.draw.rect(surf, C["black"], scale_tuple(rect, unit), 1)
-
-    for slot in range(num_job_slot):
-        for type in range(num_resource_type):
-            # slot + 1 to skip the clusters in blocks
-            b = blocks[(slot+1) * num_resource_type + type]
-            for time in range(time_size):
-                for resource in range(resource_size):
-                    c = res.job_slots.state[slot, type, time, resource]
-                    if c:
-                        cell(b, resource, time, C["skyblue"])
-                    else:
-                        cell(b, resource, time, C["white"])
-
-    for type in range(num_resource_type):
-        b = blocks[0 * num_resource_type + type]
-        for time in range(time_size):
-            for resource in range(resource_size):
-                c = res.job_slots.state[slot, type, time, resource]
-                c = res.clusters.state[type, time, resource]
-                if c != _EMPTY_CELL:
-                    if c < len(colours):
-                        colour = C[colours[c]]
-                    else:
-                        colour = list(C.values())[(c - len(colours)) % len(C.values())]
-                    cell(b, resource, time, colour)
-                else:
-                    cell(b, resource, time, C["white"])
-
-    for rect in blocks:
-        pygame.draw.rect(surf, C["black"], scale_tuple(rect, unit), 2)
-
-    screen.blit(surf, (0, 0))
-
-    myfont = pygame.font.SysFont('Comic Sans MS', 30)
-    textsurface = myfont.render(str(res.backlog.state), False, C["black"])
-    text_pos = (
-        resource_size * (num_job_slot + 1) + num_job_slot + 2,
-        height_unit // 2,
-    )
-    screen.blit(textsurface, scale_tuple(text_pos, unit))
+    # surfarray is indexed (x, y)
+    pygame.surfarray.blit_array(screen, image.transpose(1, 0, 2))
+
+    textsurface = _font().render(str(res.backlog.state), False, C["black"])
+    screen.blit(textsurface, text_position(image, num_job_slot, resource_size, unit))
     return screen
 
 
+def demo_res() -> Res:
+    """A small res with hand-written clusters and job slots, for demos and tests."""
+    res = Res.fromConfig()
+
+    res.clusters.state = np.array([
+        [
+            [0, 1, 1],
+            [1, 1, 2],
+            [1, 1, -1],
+            [-1, -1, -1],
+            [-1, -1, -1],
+        ],
+        [
+            [0, 1, -1],
+            [1, 2, 2],
+            [1, -1, -1],
+            [-1, -1, -1],
+            [-1, -1, -1],
+        ],
+    ])
+    res.job_slots.requirements[...] = np.array([
+        [
+            [2, 2, 0, 0, 0],
+            [1, 1, 0, 0, 0],
+        ],
+        [
+            [1, 0, 0, 0, 0],
+            [2, 0, 0, 0, 0],
+        ],
+        [
+            [3, 3, 3, 0, 0],
+            [1, 1, 1, 0, 0],
+        ],
+    ])
+
+    res.backlog.state = 1
+    return res
+
+
 if __name__ == "__main__":
     # pygame.init()
     pygame.display.init()
     pygame.font.init()
-    screen = render(testres)
+    screen = render(demo_res())
     pygame.image.save(screen, "output.png")
     pygame.display.quit()
     pygame.font.quit()
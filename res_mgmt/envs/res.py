@@ -1,4 +1,5 @@
-from typing import List, Optional
+from time import perf_counter_ns
+from typing import Iterable, Iterator, List, Optional, Tuple
 import numpy as np
 import numpy.typing as npt
 
@@ -8,6 +9,9 @@ from res_mgmt.envs.config import _EMPTY_CELL, Config, _DEFAULT_CONFIG
 from res_mgmt.envs.generator import get_generator
 from res_mgmt.envs.job import Job
 from res_mgmt.envs.job_slots import JobSlots
+from res_mgmt.envs.job_table import JobTable
+from res_mgmt.envs.placement import find_position
+from res_mgmt.envs.profiler import Profiler
 
 
 class Res:
@@ -19,6 +23,14 @@ class Res:
         backlog: Unscheduled jobs that's not in job_slots.
         meta: Metadata of jobs.
         empty_cells_cluster: Empty cells per timestep (row) per resource type.
+        inv_duration_sum: Sum of 1 / duration of all jobs in the system.
+        time: Number of timesteps proceeded since the reset.
+        used_cells: Cells of the clusters used by the timesteps proceeded.
+        profiler: Times the phases of the methods if set, see `Profiler`.
+        observation: 
+            The flat observation buffer returned by `state()`. The empty 
+            cells of clusters and the requirements of job slots are views 
+            into it, so it is always up to date.
     """
 
     def __init__(
@@ -29,18 +41,19 @@ class Res:
         num_job_slot: int,  # first M jobs
         max_num_job: int,
         new_job_rate: float,
+        rng: Optional[np.random.Generator] = None,  # generator of the jobs and arrivals
+        debug: bool = False,  # check the incremental bookkeeping every change
     ) -> None:
-        self.meta: dict[int, Job] = {}
-        # Add job meta for empty cell so it can be used in state()
-        self.meta[_EMPTY_CELL] = Job(
-            id=_EMPTY_CELL,
-            duration=0,
-            requirements=np.zeros(
-                (num_resource_type, time_size),
-                dtype=np.int_,
-            ),
-            time_max=0,
-        )
+        self.meta = JobTable(num_resource_type, time_size)
+        # [clusters_state, job_slots_state, backlog_state]
+        clusters_size = num_resource_type * time_size
+        job_slots_size = num_job_slot * clusters_size
+        self.observation = np.zeros(
+            clusters_size + job_slots_size + 1, dtype=np.int_)
+        self._empty_cells_cluster = self.observation[:clusters_size].reshape(
+            num_resource_type, time_size)
+        self._backlog_state = self.observation[-1:]
+
         self.clusters = Clusters(
             num_resource_type=num_resource_type,
             time_size=time_size,
@@ -53,15 +66,23 @@ class Res:
             time_size=time_size,
             resource_size=resource_size,
             meta=self.meta,
+            requirements=self.observation[clusters_size:-1].reshape(
+                num_job_slot, num_resource_type, time_size),
         )
         self.backlog = Backlog(
             meta=self.meta,
-            generator=get_generator(num_resource_type, time_size, resource_size),
+            generator=get_generator(
+                num_resource_type, time_size, resource_size, rng=rng),
             new_job_rate=new_job_rate,
+            rng=rng,
         )
-        self.empty_cells_cluster = np.full(
-            (num_resource_type, time_size), resource_size, dtype=int)
+        self.empty_cells_cluster = resource_size
         self.max_num_job = max_num_job
+        self.inv_duration_sum = 0.0
+        self.time = 0
+        self.used_cells = 0
+        self.debug = debug
+        self.profiler: Optional[Profiler] = None
 
     @classmethod
     def fromConfig(cls, config: Config = _DEFAULT_CONFIG):
@@ -79,6 +100,44 @@ class Res:
             new_job_rate=config["new_job_rate"],
         )
 
+    @property
+    def empty_cells_cluster(self) -> npt.NDArray[np.int_]:
+        return self._empty_cells_cluster
+
+    @empty_cells_cluster.setter
+    def empty_cells_cluster(self, empty_cells_cluster: npt.NDArray[np.int_]) -> None:
+        # keep the view into the observation buffer
+        self._empty_cells_cluster[...] = empty_cells_cluster
+
+    def reset(
+        self,
+        generator: Optional[Iterator[npt.NDArray[np.int_]]] = None,
+        trace: Optional[Iterator[Tuple[int, npt.NDArray[np.int_]]]] = None,
+    ) -> None:
+        """Remove all jobs to start over, reusing the arrays in place.
+
+        Args:
+            generator: 
+                Generator of the new jobs, see `get_generator()`. 
+                Keeps the current one if None.
+            trace: 
+                Arrivals to replay instead, see `Trace.jobs()`. 
+                Keeps the current one if None.
+        """
+        self.meta.clear()
+        self.clusters.clear()
+        self.job_slots.clear()
+        self.backlog.clear()
+        if generator is not None:
+            self.backlog.generator = generator
+        if trace is not None:
+            self.backlog.trace = trace
+        self.empty_cells_cluster = self.clusters.shape[2]
+        self._backlog_state[0] = 0
+        self.inv_duration_sum = 0.0
+        self.time = 0
+        self.used_cells = 0
+
     def actions(self) -> List[Optional[int]]:
         """Get available actions.
 
@@ -98,10 +157,33 @@ class Res:
         Clusters proceed one timestep, and 
         refill job_slots with the jobs in backlog.
         """
-        self.clusters.time_proceed()
-        self.backlog.time_proceed()
+        profiler = self.profiler
+        if profiler is not None:
+            start = t = perf_counter_ns()
+        empty_cells_cluster = self.empty_cells_cluster
+        self.used_cells += empty_cells_cluster.shape[0] * self.clusters.shape[2] - int(
+            empty_cells_cluster[:, 0].sum())
+        self.time += 1
+        self.inv_duration_sum -= self.clusters.time_proceed()
+        if profiler is not None:
+            t = profiler.lap("time_proceed.clusters", t)
+        for job in self.backlog.time_proceed():
+            self.inv_duration_sum += 1 / job.duration
+            self.meta.arrival[job.id] = self.time
+        if profiler is not None:
+            t = profiler.lap("time_proceed.arrivals", t)
         self.job_slots.refill(self.backlog)
-        self.update_empty_cells_cluster()
+        if profiler is not None:
+            t = profiler.lap("time_proceed.refill", t)
+
+        # shift the empty cells like the clusters, the new timestep is all empty
+        empty_cells_cluster[:, :-1] = empty_cells_cluster[:, 1:]
+        empty_cells_cluster[:, -1] = self.clusters.shape[2]
+        if profiler is not None:
+            profiler.lap("time_proceed.empty_cells", t)
+            profiler.lap("time_proceed", start)
+        if self.debug:
+            self.check_empty_cells_cluster()
 
     def durations(self) -> npt.NDArray[np.int_]:
         """Durations for all jobs in the systems either scheduled or waiting for service.
@@ -124,34 +206,48 @@ class Res:
             job_id (int): Id of the job.
 
         Returns:
-            int: [0 - time_size] if found available position, otherwise -1.
+            int: 
+                [0 - time_size] if found available position, otherwise -1 
+                (also for `_EMPTY_CELL`, the id of an empty slot).
         """
+        if job_id == _EMPTY_CELL:
+            return -1
+        profiler = self.profiler
+        if profiler is not None:
+            t = perf_counter_ns()
         job_meta = self.meta[job_id]
-        empty_cells_cluster = self.empty_cells_cluster
-        time_size = self.clusters.state.shape[1]
-        num_resource_type = self.clusters.state.shape[0]
-        req = job_meta.requirements
-        index_time = 0
-        start_index = 0
-
-        def try_current_time(cluster_time, job_time):
-            for resource_type in range(num_resource_type):
-                if empty_cells_cluster[resource_type, cluster_time] < req[resource_type, job_time]:
-                    return False
-            return True
-
-        for time in range(time_size):
-            if index_time >= job_meta.time_max:
-                break
-            if try_current_time(time, index_time):
-                index_time += 1
-            else:
-                index_time = 0
-                start_index = time + 1
+        position = find_position(
+            self.empty_cells_cluster, job_meta.requirements, int(job_meta.time_max))
+        if profiler is not None:
+            profiler.lap("find_pos", t)
+        return position
 
-        if index_time < job_meta.time_max:
-            return -1
-        return start_index
+    def find_all_pos(self) -> npt.NDArray[np.int_]:
+        """Find available positions for all jobs in the job slots.
+
+        The jobs of one cluster mostly fit at their first candidate start, 
+        the single job search of `find_pos()` per slot is cheaper than the 
+        batch kernel `find_positions()` here.
+
+        Returns:
+            npt.NDArray[np.int_]: 
+                Positions per job slot, [0 - time_size] if found available 
+                position, otherwise -1 (also for the empty slots).
+        """
+        profiler = self.profiler
+        if profiler is not None:
+            t = perf_counter_ns()
+        empty_cells_cluster = self.empty_cells_cluster
+        requirements = self.job_slots.requirements
+        time_max = self.meta.time_max
+        positions = np.full(len(self.job_slots.jobs), -1)
+        for slot, job_id in enumerate(self.job_slots.jobs.tolist()):
+            if job_id != _EMPTY_CELL:
+                positions[slot] = find_position(
+                    empty_cells_cluster, requirements[slot], int(time_max[job_id]))
+        if profiler is not None:
+            profiler.lap("find_all_pos", t)
+        return positions
 
     def schedule(self, job_id: int, start_time_pos: int) -> bool:
         """Schedule the job given job id.
@@ -171,45 +267,82 @@ class Res:
         """
         if start_time_pos == -1:
             return False
+        profiler = self.profiler
+        if profiler is not None:
+            t = perf_counter_ns()
         job_meta = self.meta[job_id]
-        num_resource_type = self.clusters.state.shape[0]
-        resource_size = self.clusters.state.shape[2]
-        req = job_meta.requirements
-
-        for resource_type in range(num_resource_type):
-            for job_time in range(job_meta.time_max):
-                cluster_time = start_time_pos + job_time
-                job_resource_index = 0
-                for resource in range(resource_size):
-                    if job_resource_index >= req[resource_type, job_time]:
-                        break
-                    cluster_pos = (resource_type, cluster_time, resource)
-                    if self.clusters.state[cluster_pos] == _EMPTY_CELL:
-                        self.clusters.state[cluster_pos] = job_id
-                        job_resource_index += 1
-                if job_resource_index < req[resource_type, job_time]:
-                    msg = f"Wrong start time {start_time_pos}: Cluster time {cluster_time} cannot fit job time {job_time}."
-                    raise ValueError(msg)
-                self.empty_cells_cluster[resource_type,
-                                         cluster_time] -= req[resource_type, job_time]
-        self.job_slots.state[self.job_slots.jobs == job_id, :, :, :] = False
-        self.job_slots.jobs[self.job_slots.jobs == job_id] = _EMPTY_CELL
+        time_max = job_meta.time_max
+        req = job_meta.requirements[:, :time_max]
+
+        rows = self.clusters.rows(start_time_pos, start_time_pos + time_max)
+        block = self.clusters.buffer[:, rows, :]
+        free = block == _EMPTY_CELL
+
+        missing = np.argwhere(free.sum(axis=2) < req)
+        if missing.size or start_time_pos + time_max > self.clusters.shape[1]:
+            job_time = missing[0, 1] if missing.size else time_max - 1
+            cluster_time = start_time_pos + job_time
+            msg = f"Wrong start time {start_time_pos}: Cluster time {cluster_time} cannot fit job time {job_time}."
+            raise ValueError(msg)
+
+        # claim the first req[type, time] free cells of every row
+        claimed = free & (free.cumsum(axis=2) <= req[:, :, None])
+        block[claimed] = job_id
+        self.clusters.buffer[:, rows, :] = block
+        self.empty_cells_cluster[:, start_time_pos:start_time_pos + time_max] -= req
+        # the job leaves the system once its last row leaves the clusters
+        last_row = self.clusters.row(start_time_pos + time_max - 1)
+        self.clusters.drain[last_row].append(job_id)
+
+        self.job_slots.remove(job_id)
+        if profiler is not None:
+            profiler.lap("schedule", t)
+        if self.debug:
+            self.check_empty_cells_cluster()
 
         return True
 
+    def schedule_slots(self, slots: Iterable[int]) -> List[Tuple[int, int]]:
+        """Schedule the jobs in the given slots greedily in the given order.
+
+        Each job is placed at its earliest position given the jobs placed 
+        before it, the empty slots and the jobs that do not fit are skipped.
+
+        Args:
+            slots (Iterable[int]): Indices of the job slots, in order.
+
+        Returns:
+            List[Tuple[int, int]]: The slot and the start position of each scheduled job.
+        """
+        # placing only takes cells, a job that does not fit now never fits
+        # in this timestep, the others are searched again after a placement
+        positions = self.find_all_pos()
+        stale = False
+        scheduled = []
+        for slot in slots:
+            job_id = int(self.job_slots.jobs[slot])
+            if positions[slot] == -1 or job_id == _EMPTY_CELL:
+                continue
+            pos = self.find_pos(job_id) if stale else int(positions[slot])
+            if self.schedule(job_id, pos):
+                scheduled.append((int(slot), pos))
+                stale = True
+            else:
+                positions[slot] = -1
+        return scheduled
+
     def state(self) -> npt.NDArray[np.int_]:
         """The state (image) of clusters, job slots, and backlog.
 
+        The observation buffer is updated in place, the caller should copy 
+        it if the state is going to be kept across steps.
+
         Returns:
-            list: A list of [clusters_state, job_slots_state, backlog_state].
+            npt.NDArray[np.int_]: 
+                The flattened [clusters_state, job_slots_state, backlog_state].
         """
-        clusters = self.empty_cells_cluster
-        job_slots = np.array([self.meta[id].requirements for id in self.job_slots.jobs])
-        return np.concatenate((
-            clusters,
-            job_slots,
-            [self.backlog.state],
-        ), axis=None)
+        self._backlog_state[0] = self.backlog.state
+        return self.observation
 
     # def add_jobs(self, jobs: npt.NDArray[np.bool_]) -> None:
     #     """Add jobs to res.
@@ -251,6 +384,31 @@ class Res:
         backlog = not self.backlog.queue
         return bool(job_slots and backlog)
 
+    def count_empty_cells_cluster(self) -> npt.NDArray[np.int_]:
+        """Count the empty cells per timestep per resource type from the cluster image.
+
+        Returns:
+            npt.NDArray[np.int_]: Empty cells with shape (num_resource_type, time_size).
+        """
+        empty_cells = self.clusters.buffer == _EMPTY_CELL
+        # count on the ring buffer, then rotate the small counts to logical order
+        return np.roll(empty_cells.sum(axis=2), -self.clusters.head, axis=1)
+
     def update_empty_cells_cluster(self) -> None:
-        empty_cells = self.clusters.state == _EMPTY_CELL
-        self.empty_cells_cluster = empty_cells.sum(axis=2)
+        """Recount `empty_cells_cluster` from the cluster image.
+
+        Only needed after changing the clusters directly, `schedule()` and 
+        `time_proceed()` keep it up to date.
+        """
+        self.empty_cells_cluster = self.count_empty_cells_cluster()
+
+    def check_empty_cells_cluster(self) -> None:
+        """Check `empty_cells_cluster` against a full recount, used in debug mode.
+
+        Raises:
+            AssertionError: An error occurred if the counts are out of sync.
+        """
+        expected = self.count_empty_cells_cluster()
+        if not (self.empty_cells_cluster == expected).all():
+            msg = f"Empty cells out of sync:\n{self.empty_cells_cluster}\n!=\n{expected}"
+            raise AssertionError(msg)
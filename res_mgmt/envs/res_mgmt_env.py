@@ -1,15 +1,116 @@
-from typing import Optional
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Optional
 import gym
 import numpy as np
-import pygame
+import numpy.typing as npt
 
-from res_mgmt.envs.config import _EMPTY_CELL
-from res_mgmt.envs.generator import generate_jobs
-from res_mgmt.envs.render import render
+from res_mgmt.envs.config import Config, _DEFAULT_CONFIG
+from res_mgmt.envs.drawing import draw_frame
+from res_mgmt.envs.generator import default_rng
+from res_mgmt.envs.profiler import Profiler, Stats
 from res_mgmt.envs.res import Res
+from res_mgmt.envs.trace import Trace
+from res_mgmt.envs.workload import get_pool
+
+if TYPE_CHECKING:
+    # pygame is only imported by the first pygame render, see __screen
+    from res_mgmt.envs.frame_writer import FrameWriter
+
+
+ACTION_MODES = ("single", "ordered", "priority")
+
+
+def make_spaces(
+    num_resource_type: int,
+    resource_size: int,
+    time_size: int,
+    num_job_slot: int,
+    max_num_job: int,
+    action_mode: str = "single",
+):
+    """The action and observation spaces of a single environment.
+
+    Args:
+        action_mode: One of `ACTION_MODES`, see `ResMgmtEnv`.
+
+    Returns:
+        A tuple of (action_space, observation_space).
+    """
+    if action_mode == "single":
+        # first M jobs + the null sign
+        action_space = gym.spaces.Discrete(
+            num_job_slot + 1)
+    elif action_mode == "ordered":
+        # the slots to place in order, 0 for none
+        action_space = gym.spaces.MultiDiscrete(
+            [num_job_slot + 1] * num_job_slot)
+    elif action_mode == "priority":
+        # a priority per slot, negative for not placing
+        action_space = gym.spaces.Box(
+            low=-1.0, high=1.0, shape=(num_job_slot,), dtype=np.float32)
+    else:
+        raise ValueError(
+            f"Unknown action mode {action_mode!r}, expected one of {ACTION_MODES}.")
+
+    cluster_obs = (
+        [resource_size + 1] *
+        (num_resource_type * time_size)
+    )
+    job_slots_obs = (
+        [resource_size + 1] *
+        (num_job_slot * num_resource_type * time_size)
+    )
+    backlog_obs = [max_num_job + 1]
+    obs = cluster_obs + job_slots_obs + backlog_obs
+    observation_space = gym.spaces.MultiDiscrete(obs)
+    return action_space, observation_space
 
 
 class ResMgmtEnv(gym.Env):
+    """The resource management environment.
+
+    The action mode decides what a step does:
+
+    * "single": the action is a slot number, 1 to num_job_slot, to 
+      schedule the job in that slot, or 0 to proceed to the next timestep.
+    * "ordered": the action is a vector of slot numbers, the jobs are 
+      scheduled greedily in that order, 0 and the jobs that do not fit 
+      are skipped, then the time proceeds.
+    * "priority": the action is a priority per slot, the jobs are 
+      scheduled greedily from the highest priority, the slots with a 
+      negative priority are skipped, then the time proceeds.
+
+    The (slot, start position) of the jobs scheduled in a step are in 
+    `info["placements"]`.
+
+    `action_masks()` gives the actions that can succeed, searched only 
+    when called and then reused by the next step. With `mask_info` the 
+    mask is in `info["action_mask"]` of every step too, at the cost of a 
+    search per step. There is no mask in the "priority" mode.
+
+    In the multi-placement modes the reward of a step is the sum of the 
+    rewards of the single steps it replaces: 0 per scheduled job plus the 
+    reward of proceeding. Jobs that do not fit are not penalised.
+
+    The jobs come from a workload pool generated once per configuration 
+    and pool seed, each episode starts at a random offset of the pool.
+    The offsets and the arrivals are drawn from `rng`, seeded by 
+    `reset(seed)` or else from the global numpy random state. Given a 
+    trace, every episode replays it from the start instead.
+
+    `render(mode="rgb_array")` returns the frame as an array, drawn with 
+    NumPy only, without pygame or a display.
+
+    The observations of `step()` are the observation buffer of `Res`, 
+    updated in place by the next step, unless `copy_obs`. Copy them to 
+    keep them across steps. The observation of the last step of an 
+    episode and the one of `reset()` are always copies, so a vector env 
+    keeping the terminal observation while resetting, like SB3's 
+    `DummyVecEnv`, gets the right one.
+    """
+
+    metadata = {"render_modes": ["human", "rgb_array"]}
+
     def __init__(
         self,
         num_resource_type: int,  # d resource types
@@ -18,6 +119,18 @@ class ResMgmtEnv(gym.Env):
         num_job_slot: int,  # first M jobs
         max_num_job: int,
         new_job_rate: float,
+        copy_obs: bool = False,  # return a copy of the observation buffer
+        debug: bool = False,  # check the incremental bookkeeping of Res
+        action_mode: str = "single",  # one of ACTION_MODES
+        pool_size: int = 4096,  # jobs in the workload pool shared by the episodes
+        pool_seed: int = 0,  # seed of the workload pool
+        pool_dir: Optional[str] = None,  # memory-map the pool from this directory
+        pool_shared: bool = False,  # attach to the pool in shared memory, see share_pool
+        trace: Optional[Trace] = None,  # replay the trace instead of the pool
+        profile: bool = False,  # time the phases of the steps, see perf_stats
+        perf_info: bool = False,  # put the timings of each step in info["perf"]
+        mask_info: bool = False,  # put action_masks() in info["action_mask"]
+        frame_writer: Optional["FrameWriter"] = None,  # save the frames of my_render in the background
     ):
         self.num_resource_type = num_resource_type
         self.resource_size = resource_size
@@ -25,33 +138,107 @@ class ResMgmtEnv(gym.Env):
         self.num_job_slot = num_job_slot
         self.max_num_job = max_num_job
         self.new_job_rate = new_job_rate
+        self.copy_obs = copy_obs
+        self.debug = debug
+        self.action_mode = action_mode
+        self.pool = get_pool(
+            num_resource_type, time_size, resource_size, pool_size, pool_seed,
+            cache_dir=pool_dir, shared=pool_shared)
+        self.trace = trace
+        self.rng: Optional[np.random.Generator] = None
+        self.profiler = Profiler() if profile or perf_info else None
+        self.perf_info = perf_info
+        self.mask_info = mask_info
+        self.frame_writer = frame_writer
 
-        # first M jobs + the null sign
-        self.action_space = gym.spaces.Discrete(
-            num_job_slot + 1)
-
-        cluster_obs = (
-            [resource_size + 1] *
-            (num_resource_type * time_size)
-        )
-        job_slots_obs = (
-            [resource_size + 1] *
-            (num_job_slot * num_resource_type * time_size)
+        self.action_space, self.observation_space = make_spaces(
+            num_resource_type=num_resource_type,
+            resource_size=resource_size,
+            time_size=time_size,
+            num_job_slot=num_job_slot,
+            max_num_job=max_num_job,
+            action_mode=action_mode,
         )
-        backlog_obs = [max_num_job + 1]
-        obs = cluster_obs + job_slots_obs + backlog_obs
-        self.observation_space = gym.spaces.MultiDiscrete(obs)
 
         self.res: Res = None
         self.state = None
         self.screen = None
         self.jobs = None
         self.stepcount = None
+        self.positions = None  # cached `res.find_all_pos()` of the current state
+
+    @classmethod
+    def fromConfig(cls, config: Config = _DEFAULT_CONFIG):
+        """Create an environment from config, e.g. the one of `config()`.
+
+        Args:
+            config: The config. If not specified, the default config will be used.
+        """
+        trace = config.get("trace")
+        return cls(
+            num_resource_type=config["num_resource_type"],
+            resource_size=config["resource_size"],
+            time_size=config["time_size"],
+            num_job_slot=config["num_job_slot"],
+            max_num_job=config["max_num_job"],
+            new_job_rate=config["new_job_rate"],
+            action_mode=config.get("action_mode", "single"),
+            pool_size=config.get("pool_size", 4096),
+            pool_seed=config.get("pool_seed", 0),
+            trace=None if trace is None else Trace(**trace),
+        )
+
+    def config(self) -> Config:
+        """The JSON serializable config creating the same environment.
+
+        The pool files or shared memory are not part of it, the pool is 
+        the same wherever it comes from.
+        """
+        return {
+            "num_resource_type": self.num_resource_type,
+            "resource_size": self.resource_size,
+            "time_size": self.time_size,
+            "num_job_slot": self.num_job_slot,
+            "max_num_job": self.max_num_job,
+            "new_job_rate": self.new_job_rate,
+            "action_mode": self.action_mode,
+            "pool_size": self.pool.size,
+            "pool_seed": self.pool.seed,
+            "trace": None if self.trace is None else self.trace.config(),
+        }
 
-    def step(self, action: int):
+    def step(self, action):
+        profiler = self.profiler
+        if profiler is None:
+            return self.__step(action)
+        profiler.start_step()
+        t = perf_counter_ns()
+        state, reward, done, info = self.__step(action)
+        profiler.lap("step", t)
+        if self.perf_info:
+            info["perf"] = dict(profiler.current)
+        return state, reward, done, info
+
+    def perf_stats(self) -> Stats:
+        """The timings of the phases of all steps so far, empty if not profiling.
+
+        Sum the stats of many environments with `aggregate()`.
+
+        Returns:
+            Stats: Per phase, the "calls", the "total_ns" and the "mean_ns".
+        """
+        if self.profiler is None:
+            return {}
+        return self.profiler.stats()
+
+    def __step(self, action):
+        if self.action_mode == "priority":
+            action = np.asarray(action, dtype=np.float32)
         err_msg = f"{action!r} ({type(action)}) invalid"
         assert self.action_space.contains(action), err_msg
         assert self.state is not None, "Call reset before using step method."
+        if self.action_mode != "single":
+            return self.__step_slots(self.__order(action))
 
         # print("LOG:", f"step ({self.stepcount})")
         # print("LOG:", f"Chose action ({action})")
@@ -62,16 +249,22 @@ class ResMgmtEnv(gym.Env):
         proceed = False
 
         reward = None
+        placements = []
         if action != -1:
             job_id = self.res.job_slots.jobs[action]
             # print("LOG:", f"Job ID ({job_id})")
-            if job_id != _EMPTY_CELL:
+            if self.positions is not None:
+                # searched for the mask of this state already
+                pos = self.positions[action]
+            else:
+                # one slot only, -1 for the empty slots as well
                 pos = self.res.find_pos(job_id)
-                # print("LOG:", f"Pos ({pos})")
-                if pos != -1:
-                    self.res.schedule(job_id, pos)
-                    reward = 0
-                    # print("LOG:", f"reward ({reward})")
+            # print("LOG:", f"Pos ({pos})")
+            if pos != -1:
+                self.res.schedule(job_id, pos)
+                placements.append((int(action), int(pos)))
+                reward = 0
+                # print("LOG:", f"reward ({reward})")
         else:
             self.res.time_proceed()
             proceed = True
@@ -83,11 +276,15 @@ class ResMgmtEnv(gym.Env):
             reward = self.__reward() - 10
             # print("LOG:", f"No time proceed, reward ({reward})")
 
-        self.state = self.res.state()
-        state = self.state
+        self.state = self.__state()
+        self.positions = None
         reward = reward
         done = self.stepcount > 50
-        info = {}
+        # the terminal observation outlives the reset, see the class docstring
+        state = self.state.copy() if self.copy_obs or done else self.state
+        info = {"placements": placements}
+        if self.mask_info:
+            info["action_mask"] = self.action_masks()
         # self.my_render(f"render/{self.stepcount}.png")
         # print(self.state)
         # print("======================================")
@@ -95,36 +292,179 @@ class ResMgmtEnv(gym.Env):
         self.stepcount += 1 # TODO: increment count for each step or each time proceed?
         return state, reward, done, info
 
+    def __order(self, action) -> npt.NDArray[np.int_]:
+        """The slot indices to schedule in order, given a multi-placement action."""
+        if self.action_mode == "ordered":
+            action = np.asarray(action)
+            return action[action != 0] - 1
+        order = np.argsort(-action, kind="stable")
+        return order[action[order] >= 0]
+
+    def __step_slots(self, slots: npt.NDArray[np.int_]):
+        placements = self.res.schedule_slots(slots)
+        self.res.time_proceed()
+        reward = self.__reward()
+
+        self.state = self.__state()
+        self.positions = None
+        done = self.stepcount > 50
+        state = self.state.copy() if self.copy_obs or done else self.state
+        info = {
+            "num_scheduled": len(placements),
+            "placements": placements,
+        }
+        if self.mask_info and self.action_mode == "ordered":
+            info["action_mask"] = self.action_masks()
+        self.stepcount += 1
+        return state, reward, done, info
+
     def reset(self, seed: Optional[int] = None):
         # super().reset(seed=seed) # not supported in gym 0.19.0
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        elif self.rng is None:
+            self.rng = default_rng()
 
-        self.res = Res(
-            num_resource_type=self.num_resource_type,
-            time_size=self.time_size,
-            resource_size=self.resource_size,
-            num_job_slot=self.num_job_slot,
-            max_num_job=self.max_num_job,
-            new_job_rate=self.new_job_rate,
-        )
+        jobs = self.pool.sample(self.rng)
+        if self.res is None:
+            self.res = Res(
+                num_resource_type=self.num_resource_type,
+                time_size=self.time_size,
+                resource_size=self.resource_size,
+                num_job_slot=self.num_job_slot,
+                max_num_job=self.max_num_job,
+                new_job_rate=self.new_job_rate,
+                debug=self.debug,
+            )
+            self.res.profiler = self.profiler
+        self.res.reset(
+            jobs, trace=None if self.trace is None else self.trace.jobs())
+        self.res.backlog.rng = self.rng
         self.res.time_proceed()
         self.state = self.res.state()
+        self.positions = None
         self.stepcount = 0
-        return self.state
+        # never the buffer the last step returned, that is still in use
+        return self.state.copy()
+
+    def action_masks(self) -> npt.NDArray[np.bool_]:
+        """The actions that can succeed in the current state.
+
+        The null action is always valid, a slot is valid if it holds a job
+        that fits in the clusters. The method name is what sb3-contrib's
+        MaskablePPO looks for. With `mask_info` the same mask is in 
+        `info["action_mask"]` of every step, but in the "priority" mode.
+
+        In the "ordered" mode the mask matches the `MultiDiscrete` action 
+        space: the mask of a slot number, repeated for every entry of the 
+        action and concatenated.
+
+        Returns:
+            npt.NDArray[np.bool_]: 
+                Mask with shape (num_job_slot + 1,), or 
+                (num_job_slot * (num_job_slot + 1),) in the "ordered" mode.
+
+        Raises:
+            NotImplementedError: An error occurred in the "priority" mode, 
+                a `Box` action space cannot be masked.
+        """
+        assert self.state is not None, "Call reset before using action_masks method."
+        if self.action_mode == "priority":
+            raise NotImplementedError("The priority action mode has no action mask.")
+        profiler = self.profiler
+        if profiler is not None:
+            t = perf_counter_ns()
+        mask = np.concatenate(([True], self.find_all_pos() != -1))
+        if self.action_mode == "ordered":
+            mask = np.tile(mask, self.num_job_slot)
+        if profiler is not None:
+            profiler.lap("action_mask", t)
+        return mask
+
+    def find_all_pos(self) -> npt.NDArray[np.int_]:
+        """`res.find_all_pos()`, cached until the state changes.
+
+        Shared by the mask, the next step and the batch policies, see 
+        `slot_arrays()`.
+
+        Returns:
+            npt.NDArray[np.int_]: 
+                Earliest start of the job in each slot, -1 if it does not 
+                fit or the slot is empty, shape (num_job_slot,).
+        """
+        if self.positions is None:
+            self.positions = self.res.find_all_pos()
+        return self.positions
 
     def __reward(self) -> float:
-        return (-1.0 / self.res.durations()).sum()
+        profiler = self.profiler
+        if profiler is not None:
+            t = perf_counter_ns()
+        reward = -self.res.inv_duration_sum
+        if profiler is not None:
+            profiler.lap("reward", t)
+        return reward
+
+    def __state(self) -> npt.NDArray[np.int_]:
+        profiler = self.profiler
+        if profiler is not None:
+            t = perf_counter_ns()
+        state = self.res.state()
+        if profiler is not None:
+            profiler.lap("state", t)
+        return state
+
+    def render(self, mode: str = "human", unit: int = 10):
+        """Render the current state.
+
+        Args:
+            mode (str, optional): 
+                "rgb_array" to return the frame, "human" to draw it on the 
+                pygame display. Defaults to "human".
+            unit (int, optional): Size of a cell in pixels. Defaults to 10.
+
+        Returns:
+            The frame with shape (height, width, 3) in "rgb_array" mode, 
+            else None.
+
+        Raises:
+            ValueError: An error occurred if the mode is not supported.
+        """
+        if mode == "rgb_array":
+            return draw_frame(
+                self.res.clusters.state, self.res.job_slots.requirements,
+                self.res.backlog.state, unit)
+        if mode != "human":
+            raise ValueError(f"Unknown render mode {mode}.")
+        import pygame
+        self.__screen()
+        pygame.display.flip()
 
     def my_render(self, filename: str):
         if self.state is None:
             return
+        if self.frame_writer is not None:
+            self.frame_writer.submit(self.res, filename)
+            return
+        import pygame
+        pygame.image.save(self.__screen(), filename)
+
+    def __screen(self):
+        """Draw the state on the pygame display, initialised on the first call."""
+        import pygame
+        from res_mgmt.envs.render import render
         if self.screen is None:
             pygame.display.init()
             pygame.font.init()
         self.screen = render(self.res)
-        pygame.image.save(self.screen, filename)
+        return self.screen
 
     def close(self):
+        if self.frame_writer is not None:
+            self.frame_writer.close()
+            self.frame_writer = None
         if self.screen is not None:
+            import pygame
             pygame.display.quit()
             pygame.font.quit()
             self.screen = None
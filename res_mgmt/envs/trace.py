@@ -0,0 +1,191 @@
+import csv
+from itertools import islice
+import os
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+import numpy.typing as npt
+
+# arrival time, duration and one demand column per resource type
+_ARRIVAL = "arrival"
+_DURATION = "duration"
+
+
+def demand_columns(num_resource_type: int) -> List[str]:
+    """The default names of the demand columns, demand_0 to demand_{d-1}."""
+    return [f"demand_{i}" for i in range(num_resource_type)]
+
+
+class Trace:
+    """A cluster trace replayed as the jobs of the backlog.
+
+    Each job of the trace has an arrival time, a duration and a demand
+    per resource type. The trace is either a CSV file with a header row,
+    or a directory with one `.npy` file per column (e.g. `arrival.npy`),
+    which is memory-mapped. Both are read `chunk_size` jobs at a time, so
+    the memory stays bounded whatever the size of the trace. Convert
+    large CSV traces once with `convert_csv()`, parsing CSV is slow.
+
+    The jobs are quantized to the environment: times are divided by
+    `time_unit` (durations rounded up and clipped to `time_size`),
+    demands are divided by `capacity` and rounded up to units of
+    `resource_size`. A job demanding nothing gets one unit of its
+    largest demand. The arrival times must be sorted.
+
+    Attributes:
+        path: The CSV file or the columnar directory.
+        columns: The names of the arrival, duration and demand columns.
+        start: Arrival time of the first job, the timestep 0 of the replay.
+    """
+
+    def __init__(
+        self,
+        path: str,                  # CSV file or directory of .npy columns
+        num_resource_type: int,     # d resource types
+        time_size: int,             # column
+        resource_size: int,         # row
+        time_unit: float = 1.0,     # trace time of one timestep
+        capacity: float = 1.0,      # trace demand of the whole resource
+        chunk_size: int = 4096,     # jobs read at a time
+        columns: Optional[Sequence[str]] = None,  # demand columns, demand_i if None
+        start: Optional[float] = None,  # arrival time of timestep 0, the first arrival if None
+    ) -> None:
+        self.path = path
+        self.num_resource_type = num_resource_type
+        self.time_size = time_size
+        self.resource_size = resource_size
+        self.time_unit = time_unit
+        self.capacity = capacity
+        self.chunk_size = chunk_size
+        if columns is None:
+            columns = demand_columns(num_resource_type)
+        assert len(columns) == num_resource_type, "One demand column per resource type."
+        self.columns = [_ARRIVAL, _DURATION] + list(columns)
+        self.start = start
+
+    def config(self) -> Dict:
+        """The JSON serializable arguments creating the same trace."""
+        return {
+            "path": self.path,
+            "num_resource_type": self.num_resource_type,
+            "time_size": self.time_size,
+            "resource_size": self.resource_size,
+            "time_unit": self.time_unit,
+            "capacity": self.capacity,
+            "chunk_size": self.chunk_size,
+            "columns": self.columns[2:],
+            "start": self.start,
+        }
+
+    def raw_chunks(self) -> Iterator[Dict[str, npt.NDArray[np.float64]]]:
+        """The columns of the trace, chunk_size jobs at a time."""
+        if os.path.isdir(self.path):
+            return self._columnar_chunks()
+        return self._csv_chunks()
+
+    def _columnar_chunks(self) -> Iterator[Dict[str, npt.NDArray[np.float64]]]:
+        arrays = {
+            name: np.load(os.path.join(self.path, name + ".npy"), mmap_mode="r")
+            for name in self.columns}
+        length = len(arrays[_ARRIVAL])
+        for begin in range(0, length, self.chunk_size):
+            yield {name: np.asarray(array[begin:begin + self.chunk_size], dtype=np.float64)
+                   for name, array in arrays.items()}
+
+    def _csv_chunks(self) -> Iterator[Dict[str, npt.NDArray[np.float64]]]:
+        with open(self.path, newline="") as f:
+            reader = csv.reader(f)
+            header = [name.strip() for name in next(reader)]
+            missing = [name for name in self.columns if name not in header]
+            if missing:
+                raise ValueError(f"Missing columns {missing} in trace {self.path}.")
+            indices = [header.index(name) for name in self.columns]
+            while True:
+                rows = list(islice(reader, self.chunk_size))
+                if not rows:
+                    return
+                values = np.array(
+                    [[row[i] for i in indices] for row in rows], dtype=np.float64)
+                yield dict(zip(self.columns, values.T))
+
+    def chunks(self) -> Iterator[Tuple[npt.NDArray[np.int_], npt.NDArray[np.int_]]]:
+        """The quantized jobs, chunk_size jobs at a time.
+
+        Yields:
+            A tuple of the arrival timesteps with shape (n,) and the
+            requirements with shape (n, num_resource_type, time_size).
+        """
+        start = self.start
+        for chunk in self.raw_chunks():
+            arrival = chunk[_ARRIVAL]
+            if not len(arrival):
+                continue
+            if start is None:
+                start = arrival[0]
+            timestep = np.floor((arrival - start) / self.time_unit).astype(np.int_)
+
+            duration = np.clip(
+                np.ceil(chunk[_DURATION] / self.time_unit), 1, self.time_size
+            ).astype(np.int_)
+            demand = np.stack([chunk[name] for name in self.columns[2:]], axis=1)
+            units = np.clip(
+                np.ceil(demand / self.capacity * self.resource_size),
+                0, self.resource_size,
+            ).astype(np.int_)
+            idle = ~units.any(axis=1)
+            units[idle, demand[idle].argmax(axis=1)] = 1
+
+            time = np.arange(self.time_size)
+            requirements = np.where(
+                time < duration[:, None, None], units[:, :, None], 0)
+            yield timestep, requirements
+
+    def jobs(self) -> Iterator[Tuple[int, npt.NDArray[np.int_]]]:
+        """The quantized jobs one by one, the arrivals of `Backlog`.
+
+        Yields:
+            A tuple of the arrival timestep and the requirements with
+            shape (num_resource_type, time_size).
+        """
+        for timestep, requirements in self.chunks():
+            yield from zip(timestep.tolist(), requirements)
+
+
+def convert_csv(
+    src: str,
+    dest: str,
+    columns: Sequence[str],
+    chunk_size: int = 1 << 16,
+) -> None:
+    """Convert a CSV trace to a directory of `.npy` columns, chunk by chunk.
+
+    Args:
+        src (str): The CSV trace with a header row.
+        dest (str): The directory to write `<column>.npy` into.
+        columns (Sequence[str]): The columns to keep.
+        chunk_size (int, optional): Rows converted at a time. Defaults to 65536.
+    """
+    with open(src, newline="") as f:
+        length = sum(1 for _ in csv.reader(f)) - 1
+    os.makedirs(dest, exist_ok=True)
+    arrays = {
+        name: np.lib.format.open_memmap(
+            os.path.join(dest, name + ".npy"), mode="w+",
+            dtype=np.float64, shape=(length,))
+        for name in columns}
+
+    with open(src, newline="") as f:
+        reader = csv.reader(f)
+        header = [name.strip() for name in next(reader)]
+        indices = [header.index(name) for name in columns]
+        begin = 0
+        while True:
+            rows = list(islice(reader, chunk_size))
+            if not rows:
+                break
+            values = np.array(
+                [[row[i] for i in indices] for row in rows], dtype=np.float64)
+            for name, column in zip(columns, values.T):
+                arrays[name][begin:begin + len(rows)] = column
+            begin += len(rows)
+    for array in arrays.values():
+        array.flush()
@@ -0,0 +1,258 @@
+from functools import lru_cache
+from multiprocessing import shared_memory
+import os
+import tempfile
+from typing import Iterator, Optional, Tuple
+import numpy as np
+import numpy.typing as npt
+
+from res_mgmt.envs.config import Config, _DEFAULT_CONFIG
+from res_mgmt.envs.generator import generate_requirements
+
+
+class WorkloadPool:
+    """A fixed set of jobs generated once and shared by many episodes.
+
+    Every episode reads the pool in order from its own offset, wrapping
+    around at the end, so a reset only draws an offset instead of
+    generating new jobs. The pool is read only.
+
+    A pool can be saved to a `.npy` file and memory-mapped, or placed in 
+    a shared memory segment, so that subprocess environments share one 
+    copy of the jobs instead of generating their own, see `get_pool()`.
+
+    Attributes:
+        requirements:
+            Requirements of the jobs, shape (size, num_resource_type, time_size).
+        duration: Durations of the jobs, shape (size,).
+        seed: The seed the jobs are generated from.
+    """
+
+    def __init__(
+        self,
+        requirements: npt.NDArray[np.int_],  # requirements of the jobs
+        seed: int,                           # seed of the jobs
+    ) -> None:
+        self.requirements = requirements
+        self.shm: Optional[shared_memory.SharedMemory] = None
+        busy = requirements.any(axis=1)
+        self.duration = requirements.shape[2] - busy[:, ::-1].argmax(axis=1)
+        self.seed = seed
+
+    @classmethod
+    def generate(
+        cls,
+        num_resource_type: int,
+        time_size: int,
+        resource_size: int,
+        size: int = 4096,
+        seed: int = 0,
+    ):
+        """Generate a pool, see `generate_requirements()`.
+
+        Args:
+            num_resource_type (int): Number of types of resources.
+            time_size (int): Size of the time axis in the image.
+            resource_size (int): Size of the resource axis in the image.
+            size (int, optional): Number of jobs. Defaults to 4096.
+            seed (int, optional): Seed of the jobs. Defaults to 0.
+        """
+        requirements = generate_requirements(
+            num_resource_type, time_size, resource_size, size,
+            rng=np.random.default_rng(seed))
+        return cls(requirements.astype(np.int32), seed)
+
+    @classmethod
+    def fromConfig(cls, config: Config = _DEFAULT_CONFIG):
+        """Get the cached pool of the config, see `get_pool()`.
+
+        Args:
+            config: The config. If not specified, the default config will be used.
+        """
+        return get_pool(
+            num_resource_type=config["num_resource_type"],
+            time_size=config["time_size"],
+            resource_size=config["resource_size"],
+        )
+
+    @classmethod
+    def load(cls, path: str, seed: int = 0):
+        """Memory-map a pool saved by `save()`, read only.
+
+        Args:
+            path (str): The `.npy` file.
+            seed (int, optional): The seed the jobs were generated from. Defaults to 0.
+        """
+        return cls(np.load(path, mmap_mode="r"), seed)
+
+    @classmethod
+    def attach(cls, name: str, shape: Tuple[int, int, int], seed: int = 0):
+        """Attach to a pool placed in shared memory by `share()`, read only.
+
+        Args:
+            name (str): Name of the shared memory segment.
+            shape (Tuple[int, int, int]): 
+                Shape (size, num_resource_type, time_size) of the requirements.
+            seed (int, optional): The seed the jobs were generated from. Defaults to 0.
+
+        Raises:
+            FileNotFoundError: An error occurred if the segment does not exist.
+        """
+        shm = _attach_shared_memory(name)
+        requirements = np.ndarray(shape, dtype=np.int32, buffer=shm.buf)
+        requirements.flags.writeable = False
+        pool = cls(requirements, seed)
+        pool.shm = shm
+        return pool
+
+    def save(self, path: str) -> None:
+        """Save the requirements to a `.npy` file.
+
+        The file is written next to the path and then renamed, so 
+        concurrent readers never see a partial file.
+
+        Args:
+            path (str): The `.npy` file.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".npy.tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.ascontiguousarray(self.requirements, dtype=np.int32))
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+    def share(self, name: str) -> shared_memory.SharedMemory:
+        """Copy the requirements into a new shared memory segment.
+
+        The caller owns the segment and should `close()` and `unlink()` it 
+        once all the workers are done.
+
+        Args:
+            name (str): Name of the shared memory segment.
+
+        Returns:
+            shared_memory.SharedMemory: The segment.
+        """
+        requirements = np.ascontiguousarray(self.requirements, dtype=np.int32)
+        shm = shared_memory.SharedMemory(
+            name=name, create=True, size=max(requirements.nbytes, 1))
+        np.ndarray(requirements.shape, dtype=np.int32, buffer=shm.buf)[...] = requirements
+        return shm
+
+    @property
+    def size(self) -> int:
+        return len(self.requirements)
+
+    def jobs(self, offset: int = 0) -> Iterator[npt.NDArray[np.int_]]:
+        """Infinite generator of job requirements starting at the offset.
+
+        A drop-in replacement of `get_generator()`.
+
+        Args:
+            offset (int, optional): Index of the first job. Defaults to 0.
+        """
+        offset %= self.size
+        while True:
+            yield from self.requirements[offset:]
+            offset = 0
+
+    def sample(self, rng: np.random.Generator) -> Iterator[npt.NDArray[np.int_]]:
+        """Jobs starting at a random offset.
+
+        Args:
+            rng (np.random.Generator): Random generator of the offset.
+        """
+        return self.jobs(int(rng.integers(self.size)))
+
+
+def pool_key(
+    num_resource_type: int,
+    time_size: int,
+    resource_size: int,
+    size: int = 4096,
+    seed: int = 0,
+) -> str:
+    """The name of the pool, used for its file and shared memory segment."""
+    return (f"res_mgmt_pool_d{num_resource_type}_t{time_size}"
+            f"_r{resource_size}_n{size}_s{seed}")
+
+
+@lru_cache(maxsize=None)
+def get_pool(
+    num_resource_type: int,
+    time_size: int,
+    resource_size: int,
+    size: int = 4096,
+    seed: int = 0,
+    cache_dir: Optional[str] = None,
+    shared: bool = False,
+) -> WorkloadPool:
+    """The pool of the arguments, loaded or generated on the first call only.
+
+    See `WorkloadPool.generate()` for the other arguments.
+
+    Args:
+        cache_dir (str, optional): 
+            Directory of the pool files. If set, the pool is memory-mapped 
+            from `<cache_dir>/<pool_key>.npy`, which is generated and saved 
+            if missing, so it is shared by processes and training runs.
+        shared (bool, optional): 
+            Attach to the shared memory segment named `pool_key()`, created 
+            with `share_pool()` by the parent process. Defaults to False.
+    """
+    key = pool_key(num_resource_type, time_size, resource_size, size, seed)
+    if shared:
+        return WorkloadPool.attach(
+            key, (size, num_resource_type, time_size), seed)
+    if cache_dir is None:
+        return WorkloadPool.generate(
+            num_resource_type, time_size, resource_size, size, seed)
+
+    path = os.path.join(cache_dir, key + ".npy")
+    if not os.path.exists(path):
+        WorkloadPool.generate(
+            num_resource_type, time_size, resource_size, size, seed).save(path)
+    return WorkloadPool.load(path, seed)
+
+
+def share_pool(
+    num_resource_type: int,
+    time_size: int,
+    resource_size: int,
+    size: int = 4096,
+    seed: int = 0,
+    cache_dir: Optional[str] = None,
+) -> shared_memory.SharedMemory:
+    """Place the pool in shared memory for `get_pool(..., shared=True)`.
+
+    Call it in the parent process before starting the workers, then 
+    `close()` and `unlink()` the returned segment after they are done.
+
+    ```python
+    shm = share_pool(2, 20, 20)
+    try:
+        env = SubprocVecEnv([make_env] * 28)  # ResMgmtEnv(..., pool_shared=True)
+        ...
+    finally:
+        shm.close()
+        shm.unlink()
+    ```
+    """
+    pool = get_pool(
+        num_resource_type, time_size, resource_size, size, seed, cache_dir)
+    return pool.share(
+        pool_key(num_resource_type, time_size, resource_size, size, seed))
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # before python 3.13 attaching registers the segment with the
+        # resource tracker, the workers share the tracker of the creator
+        # which stops tracking it once the creator unlinks it
+        return shared_memory.SharedMemory(name=name)
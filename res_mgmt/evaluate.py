@@ -0,0 +1,366 @@
+"""Evaluate scheduling policies on many configs and seeds in parallel.
+
+Every (policy, config, seed) episode runs in a process pool and is
+appended to a JSONL file as soon as it finishes. Rerunning the same
+command skips the episodes already in the file, identified by policy,
+config name and arguments, seed and horizon, so a killed job resumes
+where it stopped:
+
+```shell
+python -m res_mgmt.evaluate --policies sjf,packer,tetris,random \\
+    --configs small,medium --seeds 100 --output eval.jsonl
+```
+
+The episodes of a seed replay the same workload for every policy, so
+the policies are compared paired, seed by seed, against the first one.
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import importlib
+import json
+import os
+import sys
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+from res_mgmt.bench import SIZES
+from res_mgmt.envs.config import _EMPTY_CELL
+from res_mgmt.envs.res_mgmt_env import ResMgmtEnv
+from res_mgmt.other_agents.batch_policy import get_batch_action
+from res_mgmt.other_agents.packer import packer_scores
+from res_mgmt.other_agents.random_agent import random_scores
+from res_mgmt.other_agents.sjf import sjf_scores
+from res_mgmt.other_agents.tetris import tetris_scores
+
+Config = Dict[str, float]
+# the action of the policy in the current state of the env
+Policy = Callable[[ResMgmtEnv], int]
+Task = Tuple[str, str, Config, int, int]
+
+METRICS = ("slowdown", "completion_time", "utilization", "scheduled", "unscheduled", "reward")
+
+
+def make_policy(name: str, seed: int) -> Policy:
+    """The policy of the name, seeded for the episode.
+
+    Args:
+        name (str):
+            One of "sjf", "packer", "tetris" and "random", or
+            "<module>:<factory>" of a function taking the seed and
+            returning a `Policy`, e.g. one loading a trained agent.
+        seed (int): Seed of the episode.
+
+    Raises:
+        ValueError: An error occurred if the name is unknown.
+    """
+    scorers = {"sjf": sjf_scores, "packer": packer_scores, "tetris": tetris_scores}
+    if name in scorers:
+        scorer = scorers[name]
+        return lambda env: get_batch_action(env, scorer)
+    if name == "random":
+        # its own stream, the workload is the same for every policy
+        scorer = random_scores(np.random.default_rng([seed, 1]))
+        return lambda env: get_batch_action(env, scorer, immediate=False)
+    if ":" in name:
+        module, factory = name.split(":", 1)
+        return getattr(importlib.import_module(module), factory)(seed)
+    raise ValueError(f"Unknown policy {name}.")
+
+
+def run_episode(
+    policy: Policy,
+    config: Config,
+    seed: int,
+    horizon: int = 200,
+) -> Dict[str, float]:
+    """Run the policy for horizon timesteps from `reset(seed)`.
+
+    The episode is cut at the horizon in timesteps rather than steps, so
+    every policy sees the same arrivals. The policy is called until it
+    returns 0, or an action that fails, then the time proceeds.
+
+    Args:
+        policy (Policy): The policy.
+        config (Config): The arguments of `ResMgmtEnv`.
+        seed (int): Seed of the workload.
+        horizon (int, optional): Number of timesteps. Defaults to 200.
+
+    Returns:
+        Dict[str, float]: The metrics of the episode:
+
+        * "slowdown": Mean (completion - arrival) / duration of the scheduled jobs.
+        * "completion_time": Mean completion - arrival of the scheduled jobs.
+        * "utilization": Fraction of the cluster cells used per timestep.
+        * "scheduled": Number of jobs scheduled.
+        * "unscheduled": Number of jobs still waiting at the horizon.
+        * "reward": Sum of the rewards.
+    """
+    env = ResMgmtEnv(**config)
+    env.reset(seed)
+    res = env.res
+    slowdowns = []
+    completion_times = []
+    reward_sum = 0.0
+    # the first timestep is proceeded by the reset
+    while res.time <= horizon:
+        action = policy(env)
+        job_id = res.job_slots.jobs[action - 1] if action else _EMPTY_CELL
+        start = res.time
+        if job_id != _EMPTY_CELL:
+            arrival = int(res.meta.arrival[job_id])
+            duration = int(res.meta.duration[job_id])
+        _, reward, _, info = env.step(action)
+        reward_sum += reward
+        if job_id != _EMPTY_CELL and info["placements"]:
+            _, pos = info["placements"][0]
+            completion_time = start + pos + duration - arrival
+            completion_times.append(completion_time)
+            slowdowns.append(completion_time / duration)
+        elif action != 0:
+            # a failed action does not proceed, proceed instead
+            _, reward, _, _ = env.step(0)
+            reward_sum += reward
+    env.close()
+
+    cells = res.time * env.num_resource_type * env.resource_size
+    return {
+        "slowdown": float(np.mean(slowdowns)) if slowdowns else float("nan"),
+        "completion_time": float(np.mean(completion_times)) if completion_times else float("nan"),
+        "utilization": res.used_cells / cells,
+        "scheduled": len(slowdowns),
+        "unscheduled": int((res.job_slots.jobs != _EMPTY_CELL).sum()) + len(res.backlog.queue),
+        "reward": float(reward_sum),
+    }
+
+
+def run_task(task: Task) -> Dict:
+    """Run one (policy, config, seed) episode, in a worker process."""
+    policy, config_name, config, seed, horizon = task
+    metrics = run_episode(make_policy(policy, seed), config, seed, horizon)
+    return {"policy": policy, "config": config_name, "params": config, "seed": seed,
+            "horizon": horizon, **metrics}
+
+
+def config_key(config: Config) -> str:
+    """The arguments of a config in canonical form, to compare them with the stored ones."""
+    return json.dumps(config, sort_keys=True)
+
+
+def _episode_key(result: Dict) -> Tuple[str, str, str, int, int]:
+    # the rows written before the arguments were stored never match
+    return (result["policy"], result["config"], config_key(result.get("params")),
+            result["seed"], result["horizon"])
+
+
+def load_results(path: str) -> List[Dict]:
+    """The episodes of a JSONL file, a partly written last line is skipped."""
+    if not os.path.exists(path):
+        return []
+    results = []
+    with open(path) as f:
+        for line in f:
+            try:
+                results.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return results
+
+
+def _drop_partial_line(path: str) -> None:
+    """Truncate the line a killed run was writing, before appending."""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+def evaluate(
+    policies: Iterable[str],
+    configs: Dict[str, Config],
+    seeds: Iterable[int],
+    output: str,
+    horizon: int = 200,
+    workers: Optional[int] = None,
+    log: Optional[Callable[[str], None]] = print,
+) -> List[Dict]:
+    """Run the missing (policy, config, seed) episodes and append them to output.
+
+    Args:
+        policies (Iterable[str]): Names of the policies, see `make_policy()`.
+        configs (Dict[str, Config]): The arguments of `ResMgmtEnv` per config name.
+        seeds (Iterable[int]): Seeds of the workloads.
+        output (str): The JSONL file, one episode per line.
+        horizon (int, optional): Timesteps per episode. Defaults to 200.
+        workers (int, optional): Processes of the pool. Defaults to the number of CPUs.
+        log (Callable[[str], None], optional): Progress log. Defaults to print.
+
+    Returns:
+        List[Dict]: All episodes of output, including the earlier ones,
+        see `select_results()` to keep those of this evaluation.
+    """
+    policies, seeds = list(policies), list(seeds)
+    results = load_results(output)
+    done = {_episode_key(r) for r in results}
+    tasks = [
+        (policy, name, config, seed, horizon)
+        for name, config in configs.items()
+        for seed in seeds
+        for policy in policies
+        if (policy, name, config_key(config), seed, horizon) not in done
+    ]
+    if log and done:
+        log(f"resuming, {len(done)} episodes done, {len(tasks)} to run")
+    if not tasks:
+        return results
+
+    directory = os.path.dirname(os.path.abspath(output))
+    os.makedirs(directory, exist_ok=True)
+    _drop_partial_line(output)
+    with open(output, "a") as f, ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(run_task, task) for task in tasks]
+        for count, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            f.write(json.dumps(result) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+            results.append(result)
+            if log:
+                log(f"[{count}/{len(tasks)}] {result['policy']} {result['config']} "
+                    f"seed {result['seed']}: slowdown {result['slowdown']:.3f}")
+    return results
+
+
+def select_results(
+    results: Iterable[Dict],
+    policies: Iterable[str],
+    configs: Dict[str, Config],
+    horizon: int,
+) -> List[Dict]:
+    """The episodes of the policies, configs and horizon, the arguments of the configs included.
+
+    A JSONL file can hold episodes of earlier runs with other arguments
+    under the same config name, they are left out.
+    """
+    policies = set(policies)
+    keys = {name: config_key(config) for name, config in configs.items()}
+    return [r for r in results
+            if r["policy"] in policies and r["horizon"] == horizon and
+            r["config"] in keys and config_key(r.get("params")) == keys[r["config"]]]
+
+
+def confidence_interval(
+    values: np.ndarray,
+    confidence: float = 0.95,
+    resamples: int = 2000,
+) -> Tuple[float, float]:
+    """Bootstrap percentile confidence interval of the mean, NaNs ignored."""
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    if len(values) < 2:
+        return float("nan"), float("nan")
+    rng = np.random.default_rng(0)
+    means = rng.choice(values, size=(resamples, len(values))).mean(axis=1)
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(means, [alpha, 1 - alpha])
+    return float(low), float(high)
+
+
+def summarize(
+    results: List[Dict],
+    reference: Optional[str] = None,
+    confidence: float = 0.95,
+) -> Dict[str, Dict[str, Dict[str, Dict[str, float]]]]:
+    """Aggregate the episodes per config, policy and metric.
+
+    Args:
+        results (List[Dict]): The episodes, see `evaluate()`.
+        reference (str, optional):
+            Policy the others are compared to, seed by seed. Defaults to
+            the first policy of the results.
+        confidence (float, optional): Level of the intervals. Defaults to 0.95.
+
+    Returns:
+        Per config, policy and metric, the "mean", the interval "low" and
+        "high", the number of seeds "n", and the mean difference with the
+        reference on the same seeds and its interval, "diff", "diff_low"
+        and "diff_high".
+    """
+    if reference is None and results:
+        reference = results[0]["policy"]
+    episodes: Dict[Tuple[str, str], Dict[int, Dict]] = {}
+    for result in results:
+        episodes.setdefault((result["config"], result["policy"]), {})[result["seed"]] = result
+
+    summary: Dict = {}
+    for (config, policy), by_seed in sorted(episodes.items()):
+        paired = episodes.get((config, reference), {})
+        seeds = sorted(by_seed.keys() & paired.keys())
+        stats = {}
+        for metric in METRICS:
+            values = np.array([r[metric] for r in by_seed.values()], dtype=np.float64)
+            low, high = confidence_interval(values, confidence)
+            diffs = np.array([by_seed[s][metric] - paired[s][metric] for s in seeds],
+                             dtype=np.float64)
+            diff_low, diff_high = confidence_interval(diffs, confidence)
+            stats[metric] = {
+                "mean": float(np.nanmean(values)) if len(values) else float("nan"),
+                "low": low,
+                "high": high,
+                "n": len(values),
+                "diff": float(np.nanmean(diffs)) if len(diffs) else float("nan"),
+                "diff_low": diff_low,
+                "diff_high": diff_high,
+            }
+        summary.setdefault(config, {})[policy] = stats
+    return summary
+
+
+def format_summary(
+    summary: Dict,
+    metrics: Iterable[str] = ("slowdown", "completion_time", "utilization"),
+) -> str:
+    """A table of `summarize()`, mean [interval] and paired difference [interval]."""
+    lines = []
+    for config, policies in summary.items():
+        lines.append(f"{config}:")
+        for policy, stats in policies.items():
+            cells = [
+                f"{metric} {s['mean']:.3f} [{s['low']:.3f}, {s['high']:.3f}]"
+                f" diff {s['diff']:+.3f} [{s['diff_low']:+.3f}, {s['diff_high']:+.3f}]"
+                for metric, s in ((m, stats[m]) for m in metrics)]
+            lines.append(f"  {policy:>10} n={stats['slowdown']['n']}  " + "  ".join(cells))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m res_mgmt.evaluate",
+        description="Paired evaluation of scheduling policies.")
+    parser.add_argument("--policies", default="sjf,packer,tetris,random",
+                        help="comma separated policies, names or <module>:<factory>")
+    parser.add_argument("--configs", default="medium",
+                        help=f"comma separated sizes of {list(SIZES)}")
+    parser.add_argument("--new-job-rate", type=float, default=0.7)
+    parser.add_argument("--seeds", type=int, default=20, help="number of seeds")
+    parser.add_argument("--horizon", type=int, default=200, help="timesteps per episode")
+    parser.add_argument("--workers", type=int, default=None, help="processes, all CPUs if unset")
+    parser.add_argument("--output", default="eval.jsonl", help="JSONL file of the episodes")
+    parser.add_argument("--reference", default=None,
+                        help="policy compared to, the first policy if unset")
+    args = parser.parse_args(argv)
+
+    policies = args.policies.split(",")
+    configs = {
+        name: {**SIZES[name], "max_num_job": 10**3, "new_job_rate": args.new_job_rate}
+        for name in args.configs.split(",")}
+    results = evaluate(
+        policies, configs, range(args.seeds), args.output, args.horizon, args.workers)
+    results = select_results(results, policies, configs, args.horizon)
+    print(format_summary(summarize(results, args.reference or policies[0])))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+from typing import Callable, Tuple, Union
+import numpy as np
+import numpy.typing as npt
+
+from res_mgmt.envs.batched_env import BatchedResMgmtEnv
+from res_mgmt.envs.config import _EMPTY_CELL
+from res_mgmt.envs.res_mgmt_env import ResMgmtEnv
+
+# (requirements, durations, positions, empty_cells_cluster) -> scores
+Scorer = Callable[
+    [npt.NDArray[np.int_], npt.NDArray[np.int_], npt.NDArray[np.int_], npt.NDArray[np.int_]],
+    npt.NDArray[np.float64],
+]
+SlotArrays = Tuple[
+    npt.NDArray[np.int_], npt.NDArray[np.int_], npt.NDArray[np.int_], npt.NDArray[np.int_]]
+
+
+def slot_arrays(env: Union[ResMgmtEnv, BatchedResMgmtEnv]) -> SlotArrays:
+    """The arrays a `Scorer` scores the job slots from.
+
+    For a `BatchedResMgmtEnv` every array has a leading dimension of N
+    environments.
+
+    Returns:
+        A tuple of the requirements with shape
+        (num_job_slot, num_resource_type, time_size), the durations with
+        shape (num_job_slot,), the earliest start positions with shape
+        (num_job_slot,) and the empty cells of the clusters with shape
+        (num_resource_type, time_size). The durations are 0 and the
+        positions -1 for the empty slots, the positions are -1 too for
+        the jobs that do not fit.
+    """
+    if isinstance(env, BatchedResMgmtEnv):
+        return (env.slot_requirements, env.slot_duration,
+                env.find_all_pos(), env.empty_cells_cluster)
+
+    res = env.res
+    jobs = res.job_slots.jobs
+    occupied = jobs != _EMPTY_CELL
+    durations = np.where(occupied, res.meta.duration[np.where(occupied, jobs, 0)], 0)
+    # the env reuses the cached positions in its next step
+    return (res.job_slots.requirements, durations,
+            env.find_all_pos(), res.empty_cells_cluster)
+
+
+def select_actions(
+    scores: npt.NDArray[np.float64],
+    positions: npt.NDArray[np.int_],
+    immediate: bool = True,
+) -> npt.NDArray[np.int_]:
+    """The action of the highest scoring slot, 0 if no slot can be scheduled.
+
+    Ties go to the first slot, like `get_action()`.
+
+    Args:
+        scores (npt.NDArray[np.float64]): Scores with shape (..., num_job_slot).
+        positions (npt.NDArray[np.int_]): Earliest start positions with shape (..., num_job_slot).
+        immediate (bool, optional):
+            Only consider the jobs that can start at the current timestep,
+            like `get_action()`. Defaults to True.
+
+    Returns:
+        npt.NDArray[np.int_]: The actions with shape (...).
+    """
+    valid = positions == 0 if immediate else positions != -1
+    scores = np.where(valid, scores, -np.inf)
+    return np.where(valid.any(axis=-1), scores.argmax(axis=-1) + 1, 0)
+
+
+def get_batch_action(
+    env: Union[ResMgmtEnv, BatchedResMgmtEnv],
+    scorer: Scorer,
+    immediate: bool = True,
+) -> Union[int, npt.NDArray[np.int_]]:
+    """The action of the scorer, all slots scored in one call.
+
+    A vectorized `get_action()`: the scorer gets the arrays of all slots,
+    see `slot_arrays()`, and returns a score per slot.
+
+    ```python
+    action = get_batch_action(env, sjf_scores)
+    ```
+
+    Args:
+        env (Union[ResMgmtEnv, BatchedResMgmtEnv]): The environment.
+        scorer (Scorer): Scores of the slots, higher is scheduled first.
+        immediate (bool, optional): See `select_actions()`. Defaults to True.
+
+    Returns:
+        Union[int, npt.NDArray[np.int_]]:
+            The action, or the actions with shape (N,) for a `BatchedResMgmtEnv`.
+    """
+    requirements, durations, positions, empty_cells = slot_arrays(env)
+    scores = scorer(requirements, durations, positions, empty_cells)
+    actions = select_actions(scores, positions, immediate)
+    if isinstance(env, BatchedResMgmtEnv):
+        return actions
+    return int(actions)
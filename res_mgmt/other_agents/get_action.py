@@ -7,11 +7,11 @@ from res_mgmt.envs.res_mgmt_env import ResMgmtEnv
 def get_action(env: ResMgmtEnv, scoring: Callable[[int, ResMgmtEnv], float]) -> int:
     result = 0
     result_score = -1
+    positions = env.res.find_all_pos()
     for index, job_id in enumerate(env.res.job_slots.jobs):
         if job_id == _EMPTY_CELL:
             continue
-        pos = env.res.find_pos(job_id)
-        if pos != 0: # schedule immediately 
+        if positions[index] != 0: # schedule immediately 
             continue
         tmp_score = scoring(job_id, env)
         if tmp_score > result_score:
@@ -1,4 +1,5 @@
 import numpy as np
+import numpy.typing as npt
 
 from res_mgmt.envs.res_mgmt_env import ResMgmtEnv
 
@@ -9,4 +10,19 @@ def packer_scoring(job_id: int, env: ResMgmtEnv) -> int:
     for i in range(requirements.shape[0]):
         res_vec[i] = requirements[i, 0]
     avbl_res = env.res.empty_cells_cluster[:, 0]
-    return avbl_res.dot(res_vec)
\ No newline at end of file
+    return avbl_res.dot(res_vec)
+
+
+def packer_scores(
+    requirements: npt.NDArray[np.int_],
+    durations: npt.NDArray[np.int_],
+    positions: npt.NDArray[np.int_],
+    empty_cells_cluster: npt.NDArray[np.int_],
+) -> npt.NDArray[np.float64]:
+    """Packer, `packer_scoring()` of all slots, see `Scorer`.
+
+    The dot product of the available resources and the demand of the job
+    at the current timestep.
+    """
+    available = empty_cells_cluster[..., None, :, 0]
+    return (available * requirements[..., 0]).sum(axis=-1).astype(np.float64)
@@ -0,0 +1,24 @@
+from typing import Optional
+import numpy as np
+import numpy.typing as npt
+
+from res_mgmt.other_agents.batch_policy import Scorer
+
+
+def random_scores(rng: Optional[np.random.Generator] = None) -> Scorer:
+    """A scorer picking a uniformly random slot among the valid ones.
+
+    Args:
+        rng (np.random.Generator, optional): Random generator. Defaults to an unseeded one.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    def scores(
+        requirements: npt.NDArray[np.int_],
+        durations: npt.NDArray[np.int_],
+        positions: npt.NDArray[np.int_],
+        empty_cells_cluster: npt.NDArray[np.int_],
+    ) -> npt.NDArray[np.float64]:
+        return rng.random(positions.shape)
+    return scores
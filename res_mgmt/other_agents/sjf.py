@@ -1,5 +1,19 @@
+import numpy as np
+import numpy.typing as npt
+
 from res_mgmt.envs.res_mgmt_env import ResMgmtEnv
 
 
 def sjf_scoring(job_id: int, env: ResMgmtEnv) -> int:
     return 1 / env.res.meta[job_id].duration
+
+
+def sjf_scores(
+    requirements: npt.NDArray[np.int_],
+    durations: npt.NDArray[np.int_],
+    positions: npt.NDArray[np.int_],
+    empty_cells_cluster: npt.NDArray[np.int_],
+) -> npt.NDArray[np.float64]:
+    """Shortest job first, `sjf_scoring()` of all slots, see `Scorer`."""
+    return np.divide(1.0, durations, where=durations > 0,
+                     out=np.zeros(durations.shape))
@@ -0,0 +1,29 @@
+import numpy as np
+import numpy.typing as npt
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def tetris_scores(
+    requirements: npt.NDArray[np.int_],
+    durations: npt.NDArray[np.int_],
+    positions: npt.NDArray[np.int_],
+    empty_cells_cluster: npt.NDArray[np.int_],
+) -> npt.NDArray[np.float64]:
+    """Tetris-style alignment of all slots, see `Scorer`.
+
+    Like Packer, but the dot product of the available resources and the
+    demand covers the whole duration of the job from its earliest start
+    position, rather than the current timestep only.
+    """
+    time_size = empty_cells_cluster.shape[-1]
+    padding = np.zeros(
+        empty_cells_cluster.shape[:-1] + (time_size - 1,),
+        dtype=empty_cells_cluster.dtype,
+    )
+    padded = np.concatenate((empty_cells_cluster, padding), axis=-1)
+    # windows[..., type, s, j] is the empty cells at timestep s + j
+    windows = sliding_window_view(padded, time_size, axis=-1)
+    start = np.maximum(positions, 0)[..., :, None, None, None]
+    available = np.take_along_axis(
+        windows[..., None, :, :, :], start, axis=-2)[..., 0, :]
+    return (available * requirements).sum(axis=(-2, -1)).astype(np.float64)
@@ -3,7 +3,6 @@ import unittest
 import numpy as np
 
 from res_mgmt.envs.backlog import Backlog
-from res_mgmt.envs.clusters import Clusters
 from res_mgmt.envs.job import Job
 from res_mgmt.tests.utils import meta_from_durations
 
@@ -24,129 +23,43 @@ class TestBacklogAdd(unittest.TestCase):
     def test_normal(self):
         backlog = Backlog.fromConfig()
         backlog.state = 1
-        backlog.queue = deque([
-            (
-                4,
-                np.array(
-                 [[[False,  True, False],
-                   [False, False, False],
-                   [False,  True, False],
-                   [ True, False,  True],
-                   [ True, False,  True]],
-
-                  [[ True, False,  True],
-                   [ True,  True, False],
-                   [ True, False,  True],
-                   [False, False, False],
-                   [False, False,  True]]],
-                )
-            )
-        ])
+        backlog.queue = deque([4])
+
+        backlog.add(Job(id=5))
 
-        backlog.add(
-            Job(id=5), 
-            np.array(
-                [[[ True, False,  True],
-                  [ True,  True,  True],
-                  [ True,  True,  True],
-                  [ True, False, False],
-                  [False, False, False]],
-
-                 [[ True, False,  True],
-                  [False, False, False],
-                  [ True,  True, False],
-                  [ True,  True, False],
-                  [False, False,  True]]],
-            ),
-        )
-
-        new_state = 2
-        new_queue = [
-            (
-                4,
-                np.array(
-                    [[[False,  True, False],
-                      [False, False, False],
-                      [False,  True, False],
-                      [ True, False,  True],
-                      [ True, False,  True]],
-
-                     [[ True, False,  True],
-                      [ True,  True, False],
-                      [ True, False,  True],
-                      [False, False, False],
-                      [False, False,  True]]],
-                ),
-            ),
-            (
-                5,
-                np.array(
-                    [[[ True, False,  True],
-                      [ True,  True,  True],
-                      [ True,  True,  True],
-                      [ True, False, False],
-                      [False, False, False]],
-
-                     [[ True, False,  True],
-                      [False, False, False],
-                      [ True,  True, False],
-                      [ True,  True, False],
-                      [False, False,  True]]],
-                ),
-            ),
-        ]
-
-        self.assertEqual(backlog.state, new_state)
-        def id(queue):
-            return [entry[0] for entry in queue]
-        def image(queue):
-            return [entry[1] for entry in queue]
-        np.testing.assert_allclose(id(backlog.queue), id(new_queue))
-        np.testing.assert_allclose(image(backlog.queue), image(new_queue))
+        self.assertEqual(backlog.state, 2)
+        self.assertEqual(list(backlog.queue), [4, 5])
 
 
 class TestBacklogGet(unittest.TestCase):
 
     def test_normal(self):
         backlog = Backlog.fromConfig()
-        backlog.state = 1
-        backlog.queue = deque([
-            (
-                4,
-                np.array(
-                 [[[False,  True, False],
-                   [False, False, False],
-                   [False,  True, False],
-                   [ True, False,  True],
-                   [ True, False,  True]],
-
-                  [[ True, False,  True],
-                   [ True,  True, False],
-                   [ True, False,  True],
-                   [False, False, False],
-                   [False, False,  True]]],
-                )
-            )
-        ])
+        backlog.state = 2
+        backlog.queue = deque([4, 5])
 
-        expect_id = 4
-        expect_image = np.array(
-                        [[[False,  True, False],
-                          [False, False, False],
-                          [False,  True, False],
-                          [ True, False,  True],
-                          [ True, False,  True]],
+        self.assertEqual(backlog.get(), 4)
+        self.assertEqual(backlog.state, 1)
+        self.assertEqual(list(backlog.queue), [5])
 
-                         [[ True, False,  True],
-                          [ True,  True, False],
-                          [ True, False,  True],
-                          [False, False, False],
-                          [False, False,  True]]],
-                    )
 
-        actual_id, actual_image = backlog.get()
-        self.assertEqual(actual_id, expect_id)
-        np.testing.assert_allclose(actual_image, expect_image)
+class TestBacklogTimeProceed(unittest.TestCase):
+
+    def test_normal(self):
+        requirements = np.array([
+            [2, 2, 0, 0, 0],
+            [1, 1, 0, 0, 0],
+        ])
+        backlog = Backlog.fromConfig()
+        backlog.generator = iter([requirements])
+        backlog.new_job_rate = 1
+
+        job, = backlog.time_proceed()
+
+        self.assertEqual(list(backlog.queue), [job.id])
+        self.assertEqual(backlog.meta[job.id].duration, 2)
+        np.testing.assert_allclose(
+            backlog.meta.requirements[job.id], requirements)
 
 
 class TestBacklogDurations(unittest.TestCase):
@@ -164,13 +77,7 @@ class TestBacklogDurations(unittest.TestCase):
         })
         backlog = Backlog.fromConfig()
         backlog.meta = meta
-        backlog.queue = deque([
-            (1, None),
-            (4, None),
-            (3, None),
-            (6, None),
-            (8, None),
-        ])
+        backlog.queue = deque([1, 4, 3, 6, 8])
 
         expected = [1, 6, 8, 2, 2]
 
@@ -0,0 +1,88 @@
+import unittest
+import numpy as np
+
+from res_mgmt.envs.batched_env import BatchedResMgmtEnv
+from res_mgmt.envs.res_mgmt_env import ResMgmtEnv
+from res_mgmt.other_agents.batch_policy import get_batch_action, slot_arrays
+from res_mgmt.other_agents.get_action import get_action
+from res_mgmt.other_agents.packer import packer_scores, packer_scoring
+from res_mgmt.other_agents.random_agent import random_scores
+from res_mgmt.other_agents.sjf import sjf_scores, sjf_scoring
+from res_mgmt.other_agents.tetris import tetris_scores
+from res_mgmt.tests.utils import env_config
+
+config = env_config()
+
+
+class TestBatchPolicyGetBatchAction(unittest.TestCase):
+
+    def test_matches_get_action(self):
+        for scorer, scoring in [(sjf_scores, sjf_scoring), (packer_scores, packer_scoring)]:
+            env = ResMgmtEnv(**config)
+            env.reset(0)
+            for _ in range(200):
+                action = get_batch_action(env, scorer)
+                self.assertEqual(action, get_action(env, scoring))
+                _, _, done, _ = env.step(action)
+                if done:
+                    env.reset()
+
+    def test_random(self):
+        env = ResMgmtEnv(**config)
+        env.reset(0)
+        scorer = random_scores(np.random.default_rng(0))
+        for _ in range(100):
+            action = get_batch_action(env, scorer, immediate=False)
+            self.assertTrue(env.action_masks()[action])
+            if env.action_masks()[1:].any():
+                self.assertNotEqual(action, 0)
+            env.step(action)
+
+    def test_batched_env(self):
+        env = BatchedResMgmtEnv(num_envs=4, seed=0, **config)
+        env.reset()
+        for _ in range(50):
+            actions = get_batch_action(env, sjf_scores)
+            self.assertEqual(actions.shape, (4,))
+            masks = env.action_masks()
+            self.assertTrue(masks[np.arange(4), actions].all())
+            env.step(actions)
+
+
+class TestBatchPolicySlotArrays(unittest.TestCase):
+
+    def test_shares_env_positions(self):
+        env = ResMgmtEnv(**config)
+        env.reset(0)
+        _, _, positions, _ = slot_arrays(env)
+
+        self.assertIs(positions, env.find_all_pos())
+        np.testing.assert_array_equal(positions, env.res.find_all_pos())
+
+        batched = BatchedResMgmtEnv(num_envs=2, seed=0, **config)
+        batched.reset()
+        _, _, positions, _ = slot_arrays(batched)
+
+        self.assertIs(positions, batched.find_all_pos())
+
+
+class TestBatchPolicyTetris(unittest.TestCase):
+
+    def test_normal(self):
+        env = ResMgmtEnv(**config)
+        env.reset(0)
+        for action in [1, 0, 1, 0, 0, 1]:
+            env.step(action)
+        requirements, durations, positions, empty = slot_arrays(env)
+
+        scores = tetris_scores(requirements, durations, positions, empty)
+
+        for slot, pos in enumerate(positions):
+            pos = max(pos, 0)
+            window = np.zeros_like(empty)
+            window[:, :empty.shape[1] - pos] = empty[:, pos:]
+            self.assertEqual(scores[slot], (window * requirements[slot]).sum())
+
+
+if __name__ == '__main__':
+    unittest.main()
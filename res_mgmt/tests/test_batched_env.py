@@ -0,0 +1,176 @@
+import unittest
+import numpy as np
+
+from res_mgmt.envs.batched_env import BatchedResMgmtEnv
+from res_mgmt.envs.generator import generate_requirements
+from res_mgmt.envs.res_mgmt_env import ResMgmtEnv
+from res_mgmt.tests.utils import env_config
+
+config = env_config(new_job_rate=1.0)
+
+
+class TestBatchedEnvInit(unittest.TestCase):
+
+    def test_normal(self):
+        env = BatchedResMgmtEnv(num_envs=4, seed=0, **config)
+        obs = env.reset()
+
+        self.assertEqual(env.num_envs, 4)
+        self.assertEqual(obs.shape, (4, env.observation_space.shape[0]))
+        self.assertTrue(all(env.observation_space.contains(o) for o in obs))
+        # one job arrived in the first timestep
+        np.testing.assert_allclose(env.arrived, 1)
+        np.testing.assert_allclose(env.refilled, 1)
+        np.testing.assert_allclose(env.slot_time_max[:, 1:], 0)
+
+
+class TestBatchedEnvStep(unittest.TestCase):
+
+    def test_matches_single_env(self):
+        num_envs = 3
+        jobs = generate_requirements(
+            config["num_resource_type"],
+            config["time_size"],
+            config["resource_size"],
+            n=num_envs * 60,
+        ).reshape(
+            num_envs, 60,
+            config["num_resource_type"],
+            config["time_size"],
+        )
+
+        batched = BatchedResMgmtEnv(num_envs=num_envs, seed=0, mask_info=True, **config)
+
+        def workload(n):
+            requirements = jobs[:, :batched.workload_size].reshape(
+                (n,) + jobs.shape[2:])
+            duration = np.array([
+                np.max(np.where(req), axis=1)[1] + 1 for req in requirements])
+            return requirements, duration
+        batched._workload = workload
+
+        singles = []
+        for index in range(num_envs):
+            env = ResMgmtEnv(mask_info=True, **config)
+            env.reset()
+            env.res.backlog.generator = iter(jobs[index])
+            env.res.backlog.queue.clear()
+            env.res.job_slots.clear()
+            env.res.inv_duration_sum = 0.0
+            env.res.time_proceed()
+            env.state = env.res.state()
+            singles.append(env)
+
+        batched_obs = batched.reset()
+        for index, env in enumerate(singles):
+            np.testing.assert_allclose(batched_obs[index], env.state)
+
+        rng = np.random.default_rng(1)
+        for _ in range(40):
+            actions = rng.integers(0, config["num_job_slot"] + 1, num_envs)
+            obs, rewards, dones, infos = batched.step(actions)
+            for index, env in enumerate(singles):
+                state, reward, done, info = env.step(int(actions[index]))
+                np.testing.assert_allclose(obs[index], state)
+                np.testing.assert_array_equal(
+                    infos[index]["action_mask"], info["action_mask"])
+                self.assertAlmostEqual(rewards[index], reward)
+                self.assertEqual(dones[index], done)
+
+    def test_auto_reset(self):
+        env = BatchedResMgmtEnv(num_envs=2, seed=0, **config)
+        env.reset()
+        for _ in range(51):
+            _, _, dones, _ = env.step(np.zeros(2, dtype=int))
+            self.assertFalse(dones.any())
+
+        obs, _, dones, infos = env.step(np.zeros(2, dtype=int))
+
+        self.assertTrue(dones.all())
+        self.assertIn("terminal_observation", infos[0])
+        np.testing.assert_allclose(env.stepcount, 0)
+        np.testing.assert_allclose(env.arrived, 1)
+        np.testing.assert_allclose(obs, env.state())
+
+
+class TestBatchedEnvActionMasks(unittest.TestCase):
+
+    def test_masked_actions_are_valid(self):
+        env = BatchedResMgmtEnv(num_envs=4, seed=0, mask_info=True, **config)
+        env.reset()
+        rng = np.random.default_rng(0)
+        for _ in range(100):
+            masks = env.action_masks()
+            self.assertEqual(masks.shape, (4, config["num_job_slot"] + 1))
+            self.assertTrue(masks[:, 0].all())
+            actions = np.array([rng.choice(np.flatnonzero(m)) for m in masks])
+            _, rewards, _, infos = env.step(actions)
+            np.testing.assert_allclose(rewards[actions != 0], 0)
+            np.testing.assert_array_equal(
+                np.stack([info["action_mask"] for info in infos]),
+                env.action_masks())
+
+    def test_env_method(self):
+        env = BatchedResMgmtEnv(num_envs=3, seed=0, **config)
+        env.reset()
+
+        masks = env.env_method("action_masks")
+
+        self.assertEqual(len(masks), 3)
+        np.testing.assert_array_equal(np.stack(masks), env.action_masks())
+        np.testing.assert_array_equal(
+            env.env_method("action_masks", indices=[2])[0], env.action_masks()[2])
+
+
+class TestBatchedEnvMethod(unittest.TestCase):
+
+    def test_reset_indices(self):
+        env = BatchedResMgmtEnv(num_envs=3, seed=0, **config)
+        env.reset()
+        for _ in range(5):
+            env.step(np.zeros(3, dtype=int))
+
+        obs = env.env_method("reset", indices=[1])
+
+        self.assertEqual(len(obs), 1)
+        np.testing.assert_array_equal(obs[0], env.state()[1])
+        np.testing.assert_array_equal(env.stepcount, [5, 0, 5])
+
+    def test_per_env_not_implemented(self):
+        env = BatchedResMgmtEnv(num_envs=3, seed=0, **config)
+        env.reset()
+
+        self.assertEqual(env.env_method("seed", 1), [1, 1, 1])
+        with self.assertRaises(NotImplementedError):
+            env.env_method("seed", 1, indices=[0])
+        with self.assertRaises(NotImplementedError):
+            env.env_method("close")
+        with self.assertRaises(NotImplementedError):
+            env.set_attr("new_job_rate", 0.5, indices=[0])
+        self.assertEqual(env.new_job_rate, config["new_job_rate"])
+        env.set_attr("new_job_rate", 0.5)
+        self.assertEqual(env.get_attr("new_job_rate", indices=[2]), [0.5])
+
+
+class TestBatchedEnvRender(unittest.TestCase):
+
+    def test_normal(self):
+        env = BatchedResMgmtEnv(num_envs=5, seed=0, **config)
+        env.reset()
+        for _ in range(10):
+            env.step(np.ones(5, dtype=int))
+
+        frames = env.frames(unit=4)
+        image = env.render(columns=2)
+
+        self.assertEqual(frames.shape, (5, 4 * 43, 4 * 72, 3))
+        self.assertEqual(image.shape, (3 * 10 * 43, 2 * 10 * 72, 3))
+        np.testing.assert_array_equal(image[430:860, 720:], env.frames()[3])
+        # the busy cells of the clusters are the ones not empty
+        cells = image[15:15 + 10 * 20:10, 15:15 + 10 * 10:10]
+        busy = np.arange(10) < 10 - env.empty_cells_cluster[0, 0, :, None]
+        np.testing.assert_array_equal(~(cells == 255).all(axis=2), busy)
+
+
+if __name__ == '__main__':
+    unittest.main()
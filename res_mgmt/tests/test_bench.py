@@ -0,0 +1,48 @@
+import unittest
+
+from res_mgmt.bench import compare, run_benchmarks
+
+
+class TestBenchRun(unittest.TestCase):
+
+    def test_normal(self):
+        results = run_benchmarks(
+            ["small"], ["step_null", "step_valid", "step_ordered", "schedule"],
+            min_time=0.01, log=None)
+
+        self.assertEqual(set(results["results"]["small"]),
+                         {"step_null", "step_valid", "step_ordered", "schedule"})
+        for result in results["results"]["small"].values():
+            self.assertGreater(result["ops_per_sec"], 0)
+            self.assertGreater(result["peak_bytes"], 0)
+
+    def test_generate_jobs_per_job(self):
+        logs = []
+        results = run_benchmarks(["small"], ["generate_jobs"], min_time=0.01, log=logs.append)
+
+        # a chunk of jobs per call, far more jobs than calls per second
+        self.assertGreater(results["results"]["small"]["generate_jobs"]["ops_per_sec"], 10**4)
+        self.assertIn("jobs/s", logs[0])
+
+
+class TestBenchCompare(unittest.TestCase):
+
+    def test_normal(self):
+        old = {"results": {"small": {
+            "reset": {"ops_per_sec": 100.0},
+            "state": {"ops_per_sec": 100.0},
+        }}}
+        new = {"results": {"small": {
+            "reset": {"ops_per_sec": 90.0},
+            "state": {"ops_per_sec": 70.0},
+            "render": {"ops_per_sec": 1.0},
+        }}}
+
+        regressions = compare(new, old, tolerance=0.2)
+
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("small state"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -61,6 +61,36 @@ class TestClustersTimeProceed(unittest.TestCase):
 
         np.testing.assert_allclose(clusters.state, new_state)
 
+    def test_ring_buffer(self):
+        clusters = Clusters.fromConfig()
+        clusters.state = np.array(
+            [[[0, 1, 2],
+              [3, 4, 5],
+              [6, 7, 8]]]
+        )
+
+        clusters.time_proceed()
+        clusters.time_proceed()
+
+        # only the rows of the past timesteps are cleared, nothing is shifted
+        self.assertEqual(clusters.head, 2)
+        np.testing.assert_allclose(clusters.buffer, [
+            [[-1, -1, -1],
+             [-1, -1, -1],
+             [6, 7, 8]]
+        ])
+        self.assertEqual(clusters.row(0), 2)
+        self.assertEqual(clusters.row(1), 0)
+
+        clusters.buffer[:, clusters.row(1), 0] = 9
+        np.testing.assert_allclose(clusters.state, [
+            [[6, 7, 8],
+             [9, -1, -1],
+             [-1, -1, -1]]
+        ])
+        # reading the state does not rotate the ring buffer
+        self.assertEqual(clusters.head, 2)
+
 
 class TestClustersDurations(unittest.TestCase):
 
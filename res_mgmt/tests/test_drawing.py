@@ -0,0 +1,66 @@
+import unittest
+import numpy as np
+
+from res_mgmt.envs.drawing import _DIGITS, draw, draw_frame, draw_number, tile
+
+
+class TestDrawingDrawNumber(unittest.TestCase):
+
+    def test_normal(self):
+        image = np.full((10, 20, 3), 255, dtype=np.uint8)
+        draw_number(image, 17, 1, 2, scale=1)
+
+        black = (image == 0).all(axis=2)
+        np.testing.assert_array_equal(black[2:7, 1:4], _DIGITS[1])
+        np.testing.assert_array_equal(black[2:7, 4], False)
+        np.testing.assert_array_equal(black[2:7, 5:8], _DIGITS[7])
+        self.assertEqual(black.sum(), _DIGITS[[1, 7]].sum())
+
+    def test_clipped(self):
+        image = np.full((4, 4, 3), 255, dtype=np.uint8)
+        draw_number(image, 8, 2, 2, scale=2)
+
+        np.testing.assert_array_equal(image[2:, 2:], 0)
+        np.testing.assert_array_equal(image[:2], 255)
+
+
+class TestDrawingDrawFrame(unittest.TestCase):
+
+    def test_batch(self):
+        rng = np.random.default_rng(0)
+        clusters = rng.integers(-1, 5, size=(3, 2, 5, 4))
+        requirements = rng.integers(0, 5, size=(3, 2, 2, 5))
+        backlog = np.array([0, 12, 7])
+
+        frames = draw_frame(clusters, requirements, backlog, unit=6)
+
+        self.assertEqual(frames.shape[0], 3)
+        for i in range(3):
+            np.testing.assert_array_equal(
+                frames[i], draw_frame(clusters[i], requirements[i], backlog[i], unit=6))
+        # the text is the only difference with the frame without it
+        self.assertTrue((frames[1] != draw(clusters[1], requirements[1], unit=6)).any())
+
+
+class TestDrawingTile(unittest.TestCase):
+
+    def test_normal(self):
+        frames = np.arange(1, 6, dtype=np.uint8)[:, None, None, None] * np.ones(
+            (5, 2, 3, 3), dtype=np.uint8)
+
+        image = tile(frames, columns=2)
+
+        self.assertEqual(image.shape, (6, 6, 3))
+        np.testing.assert_array_equal(image[:2, :3], 1)
+        np.testing.assert_array_equal(image[:2, 3:], 2)
+        np.testing.assert_array_equal(image[4:, :3], 5)
+        np.testing.assert_array_equal(image[4:, 3:], 0)
+
+    def test_square(self):
+        image = tile(np.zeros((5, 2, 3, 3), dtype=np.uint8))
+
+        self.assertEqual(image.shape, (4, 9, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,10 +5,11 @@ import numpy as np
 from res_mgmt.envs.backlog import Backlog
 from res_mgmt.envs.clusters import Clusters
 from res_mgmt.envs.config import _EMPTY_CELL
+from res_mgmt.envs.drawing import job_colours
 from res_mgmt.envs.job import Job
 from res_mgmt.envs.res import Res
 from res_mgmt.envs.res_mgmt_env import ResMgmtEnv
-from res_mgmt.tests.utils import meta_from_durations
+from res_mgmt.tests.utils import env_config, meta_from_durations
 
 
 class TestEnv(unittest.TestCase):
@@ -103,7 +104,7 @@ class TestEnv(unittest.TestCase):
         for i in range(len(env.jobs)):
           job = Job.fromImage(i, jobs[i])
           env.res.meta[i] = job
-          env.res.backlog.add(job, jobs[i])
+          env.res.backlog.add(job)
         env.res.clusters.time_proceed()
         env.res.job_slots.refill(env.res.backlog)
         env.res.update_empty_cells_cluster()
@@ -127,5 +128,208 @@ class TestEnv(unittest.TestCase):
         self.assertFalse(done)
 
 
+class TestEnvReward(unittest.TestCase):
+
+    def test_matches_durations(self):
+        np.random.seed(0)
+        env = ResMgmtEnv(debug=True, **env_config())
+        env.action_space.seed(0)
+        env.reset()
+        for _ in range(300):
+            env.step(env.action_space.sample())
+            expected = (1.0 / env.res.durations()).sum()
+            self.assertAlmostEqual(env.res.inv_duration_sum, expected)
+
+
+class TestEnvReset(unittest.TestCase):
+
+    def test_seed(self):
+        env = ResMgmtEnv(**env_config())
+
+        def episode(seed=None):
+            states = [env.reset(seed).copy()]
+            for _ in range(20):
+                states.append(env.step(0)[0].copy())
+            return np.array(states)
+
+        first = episode(1)
+        res = env.res
+        second = episode()
+        third = episode(1)
+
+        # the arrays are reused, the seed decides the workload
+        self.assertIs(env.res, res)
+        np.testing.assert_array_equal(first, third)
+        self.assertFalse((first == second).all())
+
+    def test_terminal_observation(self):
+        env = ResMgmtEnv(**env_config())
+        env.reset(0)
+        done = False
+        while not done:
+            terminal, _, done, _ = env.step(0)
+        kept = terminal.copy()
+
+        # what DummyVecEnv does with info["terminal_observation"]
+        obs = env.reset()
+        env.step(0)
+
+        self.assertIsNot(obs, terminal)
+        np.testing.assert_array_equal(terminal, kept)
+
+
+class TestEnvActionMasks(unittest.TestCase):
+
+    def test_matches_find_pos(self):
+        np.random.seed(0)
+        env = ResMgmtEnv(mask_info=True, **env_config())
+        env.reset()
+        rng = np.random.default_rng(0)
+        for _ in range(200):
+            mask = env.action_masks()
+            self.assertTrue(mask[0])
+            for slot, job_id in enumerate(env.res.job_slots.jobs):
+                fits = job_id != _EMPTY_CELL and env.res.find_pos(job_id) != -1
+                self.assertEqual(mask[slot + 1], fits)
+
+            action = int(rng.choice(np.flatnonzero(mask)))
+            _, reward, _, info = env.step(action)
+            if action != 0:
+                self.assertEqual(reward, 0)
+            np.testing.assert_array_equal(info["action_mask"], env.action_masks())
+
+    def test_lazy(self):
+        env = ResMgmtEnv(**env_config())
+        env.reset(0)
+        for _ in range(10):
+            _, _, _, info = env.step(0)
+
+            # no search unless the mask is asked for
+            self.assertNotIn("action_mask", info)
+            self.assertIsNone(env.positions)
+        mask = env.action_masks()
+        self.assertIs(env.positions, env.find_all_pos())
+        self.assertEqual(mask.shape, (6,))
+
+
+class TestEnvActionModes(unittest.TestCase):
+
+    config = env_config()
+
+    def test_ordered_matches_single_steps(self):
+        rng = np.random.default_rng(0)
+        orders = rng.integers(0, 6, size=(40, 5))
+
+        np.random.seed(0)
+        env = ResMgmtEnv(action_mode="ordered", debug=True, **self.config)
+        env.reset()
+        expected = []
+        for order in orders:
+            state, reward, _, info = env.step(order)
+            expected.append((state.copy(), reward, info["num_scheduled"]))
+
+        np.random.seed(0)
+        env = ResMgmtEnv(debug=True, **self.config)
+        env.reset()
+        for order, (state, reward, num_scheduled) in zip(orders, expected):
+            total, scheduled = 0, 0
+            for action in order:
+                # the multi-placement step skips what does not fit
+                if action != 0 and env.action_masks()[action]:
+                    _, r, _, _ = env.step(int(action))
+                    total += r
+                    scheduled += 1
+            _, r, _, _ = env.step(0)
+            total += r
+            np.testing.assert_array_equal(env.state, state)
+            self.assertAlmostEqual(total, reward)
+            self.assertEqual(scheduled, num_scheduled)
+
+    def test_action_masks(self):
+        env = ResMgmtEnv(action_mode="ordered", mask_info=True, **self.config)
+        env.reset(0)
+        _, _, _, info = env.step(np.zeros(5, dtype=int))
+
+        single = np.concatenate(([True], env.find_all_pos() != -1))
+        self.assertEqual(info["action_mask"].shape, (sum(env.action_space.nvec),))
+        np.testing.assert_array_equal(info["action_mask"], np.tile(single, 5))
+
+        env = ResMgmtEnv(action_mode="priority", mask_info=True, **self.config)
+        env.reset(0)
+        _, _, _, info = env.step(np.zeros(5, dtype=np.float32))
+
+        self.assertNotIn("action_mask", info)
+        with self.assertRaises(NotImplementedError):
+            env.action_masks()
+
+    def test_priority_matches_ordered(self):
+        rng = np.random.default_rng(0)
+        priorities = rng.uniform(-1, 1, size=(40, 5)).astype(np.float32)
+
+        np.random.seed(0)
+        env = ResMgmtEnv(action_mode="priority", debug=True, **self.config)
+        env.reset()
+        expected = [env.step(priority)[0].copy() for priority in priorities]
+
+        np.random.seed(0)
+        env = ResMgmtEnv(action_mode="ordered", debug=True, **self.config)
+        env.reset()
+        for priority, state in zip(priorities, expected):
+            # highest priority first, the negative ones are not placed
+            order = [slot + 1 for slot in np.argsort(-priority)
+                     if priority[slot] >= 0]
+            env.step(np.array(order + [0] * (5 - len(order))))
+            np.testing.assert_array_equal(env.state, state)
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            ResMgmtEnv(action_mode="none", **self.config)
+
+
+class TestEnvRender(unittest.TestCase):
+
+    def test_rgb_array(self):
+        env = ResMgmtEnv(**env_config())
+        env.reset(0)
+        for action in [1, 0, 2, 0]:
+            env.step(action)
+
+        image = env.render(mode="rgb_array")
+
+        self.assertEqual(image.shape, (10 * (2 * 20 + 3), 10 * (10 * 6 + 5 + 7), 3))
+        self.assertEqual(image.dtype, np.uint8)
+        # no display was opened
+        self.assertIsNone(env.screen)
+        # the cluster cells match the jobs
+        clusters = env.res.clusters.state
+        cells = image[15:15 + 10 * 20:10, 15:15 + 10 * 10:10]
+        np.testing.assert_array_equal(cells, job_colours(clusters[0]))
+
+    def test_reward_unchanged(self):
+        env = ResMgmtEnv(
+            num_resource_type=2,
+            resource_size=20,
+            time_size=20,
+            num_job_slot=5,
+            max_num_job=10**3,
+            new_job_rate=0.7,
+        )
+        env.reset(0)
+        rng = np.random.default_rng(0)
+        for _ in range(300):
+            env.render(mode="rgb_array")
+            action = int(rng.choice(np.flatnonzero(env.action_masks())))
+            env.step(action)
+            # the jobs drain from the rows they were scheduled in
+            self.assertAlmostEqual(
+                env.res.inv_duration_sum, (1 / env.res.durations()).sum())
+
+    def test_unknown_mode(self):
+        env = ResMgmtEnv(**env_config())
+        env.reset(0)
+        with self.assertRaises(ValueError):
+            env.render(mode="ansi")
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,116 @@
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from res_mgmt.evaluate import (
+    confidence_interval, evaluate, load_results, make_policy, run_episode, select_results,
+    summarize)
+from res_mgmt.tests.utils import env_config
+
+config = env_config()
+
+
+class TestEvaluateRunEpisode(unittest.TestCase):
+
+    def test_normal(self):
+        metrics = run_episode(make_policy("sjf", 0), config, seed=0, horizon=50)
+
+        self.assertGreater(metrics["scheduled"], 0)
+        self.assertGreaterEqual(metrics["slowdown"], 1)
+        self.assertGreater(metrics["completion_time"], 0)
+        self.assertTrue(0 < metrics["utilization"] <= 1)
+
+    def test_paired(self):
+        # the null policy never schedules, every job of the workload waits
+        waiting = run_episode(lambda env: 0, config, seed=3, horizon=20)
+        again = run_episode(lambda env: 0, config, seed=3, horizon=20)
+        sjf = run_episode(make_policy("sjf", 3), config, seed=3, horizon=20)
+
+        self.assertEqual(waiting["reward"], again["reward"])
+        self.assertEqual(waiting["unscheduled"], again["unscheduled"])
+        self.assertEqual(waiting["scheduled"], 0)
+        self.assertEqual(waiting["utilization"], 0)
+        # the same arrivals whatever the policy
+        self.assertEqual(sjf["scheduled"] + sjf["unscheduled"], waiting["unscheduled"])
+
+
+class TestEvaluateResume(unittest.TestCase):
+
+    def test_normal(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "eval.jsonl")
+            configs = {"medium": config}
+            results = evaluate(["sjf", "random"], configs, range(2), output,
+                               horizon=20, workers=2, log=None)
+            self.assertEqual(len(results), 4)
+
+            # a killed run leaves a partial line
+            with open(output) as f:
+                lines = f.readlines()
+            with open(output, "w") as f:
+                f.writelines(lines[:3])
+                f.write(lines[3][:10])
+            self.assertEqual(len(load_results(output)), 3)
+
+            logs = []
+            results = evaluate(["sjf", "random"], configs, range(2), output,
+                               horizon=20, workers=1, log=logs.append)
+
+            self.assertEqual(len(results), 4)
+            self.assertTrue(logs[0].startswith("resuming, 3 episodes done, 1 to run"))
+            with open(output) as f:
+                rows = [json.loads(line) for line in f]
+            self.assertEqual(
+                sorted((r["policy"], r["seed"]) for r in rows),
+                [("random", 0), ("random", 1), ("sjf", 0), ("sjf", 1)])
+
+    def test_config_changed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "eval.jsonl")
+            evaluate(["sjf"], {"medium": config}, range(2), output,
+                     horizon=20, workers=1, log=None)
+
+            # the same name with other arguments runs again
+            changed = {"medium": {**config, "new_job_rate": 0.3}}
+            logs = []
+            results = evaluate(["sjf"], changed, range(2), output,
+                               horizon=20, workers=1, log=logs.append)
+
+            self.assertEqual(len(results), 4)
+            self.assertTrue(logs[0].startswith("resuming, 2 episodes done, 2 to run"))
+            selected = select_results(results, ["sjf"], changed, horizon=20)
+            self.assertEqual(len(selected), 2)
+            self.assertTrue(all(r["params"]["new_job_rate"] == 0.3 for r in selected))
+
+
+class TestEvaluateSummarize(unittest.TestCase):
+
+    def test_normal(self):
+        results = [
+            {"policy": policy, "config": "c", "seed": seed,
+             **{metric: value + seed for metric in
+                ("slowdown", "completion_time", "utilization", "scheduled", "unscheduled", "reward")}}
+            for seed in range(10)
+            for policy, value in [("a", 1.0), ("b", 3.0)]]
+
+        summary = summarize(results, reference="a")
+
+        b = summary["c"]["b"]["slowdown"]
+        self.assertEqual(b["n"], 10)
+        self.assertAlmostEqual(b["mean"], 7.5)
+        self.assertLess(b["low"], b["mean"])
+        self.assertGreater(b["high"], b["mean"])
+        # the seeds are paired, the difference has no spread
+        self.assertEqual((b["diff"], b["diff_low"], b["diff_high"]), (2.0, 2.0, 2.0))
+
+    def test_confidence_interval(self):
+        low, high = confidence_interval(np.random.default_rng(0).normal(5, 1, 1000))
+
+        self.assertTrue(4.8 < low < 5 < high < 5.2)
+        self.assertTrue(np.isnan(confidence_interval(np.array([1.0]))[0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pygame
+
+from res_mgmt.envs.drawing import encode_png
+from res_mgmt.envs.frame_writer import FrameWriter
+from res_mgmt.envs.res_mgmt_env import ResMgmtEnv
+from res_mgmt.tests.utils import env_config
+
+config = env_config()
+
+
+def load(filename):
+    return pygame.surfarray.array3d(pygame.image.load(filename))
+
+
+class TestEncodePng(unittest.TestCase):
+
+    def test_normal(self):
+        image = np.random.default_rng(0).integers(
+            0, 256, size=(7, 5, 3), dtype=np.uint8)
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "image.png")
+            with open(filename, "wb") as f:
+                f.write(encode_png(image))
+
+            np.testing.assert_array_equal(load(filename).transpose(1, 0, 2), image)
+
+
+class TestFrameWriter(unittest.TestCase):
+
+    def test_matches_my_render(self):
+        np.random.seed(0)
+        env = ResMgmtEnv(**config)
+        writer = FrameWriter(workers=2)
+        env.reset()
+        with tempfile.TemporaryDirectory() as directory:
+            for step in range(5):
+                env.step(int(np.flatnonzero(env.action_masks())[-1]))
+                env.my_render(os.path.join(directory, f"sync-{step}.png"))
+                writer.submit(env.res, os.path.join(directory, f"async-{step}.png"))
+            writer.close()
+            env.close()
+
+            self.assertEqual(writer.written, 5)
+            self.assertEqual(writer.errors, [])
+            for step in range(5):
+                np.testing.assert_array_equal(
+                    load(os.path.join(directory, f"async-{step}.png")),
+                    load(os.path.join(directory, f"sync-{step}.png")))
+
+    def test_drop(self):
+        env = ResMgmtEnv(**config)
+        env.reset()
+        # no workers, nothing leaves the queue
+        writer = FrameWriter(workers=0, max_queue=2)
+
+        submitted = [writer.submit(env.res, "unused.png") for _ in range(4)]
+
+        self.assertEqual(submitted, [True, True, False, False])
+        self.assertEqual(writer.dropped, 2)
+
+    def test_env(self):
+        env = ResMgmtEnv(frame_writer=FrameWriter(), **config)
+        env.reset()
+        with tempfile.TemporaryDirectory() as directory:
+            for step in range(3):
+                env.step(0)
+                env.my_render(os.path.join(directory, f"{step}.png"))
+            env.close()
+
+            self.assertEqual(sorted(os.listdir(directory)), ["0.png", "1.png", "2.png"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import numpy as np
+
+from res_mgmt.envs.generator import generate_jobs, generate_requirements, get_generator
+
+
+class TestGenerateJobs(unittest.TestCase):
+
+    def test_normal(self):
+        jobs = generate_jobs(2, 20, 10, n=200, rng=np.random.default_rng(0))
+
+        self.assertEqual(jobs.shape, (200, 2, 20, 10))
+        self.assertEqual(jobs.dtype, np.bool_)
+        requirements = jobs.sum(axis=3)
+        durations = jobs.any(axis=(1, 3)).sum(axis=1)
+        for job, req, duration in zip(jobs, requirements, durations):
+            # a duration x demand rectangle at the top left corner
+            demand = req[:, 0]
+            expected = ((np.arange(20)[None, :, None] < duration) &
+                        (np.arange(10)[None, None, :] < demand[:, None, None]))
+            np.testing.assert_array_equal(job, expected)
+        self.assertTrue(((1 <= durations) & (durations < 20)).all())
+        # 80% short jobs
+        self.assertEqual((durations < 3).sum(), 160)
+
+    def test_seeded(self):
+        first = generate_jobs(2, 20, 10, n=50, rng=np.random.default_rng(1))
+        second = generate_jobs(2, 20, 10, n=50, rng=np.random.default_rng(1))
+
+        np.testing.assert_array_equal(first, second)
+
+
+class TestGenerateRequirements(unittest.TestCase):
+
+    def test_normal(self):
+        requirements = generate_requirements(
+            2, 20, 10, n=200, rng=np.random.default_rng(0))
+        jobs = generate_jobs(2, 20, 10, n=200, rng=np.random.default_rng(0))
+
+        self.assertEqual(requirements.shape, (200, 2, 20))
+        np.testing.assert_array_equal(requirements, jobs.sum(axis=3))
+
+    def test_small(self):
+        # too small for the short durations, round(3 * 5 / 20) == 1
+        requirements = generate_requirements(
+            2, 5, 3, n=1000, rng=np.random.default_rng(0))
+
+        self.assertTrue(requirements.any(axis=(1, 2)).all())
+        self.assertTrue((requirements.max(axis=1)[:, 0] >= 1).all())
+        self.assertTrue((requirements <= 3).all())
+
+
+class TestGetGenerator(unittest.TestCase):
+
+    def test_infinite(self):
+        generator = get_generator(2, 20, 10, chunk_size=7,
+                                  rng=np.random.default_rng(0))
+        jobs = [next(generator) for _ in range(30)]
+
+        self.assertEqual(len(jobs), 30)
+        self.assertTrue(all(job.shape == (2, 20) for job in jobs))
+
+
+if __name__ == '__main__':
+    unittest.main()
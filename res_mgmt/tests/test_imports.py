@@ -0,0 +1,42 @@
+import subprocess
+import sys
+import unittest
+
+# seconds spent in the modules of res_mgmt, excluding gym and numpy
+_IMPORT_BUDGET = 0.25
+
+
+def import_times(module: str):
+    """The self import time in seconds of every module imported by module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         f"import sys, {module}; print(' '.join(sys.modules))"],
+        capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(self_us) / 1e6
+    return times, result.stdout.split()
+
+
+class TestImports(unittest.TestCase):
+
+    def test_env_without_pygame(self):
+        _, modules = import_times("res_mgmt.envs")
+
+        self.assertIn("res_mgmt.envs.res_mgmt_env", modules)
+        self.assertNotIn("pygame", modules)
+        self.assertNotIn("importlib_metadata", modules)
+        self.assertNotIn("res_mgmt.envs.render", modules)
+
+    def test_budget(self):
+        times, _ = import_times("res_mgmt.envs")
+
+        own = sum(t for name, t in times.items() if name.startswith("res_mgmt"))
+        self.assertLess(own, _IMPORT_BUDGET)
+
+
+if __name__ == '__main__':
+    unittest.main()
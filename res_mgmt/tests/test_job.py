@@ -30,5 +30,18 @@ class TestJobFromImage(unittest.TestCase):
         self.assertEqual(job.time_max, 4)
 
 
+class TestJobFromRequirements(unittest.TestCase):
+
+    def test_normal(self):
+        job = Job.fromRequirements(1, np.array([[2, 2, 0], [1, 0, 0]]))
+
+        self.assertEqual(job.duration, 2)
+        self.assertEqual(job.time_max, 2)
+
+    def test_empty(self):
+        with self.assertRaises(ValueError):
+            Job.fromRequirements(1, np.zeros((2, 5), dtype=int))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -4,6 +4,7 @@ import numpy as np
 
 from res_mgmt.envs.backlog import Backlog
 from res_mgmt.envs.config import _EMPTY_CELL
+from res_mgmt.envs.job import Job
 from res_mgmt.envs.job_slots import JobSlots
 from res_mgmt.tests.utils import meta_from_durations
 
@@ -40,115 +41,100 @@ class TestJobSlotsRefill(unittest.TestCase):
     def test_normal(self):
         job_slots = JobSlots.fromConfig()
         backlog = Backlog.fromConfig()
+        backlog.meta = job_slots.meta
+        job_slots.meta[4] = Job(
+            duration=5,
+            requirements=np.array([
+                [1, 0, 1, 2, 2],
+                [2, 2, 2, 0, 1],
+            ]),
+            time_max=5,
+        )
         backlog.state = 1
-        backlog.queue = deque([
-            (
-                4,
-                np.array(
-                 [[[False,  True, False],
-                   [False, False, False],
-                   [False,  True, False],
-                   [ True, False,  True],
-                   [ True, False,  True]],
-
-                  [[ True, False,  True],
-                   [ True,  True, False],
-                   [ True, False,  True],
-                   [False, False, False],
-                   [False, False,  True]]],
-                )
-            )
-        ])
+        backlog.queue = deque([4])
 
         old_jobs = [1, _EMPTY_CELL, 3]
-        old_state = np.array(
-            [[[[ True, False,  True],
-               [ True,  True,  True],
-               [ True,  True,  True],
-               [ True, False, False],
-               [False, False, False]],
-
-              [[ True, False,  True],
-               [False, False, False],
-               [ True,  True, False],
-               [ True,  True, False],
-               [False, False,  True]]],
-
-
-             [[[ True,  True,  True],
-               [ True,  True,  True],
-               [False,  True, False],
-               [False, False, False],
-               [False, False,  True]],
-
-              [[False,  True,  True],
-               [ True,  True, False],
-               [ True,  True, False],
-               [ True,  True,  True],
-               [ True,  True,  True]]],
-
-
-             [[[False, False, False],
-               [ True,  True,  True],
-               [ True,  True,  True],
-               [False,  True,  True],
-               [ True,  True,  True]],
-
-              [[ True,  True, False],
-               [ True,  True,  True],
-               [ True, False, False],
-               [False, False,  True],
-               [ True, False,  True]]]],
+        old_requirements = np.array(
+            [[[2, 3, 3, 1, 0],
+              [2, 0, 2, 2, 1]],
+
+             [[0, 0, 0, 0, 0],
+              [0, 0, 0, 0, 0]],
+
+             [[0, 3, 3, 2, 3],
+              [2, 3, 1, 1, 2]]]
         )
 
         new_jobs = [1, 4, 3]
-        new_state = np.array(
-            [[[[ True, False,  True],
-               [ True,  True,  True],
-               [ True,  True,  True],
-               [ True, False, False],
-               [False, False, False]],
-
-              [[ True, False,  True],
-               [False, False, False],
-               [ True,  True, False],
-               [ True,  True, False],
-               [False, False,  True]]],
-
-
-             [[[False,  True, False],
-               [False, False, False],
-               [False,  True, False],
-               [ True, False,  True],
-               [ True, False,  True]],
-
-              [[ True, False,  True],
-               [ True,  True, False],
-               [ True, False,  True],
-               [False, False, False],
-               [False, False,  True]]],
-
-
-             [[[False, False, False],
-               [ True,  True,  True],
-               [ True,  True,  True],
-               [False,  True,  True],
-               [ True,  True,  True]],
-
-              [[ True,  True, False],
-               [ True,  True,  True],
-               [ True, False, False],
-               [False, False,  True],
-               [ True, False,  True]]]],
+        new_requirements = np.array(
+            [[[2, 3, 3, 1, 0],
+              [2, 0, 2, 2, 1]],
+
+             [[1, 0, 1, 2, 2],
+              [2, 2, 2, 0, 1]],
+
+             [[0, 3, 3, 2, 3],
+              [2, 3, 1, 1, 2]]]
         )
 
-        job_slots.state = old_state
+        job_slots.requirements[...] = old_requirements
         job_slots.jobs = old_jobs
 
         job_slots.refill(backlog)
 
-        np.testing.assert_allclose(job_slots.state, new_state)
+        np.testing.assert_allclose(job_slots.requirements, new_requirements)
         np.testing.assert_allclose(job_slots.jobs, new_jobs)
+        self.assertFalse(backlog.queue)
+
+
+class TestJobSlotsRemove(unittest.TestCase):
+
+    def test_normal(self):
+        job_slots = JobSlots.fromConfig()
+        backlog = Backlog.fromConfig()
+        backlog.meta = job_slots.meta
+        for id in [1, 2, 3, 4, 5]:
+            job_slots.meta[id] = Job(duration=1, requirements=np.full((2, 5), id))
+        job_slots.jobs = [1, 2, 3]
+        backlog.queue = deque([4, 5])
+
+        self.assertEqual(job_slots.remove(3), 2)
+        self.assertEqual(job_slots.remove(1), 0)
+        self.assertIsNone(job_slots.remove(1))
+        np.testing.assert_allclose(job_slots.jobs, [_EMPTY_CELL, 2, _EMPTY_CELL])
+        np.testing.assert_allclose(job_slots.requirements[[0, 2]], 0)
+
+        # refill from the lowest index
+        job_slots.refill(backlog)
+
+        np.testing.assert_allclose(job_slots.jobs, [4, 2, 5])
+        np.testing.assert_allclose(job_slots.requirements[:, 0, 0], [4, 0, 5])
+        self.assertEqual(job_slots.slots, {4: 0, 2: 1, 5: 2})
+
+
+class TestJobSlotsState(unittest.TestCase):
+
+    def test_normal(self):
+        job_slots = JobSlots.fromConfig()
+        job_slots.requirements[0] = np.array([
+            [2, 1, 0, 0, 0],
+            [3, 0, 0, 0, 0],
+        ])
+
+        np.testing.assert_array_equal(job_slots.state[0], [
+            [[ True,  True, False],
+             [ True, False, False],
+             [False, False, False],
+             [False, False, False],
+             [False, False, False]],
+
+            [[ True,  True,  True],
+             [False, False, False],
+             [False, False, False],
+             [False, False, False],
+             [False, False, False]],
+        ])
+        np.testing.assert_array_equal(job_slots.state[1:], False)
 
 
 class TestJobSlotsDurations(unittest.TestCase):
@@ -0,0 +1,46 @@
+import unittest
+import numpy as np
+
+from res_mgmt.envs.job import Job
+from res_mgmt.envs.job_table import JobTable
+
+
+class TestJobTableAdd(unittest.TestCase):
+
+    def test_normal(self):
+        table = JobTable(2, 5, capacity=2)
+        requirements = np.array([
+            [2, 2, 0, 0, 0],
+            [1, 1, 0, 0, 0],
+        ])
+        ids = [table.add(Job(duration=2, requirements=requirements, time_max=2))
+               for _ in range(3)]
+
+        self.assertEqual(ids, [0, 1, 2])
+        self.assertEqual(len(table), 3)
+        self.assertGreaterEqual(len(table.duration), 3)
+        np.testing.assert_allclose(table.duration[ids], 2)
+        np.testing.assert_allclose(table.requirements[2], requirements)
+        self.assertEqual(table[1], Job(
+            id=1, duration=2, requirements=requirements, time_max=2))
+
+    def test_recycle(self):
+        table = JobTable(2, 5)
+        table[1] = Job(duration=4)
+        ids = [table.add(Job(duration=3)) for _ in range(3)]
+        self.assertEqual(ids, [0, 2, 3])
+
+        table.release(2)
+        self.assertNotIn(2, table)
+        with self.assertRaises(KeyError):
+            table[2]
+
+        job = Job(duration=5)
+        self.assertEqual(table.add(job), 2)
+        self.assertEqual(job.id, 2)
+        self.assertEqual(table[2].duration, 5)
+        self.assertEqual(table.add(Job(duration=5)), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
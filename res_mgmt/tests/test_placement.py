@@ -0,0 +1,99 @@
+import unittest
+import numpy as np
+
+from res_mgmt.envs.placement import find_position, find_positions
+
+
+def brute_force(empty_cells_cluster, requirements, time_max):
+    time_size = empty_cells_cluster.shape[1]
+    for start in range(time_size - time_max + 1):
+        window = empty_cells_cluster[:, start:start + time_max]
+        if (window >= requirements[:, :time_max]).all():
+            return start
+    return -1
+
+
+class TestFindPositions(unittest.TestCase):
+
+    def test_normal(self):
+        empty_cells_cluster = np.array([
+            [0, 0, 1, 3, 3],
+            [1, 0, 2, 3, 3],
+        ])
+        requirements = np.array([
+            [[2, 2, 0, 0, 0],
+             [1, 1, 0, 0, 0]],
+            [[3, 3, 3, 0, 0],
+             [1, 1, 1, 0, 0]],
+            [[1, 0, 0, 0, 0],
+             [1, 0, 0, 0, 0]],
+        ])
+        time_max = np.array([2, 3, 1])
+
+        expected = [3, -1, 2]
+        actural = find_positions(empty_cells_cluster, requirements, time_max)
+
+        np.testing.assert_array_equal(expected, actural)
+
+    def test_ignore_after_time_max(self):
+        empty_cells_cluster = np.array([
+            [3, 3, 0, 0, 0],
+        ])
+        requirements = np.array([
+            [[1, 1, 3, 3, 3]],
+        ])
+
+        actural = find_positions(empty_cells_cluster, requirements, np.array([2]))
+
+        np.testing.assert_array_equal([0], actural)
+
+    def test_batch(self):
+        rng = np.random.default_rng(0)
+        num_cluster, num_job, num_resource_type, time_size = 4, 6, 2, 8
+        empty_cells_cluster = rng.integers(
+            0, 5, (num_cluster, num_resource_type, time_size))
+        time_max = rng.integers(1, time_size + 1, (num_cluster, num_job))
+        requirements = rng.integers(
+            0, 4, (num_cluster, num_job, num_resource_type, time_size))
+        requirements = np.where(
+            np.arange(time_size) < time_max[..., None, None], requirements, 0)
+
+        actural = find_positions(empty_cells_cluster, requirements, time_max)
+
+        self.assertEqual(actural.shape, (num_cluster, num_job))
+        for n in range(num_cluster):
+            for m in range(num_job):
+                expected = brute_force(
+                    empty_cells_cluster[n], requirements[n, m], time_max[n, m])
+                self.assertEqual(actural[n, m], expected)
+
+    def test_empty_slots(self):
+        empty_cells_cluster = np.array([[1, 1, 1, 1]])
+        requirements = np.array([[[1, 1, 0, 0]], [[0, 0, 0, 0]]])
+
+        actural = find_positions(empty_cells_cluster, requirements, np.array([2, 0]))
+
+        np.testing.assert_array_equal([0, 0], actural)
+
+
+class TestFindPosition(unittest.TestCase):
+
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(1)
+        num_resource_type, time_size = 2, 8
+        for _ in range(300):
+            empty_cells_cluster = rng.integers(0, 5, (num_resource_type, time_size))
+            time_max = int(rng.integers(1, time_size + 1))
+            requirements = rng.integers(0, 4, (num_resource_type, time_size))
+            requirements[:, time_max:] = 0
+
+            expected = brute_force(empty_cells_cluster, requirements, time_max)
+
+            self.assertEqual(
+                find_position(empty_cells_cluster, requirements, time_max), expected)
+            self.assertEqual(find_positions(
+                empty_cells_cluster, requirements[None], np.array([time_max]))[0], expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
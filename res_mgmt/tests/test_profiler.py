@@ -0,0 +1,113 @@
+import unittest
+import numpy as np
+
+from res_mgmt.envs.batched_env import BatchedResMgmtEnv
+from res_mgmt.envs.profiler import Profiler, aggregate
+from res_mgmt.envs.res_mgmt_env import ResMgmtEnv
+from res_mgmt.tests.utils import env_config
+
+config = env_config()
+
+
+class TestProfiler(unittest.TestCase):
+
+    def test_lap(self):
+        profiler = Profiler()
+        t = profiler.lap("a", 0)
+        profiler.lap("a", t)
+        profiler.start_step()
+        profiler.lap("b", t)
+
+        stats = profiler.stats()
+
+        self.assertEqual(stats["a"]["calls"], 2)
+        self.assertEqual(stats["b"]["calls"], 1)
+        self.assertEqual(set(profiler.current), {"b"})
+
+    def test_aggregate(self):
+        stats = aggregate([
+            {"a": {"calls": 1, "total_ns": 10, "mean_ns": 10.0}},
+            {"a": {"calls": 3, "total_ns": 30, "mean_ns": 10.0},
+             "b": {"calls": 2, "total_ns": 4, "mean_ns": 2.0}},
+        ])
+
+        self.assertEqual(stats, {
+            "a": {"calls": 4, "total_ns": 40, "mean_ns": 10.0},
+            "b": {"calls": 2, "total_ns": 4, "mean_ns": 2.0},
+        })
+
+
+class TestEnvPerfStats(unittest.TestCase):
+
+    def test_disabled(self):
+        env = ResMgmtEnv(**config)
+        env.reset()
+        _, _, _, info = env.step(0)
+
+        self.assertEqual(env.perf_stats(), {})
+        self.assertNotIn("perf", info)
+
+    def test_normal(self):
+        np.random.seed(0)
+        env = ResMgmtEnv(perf_info=True, mask_info=True, **config)
+        env.action_space.seed(0)
+        env.reset()
+        for _ in range(50):
+            _, _, _, info = env.step(env.action_space.sample())
+
+        stats = env.perf_stats()
+
+        self.assertEqual(stats["step"]["calls"], 50)
+        for phase in ("find_all_pos", "schedule", "time_proceed",
+                      "time_proceed.clusters", "time_proceed.arrivals",
+                      "time_proceed.refill", "time_proceed.empty_cells",
+                      "reward", "state", "action_mask"):
+            self.assertGreater(stats[phase]["calls"], 0, phase)
+        # time_proceed includes its parts
+        parts = sum(stats[phase]["total_ns"] for phase in stats
+                    if phase.startswith("time_proceed."))
+        self.assertLessEqual(parts, stats["time_proceed"]["total_ns"])
+        self.assertIn("step", info["perf"])
+        self.assertLessEqual(info["perf"]["step"], stats["step"]["total_ns"])
+
+    def test_aggregate(self):
+        envs = [ResMgmtEnv(profile=True, **config) for _ in range(3)]
+        for env in envs:
+            env.reset()
+            for _ in range(4):
+                env.step(0)
+
+        stats = aggregate(env.perf_stats() for env in envs)
+
+        self.assertEqual(stats["step"]["calls"], 12)
+
+
+class TestBatchedEnvPerfStats(unittest.TestCase):
+
+    def test_normal(self):
+        env = BatchedResMgmtEnv(num_envs=4, seed=0, profile=True, **config)
+        env.reset()
+        for _ in range(60):
+            env.step(np.zeros(4, dtype=int))
+
+        stats = env.perf_stats()
+
+        self.assertEqual(stats["step"]["calls"], 60)
+        self.assertEqual(stats["reset"]["calls"], 1)
+
+    def test_env_method(self):
+        env = BatchedResMgmtEnv(num_envs=4, seed=0, profile=True, **config)
+        env.reset()
+        for _ in range(10):
+            env.step(np.zeros(4, dtype=int))
+
+        stats = aggregate(env.env_method("perf_stats"))
+
+        # the shared stats are counted once, not once per environment
+        self.assertEqual(stats["step"]["calls"], 10)
+        self.assertEqual(stats, env.perf_stats())
+        self.assertEqual(len(env.env_method("perf_stats", indices=[1, 2])), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
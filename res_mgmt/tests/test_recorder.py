@@ -0,0 +1,84 @@
+import tempfile
+import unittest
+import numpy as np
+
+from res_mgmt.envs.recorder import EpisodeLog, EpisodeRecorder
+from res_mgmt.envs.res_mgmt_env import ResMgmtEnv
+from res_mgmt.tests.utils import env_config
+
+config = env_config()
+
+
+def record(path, action_mode, episodes=2, steps=30):
+    """Record random episodes, returns the states and placements seen."""
+    np.random.seed(0)
+    env = EpisodeRecorder(
+        ResMgmtEnv(action_mode=action_mode, **config), path, buffer_size=7)
+    env.action_space.seed(0)
+    states, placements = [], []
+    for _ in range(episodes):
+        states.append([env.reset().copy()])
+        placements.append([])
+        for _ in range(steps):
+            state, _, _, info = env.step(env.action_space.sample())
+            states[-1].append(state.copy())
+            placements[-1].extend(info["placements"])
+    env.close()
+    return states, placements
+
+
+class TestEpisodeRecorder(unittest.TestCase):
+
+    def test_replay(self):
+        for action_mode in ("single", "ordered", "priority"):
+            with tempfile.TemporaryDirectory() as path:
+                states, placements = record(path, action_mode)
+
+                log = EpisodeLog(path)
+
+                self.assertEqual(len(log), 2)
+                self.assertEqual(len(log.steps["reward"]), 60)
+                self.assertEqual(log.config["action_mode"], action_mode)
+                for episode in range(2):
+                    for step in (0, 13, 30):
+                        env = log.replay(episode, step)
+                        np.testing.assert_array_equal(
+                            env.res.state(), states[episode][step])
+                    found = log.episode_placements(episode)
+                    self.assertEqual(
+                        list(zip(found["slot"].tolist(), found["position"].tolist())),
+                        placements[episode])
+
+    def test_states(self):
+        with tempfile.TemporaryDirectory() as path:
+            states, _ = record(path, "single", episodes=1, steps=10)
+
+            replayed = [env.res.state().copy() for env in EpisodeLog(path).states(0)]
+
+            np.testing.assert_array_equal(replayed, states[0])
+
+    def test_append(self):
+        with tempfile.TemporaryDirectory() as path:
+            record(path, "single", episodes=1, steps=10)
+            record(path, "single", episodes=1, steps=5)
+
+            log = EpisodeLog(path)
+
+            self.assertEqual(len(log), 2)
+            self.assertEqual(log.episode_rows(1), range(10, 15))
+
+    def test_other_config(self):
+        with tempfile.TemporaryDirectory() as path:
+            record(path, "single", episodes=1, steps=1)
+            with self.assertRaises(ValueError):
+                record(path, "ordered", episodes=1, steps=1)
+
+    def test_out_of_range(self):
+        with tempfile.TemporaryDirectory() as path:
+            record(path, "single", episodes=1, steps=3)
+            with self.assertRaises(IndexError):
+                EpisodeLog(path).replay(0, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+import numpy as np
+
+from res_mgmt.envs.drawing import _COLOURS, job_colours
+from res_mgmt.envs.render import demo_res, frame
+
+
+class TestRenderJobColours(unittest.TestCase):
+
+    def test_normal(self):
+        named = 10
+        colours = job_colours(np.array([-1, 0, 9, 10, 10 + len(_COLOURS) - named]))
+
+        np.testing.assert_array_equal(colours[0], [255, 255, 255])
+        np.testing.assert_array_equal(colours[1:3], _COLOURS[[0, 9]])
+        # ids after the named colours wrap around the other colours
+        np.testing.assert_array_equal(colours[3], colours[4])
+
+
+class TestRenderFrame(unittest.TestCase):
+
+    def test_normal(self):
+        image = frame(demo_res(), unit=10)
+
+        self.assertEqual(image.shape, (130, 220, 3))
+        self.assertEqual(image.dtype, np.uint8)
+        # cluster cell (type 0, time 0, resource 0) is job 0, inside the borders
+        np.testing.assert_array_equal(image[15, 15], job_colours(np.array(0)))
+        # slot 0 type 0 time 0 demands 2 cells, the third is empty
+        x = (2 + 3) * 10
+        np.testing.assert_array_equal(image[15, x + 15], [135, 206, 235])
+        np.testing.assert_array_equal(image[15, x + 25], [255, 255, 255])
+        # block borders
+        np.testing.assert_array_equal(image[10, 10], [0, 0, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
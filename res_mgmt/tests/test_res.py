@@ -97,6 +97,34 @@ class TestResFindPos(unittest.TestCase):
 
         self.assertEqual(expected, actural)
 
+    def test_all_slots(self):
+        res = Res.fromConfig()
+        res.meta[2] = Job(
+            requirements=np.array([
+                [2, 2, 0, 0, 0],
+                [1, 1, 0, 0, 0],
+            ]),
+            time_max=2,
+        )
+        res.meta[3] = Job(
+            requirements=np.array([
+                [3, 3, 3, 0, 0],
+                [1, 1, 1, 0, 0],
+            ]),
+            time_max=3,
+        )
+        res.job_slots.jobs = np.array([3, _EMPTY_CELL, 2])
+        res.job_slots.requirements[0] = res.meta[3].requirements
+        res.job_slots.requirements[2] = res.meta[2].requirements
+        res.empty_cells_cluster = np.array([
+            [0, 0, 1, 3, 3],
+            [1, 0, 2, 3, 3],
+        ])
+        expected = [-1, -1, 3]
+        actural = res.find_all_pos()
+
+        np.testing.assert_array_equal(expected, actural)
+
 class TestResSchedule(unittest.TestCase):
 
     def test_normal(self):
@@ -107,6 +135,7 @@ class TestResSchedule(unittest.TestCase):
                 [1, 1, 0, 0, 0],
             ]),
             time_max=2,
+            duration=2,
         )}
         res.empty_cells_cluster = np.array([
             [0, 0, 1, 3, 3],
@@ -152,6 +181,235 @@ class TestResSchedule(unittest.TestCase):
         np.testing.assert_allclose(new_jobs, res.job_slots.jobs)
         np.testing.assert_allclose(new_state, res.clusters.state)
 
+    def test_scattered_free_cells(self):
+        res = Res.fromConfig()
+        res.meta[2] = Job(
+            requirements=np.array([
+                [2, 1, 0, 0, 0],
+                [1, 0, 0, 0, 0],
+            ]),
+            time_max=2,
+            duration=2,
+        )
+        res.job_slots.jobs = np.array([2, 0, 3])
+        res.clusters.state = np.array(
+            [[[-1,  1, -1],
+              [ 1, -1,  1],
+              [-1, -1, -1],
+              [-1, -1, -1],
+              [-1, -1, -1]],
+
+             [[ 1,  1, -1],
+              [-1, -1, -1],
+              [-1, -1, -1],
+              [-1, -1, -1],
+              [-1, -1, -1]]]
+        )
+        res.update_empty_cells_cluster()
+
+        self.assertTrue(res.schedule(2, 0))
+        np.testing.assert_allclose(res.clusters.state[:, :2, :], [
+            [[2, 1, 2],
+             [1, 2, 1]],
+            [[1, 1, 2],
+             [-1, -1, -1]],
+        ])
+        np.testing.assert_allclose(res.empty_cells_cluster, [
+            [0, 0, 3, 3, 3],
+            [0, 3, 3, 3, 3],
+        ])
+        np.testing.assert_allclose(res.job_slots.jobs, [_EMPTY_CELL, 0, 3])
+
+    def test_wrong_start_time(self):
+        res = Res.fromConfig()
+        res.meta[2] = Job(
+            requirements=np.array([
+                [2, 2, 0, 0, 0],
+                [1, 1, 0, 0, 0],
+            ]),
+            time_max=2,
+            duration=2,
+        )
+        res.job_slots.jobs = np.array([0, 2, 3])
+        res.clusters.state = np.array(
+            [[[ 1,  1,  1],
+              [ 1,  1,  1],
+              [ 1,  1, -1],
+              [-1, -1, -1],
+              [-1, -1, -1]],
+
+             [[ 1,  1, -1],
+              [ 1,  1,  1],
+              [ 1, -1, -1],
+              [-1, -1, -1],
+              [-1, -1, -1]]]
+        )
+        old_state = res.clusters.state.copy()
+        res.update_empty_cells_cluster()
+
+        with self.assertRaises(ValueError):
+            res.schedule(2, 1)
+        with self.assertRaises(ValueError):
+            res.schedule(2, 4)
+        np.testing.assert_allclose(old_state, res.clusters.state)
+        np.testing.assert_allclose(res.job_slots.jobs, [0, 2, 3])
+
+    def test_after_time_proceed(self):
+        res = Res.fromConfig()
+        res.meta[2] = Job(
+            requirements=np.array([
+                [2, 2, 0, 0, 0],
+                [1, 1, 0, 0, 0],
+            ]),
+            time_max=2,
+            duration=2,
+        )
+        res.job_slots.jobs = np.array([0, 2, 3])
+        for _ in range(4):
+            res.clusters.time_proceed()
+        res.update_empty_cells_cluster()
+
+        self.assertTrue(res.schedule(2, 0))
+        self.assertEqual(res.clusters.head, 4)
+        np.testing.assert_allclose(res.empty_cells_cluster, [
+            [1, 1, 3, 3, 3],
+            [2, 2, 3, 3, 3],
+        ])
+        res.update_empty_cells_cluster()
+        np.testing.assert_allclose(res.empty_cells_cluster, [
+            [1, 1, 3, 3, 3],
+            [2, 2, 3, 3, 3],
+        ])
+        np.testing.assert_allclose(res.clusters.state[:, :2, :], [
+            [[2, 2, -1],
+             [2, 2, -1]],
+            [[2, -1, -1],
+             [2, -1, -1]],
+        ])
+
+
+class TestResState(unittest.TestCase):
+
+    def test_normal(self):
+        res = Res.fromConfig()
+        res.meta[2] = Job(
+            requirements=np.array([
+                [2, 2, 0, 0, 0],
+                [1, 1, 0, 0, 0],
+            ]),
+            time_max=2,
+            duration=2,
+        )
+        res.job_slots.jobs = np.array([_EMPTY_CELL, 2, _EMPTY_CELL])
+        res.job_slots.requirements[1] = res.meta[2].requirements
+        res.backlog.state = 4
+        state = res.state()
+
+        np.testing.assert_allclose(state, np.concatenate((
+            np.full(10, 3),
+            np.zeros(10),
+            [2, 2, 0, 0, 0, 1, 1, 0, 0, 0],
+            np.zeros(10),
+            [4],
+        )))
+
+        res.schedule(2, 1)
+
+        self.assertTrue(res.state() is state)
+        np.testing.assert_allclose(state, np.concatenate((
+            [3, 1, 1, 3, 3, 3, 2, 2, 3, 3],
+            np.zeros(30),
+            [4],
+        )))
+
+
+class TestResTimeProceed(unittest.TestCase):
+
+    def test_empty_cells_cluster(self):
+        res = Res.fromConfig()
+        res.debug = True
+        res.backlog.new_job_rate = 0
+        res.clusters.state = np.array(
+            [[[ 1,  1,  1],
+              [ 1,  1, -1],
+              [ 1, -1, -1],
+              [-1, -1, -1],
+              [-1, -1, -1]],
+
+             [[ 1,  1, -1],
+              [ 1,  1,  1],
+              [-1, -1, -1],
+              [-1, -1, -1],
+              [ 1, -1, -1]]]
+        )
+        res.update_empty_cells_cluster()
+
+        res.time_proceed()
+
+        np.testing.assert_allclose(res.empty_cells_cluster, [
+            [1, 2, 3, 3, 3],
+            [0, 3, 3, 2, 3],
+        ])
+
+    def test_out_of_sync(self):
+        res = Res.fromConfig()
+        res.debug = True
+        res.backlog.new_job_rate = 0
+        res.clusters.buffer[0, 2, 0] = 1
+
+        with self.assertRaises(AssertionError):
+            res.time_proceed()
+
+
+class TestResReset(unittest.TestCase):
+
+    def test_normal(self):
+        res = Res.fromConfig()
+        res.backlog.new_job_rate = 1
+        observation = res.observation
+        for _ in range(4):
+            res.time_proceed()
+            res.schedule_slots(range(3))
+
+        res.reset(iter([]))
+
+        self.assertIs(res.observation, observation)
+        self.assertEqual(len(res.meta), 0)
+        self.assertTrue(res.finish())
+        self.assertEqual(res.inv_duration_sum, 0)
+        self.assertTrue((res.clusters.buffer == _EMPTY_CELL).all())
+        np.testing.assert_allclose(res.state(), np.concatenate((
+            np.full(10, 3), np.zeros(31))))
+
+
+class TestResTime(unittest.TestCase):
+
+    def test_normal(self):
+        res = Res(
+            num_resource_type=2,
+            time_size=20,
+            resource_size=10,
+            num_job_slot=3,
+            max_num_job=10**3,
+            new_job_rate=1,
+            rng=np.random.default_rng(0),
+        )
+        res.time_proceed()
+        job_id = int(res.job_slots.jobs[0])
+        res.time_proceed()
+
+        self.assertEqual(res.time, 2)
+        self.assertEqual(res.meta.arrival[job_id], 1)
+        self.assertEqual(res.meta.arrival[res.job_slots.jobs[1]], 2)
+        self.assertEqual(res.used_cells, 0)
+
+        res.schedule(job_id, 0)
+        used = 2 * 10 - res.empty_cells_cluster[:, 0].sum()
+        res.time_proceed()
+
+        self.assertGreater(used, 0)
+        self.assertEqual(res.used_cells, used)
+
 
 class TestResFinish(unittest.TestCase):
 
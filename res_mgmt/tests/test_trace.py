@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from res_mgmt.envs.backlog import Backlog
+from res_mgmt.envs.res_mgmt_env import ResMgmtEnv
+from res_mgmt.envs.trace import Trace, convert_csv
+
+CSV = """arrival,user,duration,demand_0,demand_1
+10.0,a,3.0,0.5,0.1
+10.5,b,1.0,1.0,0.0
+13.0,c,100.0,0.2,0.9
+13.9,d,0.5,0.0,0.0
+"""
+
+
+class TestTrace(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "trace.csv")
+        with open(self.path, "w") as f:
+            f.write(CSV)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def trace(self, path):
+        return Trace(path, num_resource_type=2, time_size=5,
+                     resource_size=4, chunk_size=3)
+
+    def test_csv(self):
+        jobs = list(self.trace(self.path).jobs())
+
+        self.assertEqual([timestep for timestep, _ in jobs], [0, 0, 3, 3])
+        np.testing.assert_allclose(jobs[0][1], [
+            [2, 2, 2, 0, 0],
+            [1, 1, 1, 0, 0],
+        ])
+        np.testing.assert_allclose(jobs[1][1], [
+            [4, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0],
+        ])
+        # clipped to time_size
+        np.testing.assert_allclose(jobs[2][1], [
+            [1, 1, 1, 1, 1],
+            [4, 4, 4, 4, 4],
+        ])
+        # no demand, one unit
+        np.testing.assert_allclose(jobs[3][1], [
+            [1, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0],
+        ])
+
+    def test_columnar(self):
+        directory = os.path.join(self.directory.name, "trace")
+        convert_csv(self.path, directory,
+                    ["arrival", "duration", "demand_0", "demand_1"], chunk_size=3)
+
+        expected = list(self.trace(self.path).jobs())
+        actual = list(self.trace(directory).jobs())
+
+        self.assertEqual(len(actual), len(expected))
+        for (timestep, requirements), (expected_timestep, expected_requirements) in zip(actual, expected):
+            self.assertEqual(timestep, expected_timestep)
+            np.testing.assert_allclose(requirements, expected_requirements)
+
+    def test_missing_columns(self):
+        trace = Trace(self.path, num_resource_type=3, time_size=5, resource_size=4)
+        with self.assertRaises(ValueError):
+            list(trace.jobs())
+
+    def test_backlog(self):
+        backlog = Backlog.fromConfig()
+        backlog.trace = self.trace(self.path).jobs()
+
+        arrived = [len(backlog.time_proceed()) for _ in range(5)]
+
+        self.assertEqual(arrived, [2, 0, 0, 2, 0])
+        self.assertEqual(len(backlog.queue), 4)
+
+    def test_env(self):
+        env = ResMgmtEnv(
+            num_resource_type=2,
+            resource_size=4,
+            time_size=5,
+            num_job_slot=3,
+            max_num_job=10**3,
+            new_job_rate=0.7,
+            trace=self.trace(self.path),
+        )
+
+        first = [env.reset().copy()] + [env.step(0)[0].copy() for _ in range(4)]
+        second = [env.reset().copy()] + [env.step(0)[0].copy() for _ in range(4)]
+
+        np.testing.assert_array_equal(first, second)
+        self.assertEqual(len(env.res.meta), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from res_mgmt.envs.workload import WorkloadPool, get_pool, pool_key, share_pool
+
+
+class TestWorkloadPoolGenerate(unittest.TestCase):
+
+    def test_normal(self):
+        pool = WorkloadPool.generate(2, 20, 10, size=100, seed=1)
+
+        self.assertEqual(pool.size, 100)
+        self.assertEqual(pool.requirements.shape, (100, 2, 20))
+        np.testing.assert_array_equal(
+            pool.requirements,
+            WorkloadPool.generate(2, 20, 10, size=100, seed=1).requirements)
+        for requirements, duration in zip(pool.requirements, pool.duration):
+            self.assertTrue(requirements[:, duration - 1].any())
+            self.assertFalse(requirements[:, duration:].any())
+
+    def test_cached(self):
+        self.assertIs(get_pool(2, 20, 10, 100, 1), get_pool(2, 20, 10, 100, 1))
+        self.assertIsNot(get_pool(2, 20, 10, 100, 1), get_pool(2, 20, 10, 100, 2))
+
+
+class TestWorkloadPoolJobs(unittest.TestCase):
+
+    def test_wrap_around(self):
+        pool = WorkloadPool(np.arange(3)[:, None, None] + np.ones((3, 1, 2), dtype=int), 0)
+        jobs = pool.jobs(2)
+
+        firsts = [int(next(jobs)[0, 0]) for _ in range(5)]
+
+        self.assertEqual(firsts, [3, 1, 2, 3, 1])
+
+
+class TestWorkloadPoolDisk(unittest.TestCase):
+
+    def test_save_load(self):
+        pool = WorkloadPool.generate(2, 20, 10, size=100, seed=1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "pool.npy")
+            pool.save(path)
+
+            loaded = WorkloadPool.load(path, seed=1)
+
+            self.assertIsInstance(loaded.requirements, np.memmap)
+            self.assertFalse(loaded.requirements.flags.writeable)
+            np.testing.assert_array_equal(loaded.requirements, pool.requirements)
+            np.testing.assert_array_equal(loaded.duration, pool.duration)
+            self.assertEqual(os.listdir(directory), ["pool.npy"])
+
+    def test_get_pool_cache_dir(self):
+        with tempfile.TemporaryDirectory() as directory:
+            pool = get_pool(2, 20, 10, 100, 3, cache_dir=directory)
+
+            path = os.path.join(directory, pool_key(2, 20, 10, 100, 3) + ".npy")
+            self.assertTrue(os.path.exists(path))
+            np.testing.assert_array_equal(
+                pool.requirements,
+                WorkloadPool.generate(2, 20, 10, size=100, seed=3).requirements)
+            del pool
+            get_pool.cache_clear()
+
+
+class TestWorkloadPoolShared(unittest.TestCase):
+
+    def test_attach(self):
+        shm = share_pool(2, 20, 10, 100, 4)
+        try:
+            pool = WorkloadPool.attach(pool_key(2, 20, 10, 100, 4), (100, 2, 20), 4)
+
+            self.assertFalse(pool.requirements.flags.writeable)
+            np.testing.assert_array_equal(
+                pool.requirements, get_pool(2, 20, 10, 100, 4).requirements)
+            del pool
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def test_missing(self):
+        with self.assertRaises(FileNotFoundError):
+            WorkloadPool.attach("res_mgmt_pool_missing", (1, 1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
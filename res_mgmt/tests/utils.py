@@ -1,7 +1,24 @@
-from typing import Dict
+from typing import Any, Dict
 
 from res_mgmt.envs.job import Job
+from res_mgmt.envs.job_table import JobTable
 
 
-def meta_from_durations(durations: Dict[int, Job]):
-    return {id: Job(duration=duration) for id, duration in durations.items()}
+def meta_from_durations(durations: Dict[int, int]):
+    meta = JobTable.fromConfig()
+    for id, duration in durations.items():
+        meta[id] = Job(duration=duration)
+    return meta
+
+
+def env_config(**overrides: Any) -> Dict[str, Any]:
+    """The arguments of a small `ResMgmtEnv` shared by the tests, a new dict per call."""
+    return {
+        "num_resource_type": 2,
+        "resource_size": 10,
+        "time_size": 20,
+        "num_job_slot": 5,
+        "max_num_job": 10**3,
+        "new_job_rate": 0.7,
+        **overrides,
+    }
@@ -1,7 +1,6 @@
 from stable_baselines3 import A2C
-from stable_baselines3.common.env_util import make_vec_env
 
-from res_mgmt.envs.res_mgmt_env import ResMgmtEnv
+from res_mgmt.envs.batched_env import BatchedResMgmtEnv
 
 num_resource_type = 2
 time_size = 20
@@ -10,13 +9,15 @@ num_job_slot = 10
 n = 10**2
 
 # Parallel environments
-env = make_vec_env(ResMgmtEnv, n_envs=4, env_kwargs={
-    "num_resource_type": num_resource_type,
-    "time_size": time_size,
-    "resource_size": resource_size,
-    "num_job_slot": num_job_slot,
-    "max_num_job": n,
-})
+env = BatchedResMgmtEnv(
+    num_envs=4,
+    num_resource_type=num_resource_type,
+    time_size=time_size,
+    resource_size=resource_size,
+    num_job_slot=num_job_slot,
+    max_num_job=n,
+    new_job_rate=0.7,
+)
 
 model = A2C(
     "MlpPolicy",